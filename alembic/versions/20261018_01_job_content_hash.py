@@ -0,0 +1,30 @@
+"""job content hash
+
+Revision ID: 20261018_01
+Revises: 20260216_03
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_01"
+down_revision: Union[str, Sequence[str], None] = "20260216_03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("content_hash", sa.String(length=64), nullable=True))
+    op.add_column(
+        "crawl_runs",
+        sa.Column("unchanged_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("crawl_runs", "unchanged_count")
+    op.drop_column("jobs", "content_hash")
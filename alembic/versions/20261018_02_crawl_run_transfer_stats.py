@@ -0,0 +1,33 @@
+"""crawl run transfer stats
+
+Revision ID: 20261018_02
+Revises: 20261018_01
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_02"
+down_revision: Union[str, Sequence[str], None] = "20261018_01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "crawl_runs",
+        sa.Column("bytes_downloaded", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+    )
+    op.add_column(
+        "crawl_runs",
+        sa.Column("not_modified_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("crawl_runs", "not_modified_count")
+    op.drop_column("crawl_runs", "bytes_downloaded")
@@ -0,0 +1,28 @@
+"""crawl run deactivated count
+
+Revision ID: 20261018_03
+Revises: 20261018_02
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_03"
+down_revision: Union[str, Sequence[str], None] = "20261018_02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "crawl_runs",
+        sa.Column("deactivated_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("crawl_runs", "deactivated_count")
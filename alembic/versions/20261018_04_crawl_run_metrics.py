@@ -0,0 +1,34 @@
+"""crawl run metrics
+
+Revision ID: 20261018_04
+Revises: 20261018_03
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20261018_04"
+down_revision: Union[str, Sequence[str], None] = "20261018_03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "crawl_runs",
+        sa.Column(
+            "metrics",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("crawl_runs", "metrics")
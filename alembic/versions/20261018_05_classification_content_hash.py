@@ -0,0 +1,26 @@
+"""classification content hash
+
+Revision ID: 20261018_05
+Revises: 20261018_04
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_05"
+down_revision: Union[str, Sequence[str], None] = "20261018_04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # jobs.content_hash the classification was computed from; a mismatch means the job changed since
+    op.add_column("job_classifications", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("job_classifications", "content_hash")
@@ -0,0 +1,57 @@
+"""reclassification runs
+
+Revision ID: 20261018_06
+Revises: 20261018_05
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "20261018_06"
+down_revision: Union[str, Sequence[str], None] = "20261018_05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+run_status_enum = postgresql.ENUM(
+    "running",
+    "success",
+    "partial_fail",
+    "failed",
+    name="run_status_enum",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reclassification_runs",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=False), primary_key=True),
+        sa.Column("rule_version", sa.String(length=50), nullable=False),
+        sa.Column("status", run_status_enum, nullable=False, server_default=sa.text("'running'")),
+        sa.Column("workers", sa.Integer(), nullable=False, server_default=sa.text("1")),
+        sa.Column("total_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("processed_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        # checkpoint: every active job with id <= last_job_id has been written under rule_version
+        sa.Column("last_job_id", sa.BigInteger(), nullable=False, server_default=sa.text("0")),
+        sa.Column("started_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("resumed_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("resumed_processed_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("NOW()")),
+        sa.Column("finished_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+    )
+    op.create_index(
+        "idx_reclassification_runs_version_started",
+        "reclassification_runs",
+        ["rule_version", "started_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_reclassification_runs_version_started", table_name="reclassification_runs")
+    op.drop_table("reclassification_runs")
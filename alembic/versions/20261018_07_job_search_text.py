@@ -0,0 +1,87 @@
+"""job search text
+
+Revision ID: 20261018_07
+Revises: 20261018_06
+Create Date: 2026-10-18
+"""
+
+import html
+import re
+from typing import Any, Mapping, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_07"
+down_revision: Union[str, Sequence[str], None] = "20261018_06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# A frozen copy of app/services/search_text.py as of this revision, so the backfill keeps writing
+# the same text when the app's normalization changes later (rows are then rebuilt with
+# `python -m app.scripts.backfill_search_text --recompute`).
+SEARCH_TEXT_FIELDS = ("title", "description_text", "employment_text_raw", "experience_text_raw", "tech_stack_text")
+SEARCH_TEXT_MAX_CHARS = 20000
+BACKFILL_BATCH_SIZE = 1000
+
+_TAG = re.compile(r"<[^>]*>")
+
+UPDATE_SEARCH_TEXT_SQL = sa.text(
+    """
+    UPDATE jobs j
+    SET search_text = t.search_text
+    FROM unnest(CAST(:ids AS bigint[]), CAST(:search_text AS text[])) AS t(id, search_text)
+    WHERE j.id = t.id
+    """
+)
+
+
+def _normalize_text(value: str | None) -> str:
+    if not value:
+        return ""
+    if "<" in value or "&" in value:
+        if "<" not in value:
+            value = html.unescape(value)
+        value = html.unescape(_TAG.sub(" ", value))
+    return " ".join(value.casefold().split())
+
+
+def _build_search_text(job: Mapping[str, Any]) -> str:
+    parts = [_normalize_text(job.get(field)) for field in SEARCH_TEXT_FIELDS]
+    return "\n".join(part for part in parts if part)[:SEARCH_TEXT_MAX_CHARS]
+
+
+def upgrade() -> None:
+    # normalized title/description/employment/experience/tech stack text, written by the crawler
+    op.add_column("jobs", sa.Column("search_text", sa.Text(), nullable=True))
+
+    # existing rows are filled here: /jobs?q and the search_vector of 20261018_08 read only search_text
+    bind = op.get_bind()
+    after_id = 0
+    while rows := bind.execute(
+        sa.text(
+            f"""
+            SELECT id, {", ".join(SEARCH_TEXT_FIELDS)}
+            FROM jobs
+            WHERE id > :after_id
+            ORDER BY id
+            LIMIT :limit
+            """
+        ),
+        {"after_id": after_id, "limit": BACKFILL_BATCH_SIZE},
+    ).mappings().all():
+        bind.execute(
+            UPDATE_SEARCH_TEXT_SQL,
+            {"ids": [row["id"] for row in rows], "search_text": [_build_search_text(row) for row in rows]},
+        )
+        after_id = rows[-1]["id"]
+
+    # the classifier now matches against this text (HTML stripped, case-folded, capped), so stored
+    # classifications can be stale without their job changing; a cleared content_hash puts every one
+    # back in classify_pending_jobs' backlog
+    op.execute("UPDATE job_classifications SET content_hash = NULL")
+
+
+def downgrade() -> None:
+    op.drop_column("jobs", "search_text")
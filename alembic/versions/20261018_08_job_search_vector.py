@@ -0,0 +1,42 @@
+"""job search vector
+
+Revision ID: 20261018_08
+Revises: 20261018_07
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "20261018_08"
+down_revision: Union[str, Sequence[str], None] = "20261018_07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 'simple' rather than a language config: postings mix Korean and English and stock Postgres has no
+# Korean dictionary, while an English stemmer would also rewrite tech terms. The description comes
+# from search_text, which is already stripped of (escaped) HTML.
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A')
+    || setweight(to_tsvector('simple'::regconfig, coalesce(company_name, '')), 'B')
+    || setweight(to_tsvector('simple'::regconfig, coalesce(tech_stack_text, '')), 'C')
+    || setweight(to_tsvector('simple'::regconfig, coalesce(search_text, '')), 'D')
+"""
+
+
+def upgrade() -> None:
+    # generated, so every write path (crawl upsert, search_text backfill) keeps it current
+    op.add_column(
+        "jobs",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True),
+    )
+    op.create_index("idx_jobs_search_vector", "jobs", ["search_vector"], unique=False, postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("idx_jobs_search_vector", table_name="jobs")
+    op.drop_column("jobs", "search_vector")
@@ -0,0 +1,49 @@
+"""job trigram indexes
+
+Revision ID: 20261018_09
+Revises: 20261018_08
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_09"
+down_revision: Union[str, Sequence[str], None] = "20261018_08"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = {"idx_jobs_company_name_trgm": "company_name", "idx_jobs_title_trgm": "title"}
+
+
+def upgrade() -> None:
+    # substring (ILIKE '%..%') and typo-tolerant (%, <%) matching for /jobs q and /jobs/suggest.
+    # pg_trgm ships with the postgres image's contrib modules. On a server without it the indexes are
+    # skipped: the q substring arm falls back to sequential scans and /jobs/suggest to ILIKE-only
+    # matching (it checks pg_extension per request). alembic never re-runs an applied revision, so
+    # after installing the extension apply this one again by hand:
+    #   alembic stamp 20261018_08 && alembic upgrade 20261018_09 && alembic stamp head
+    available = op.get_bind().execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).first()
+    if available is None:
+        print("[migration] pg_trgm is not available on this server; trigram indexes skipped")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES.items():
+        op.create_index(
+            name,
+            "jobs",
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    for name in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name="jobs", if_exists=True)
@@ -0,0 +1,49 @@
+"""job sort key indexes
+
+Revision ID: 20261018_10
+Revises: 20261018_09
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_10"
+down_revision: Union[str, Sequence[str], None] = "20261018_09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # the exact sort keys of /jobs (app/api/v1/jobs.py), so both ORDER BY ... LIMIT and the keyset
+    # cursor's row comparison are a range scan; idx_jobs_posted_at/deadline_at stay for date filters
+    op.create_index(
+        "idx_jobs_posted_at_key",
+        "jobs",
+        [sa.text("COALESCE(posted_at, '-infinity'::timestamptz)"), "id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_jobs_deadline_at_key",
+        "jobs",
+        [sa.text("COALESCE(deadline_at, 'infinity'::timestamptz)"), "id"],
+        unique=False,
+    )
+    # supersedes the single-column score index: /jobs always joins on one rule_version
+    op.drop_index("idx_job_classifications_score", table_name="job_classifications")
+    op.create_index(
+        "idx_job_classifications_version_score",
+        "job_classifications",
+        ["rule_version", "new_grad_score", "job_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_job_classifications_version_score", table_name="job_classifications")
+    op.create_index("idx_job_classifications_score", "job_classifications", ["new_grad_score"], unique=False)
+    op.drop_index("idx_jobs_deadline_at_key", table_name="jobs")
+    op.drop_index("idx_jobs_posted_at_key", table_name="jobs")
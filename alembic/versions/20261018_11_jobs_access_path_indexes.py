@@ -0,0 +1,86 @@
+"""jobs access path indexes
+
+Revision ID: 20261018_11
+Revises: 20261018_10
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20261018_11"
+down_revision: Union[str, Sequence[str], None] = "20261018_10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POSTED_AT_KEY = sa.text("COALESCE(posted_at, '-infinity'::timestamptz)")
+DEADLINE_AT_KEY = sa.text("COALESCE(deadline_at, 'infinity'::timestamptz)")
+
+
+def upgrade() -> None:
+    # /jobs lists active jobs (the UI never asks for inactive ones) in one of the sort key orders of
+    # app/api/v1/jobs.py, and filters posted_from/posted_to/deadline_before on those same keys. The
+    # sort key indexes become partial on is_active, and the single-column is_active, posted_at and
+    # deadline_at indexes they replace are dropped.
+    op.drop_index("idx_jobs_posted_at_key", table_name="jobs")
+    op.drop_index("idx_jobs_deadline_at_key", table_name="jobs")
+    op.drop_index("idx_jobs_active", table_name="jobs")
+    op.drop_index("idx_jobs_posted_at", table_name="jobs")
+    op.drop_index("idx_jobs_deadline_at", table_name="jobs")
+    op.create_index(
+        "idx_jobs_active_posted_at_key",
+        "jobs",
+        [POSTED_AT_KEY, "id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index(
+        "idx_jobs_active_deadline_at_key",
+        "jobs",
+        [DEADLINE_AT_KEY, "id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+
+    # every /jobs query joins job_classifications on one rule_version and usually filters role_type
+    # (default backend) or employment_type; score_desc then walks new_grad_score inside that filter.
+    # The single-column role/employment indexes ignore rule_version and are dropped.
+    op.drop_index("idx_job_classifications_version_score", table_name="job_classifications")
+    op.drop_index("idx_job_classifications_role", table_name="job_classifications")
+    op.drop_index("idx_job_classifications_employment", table_name="job_classifications")
+    op.create_index(
+        "idx_job_classifications_role_score",
+        "job_classifications",
+        ["rule_version", "role_type", "new_grad_score", "job_id"],
+        unique=False,
+    )
+    op.create_index(
+        "idx_job_classifications_employment_score",
+        "job_classifications",
+        ["rule_version", "employment_type", "new_grad_score", "job_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_job_classifications_employment_score", table_name="job_classifications")
+    op.drop_index("idx_job_classifications_role_score", table_name="job_classifications")
+    op.create_index("idx_job_classifications_employment", "job_classifications", ["employment_type"], unique=False)
+    op.create_index("idx_job_classifications_role", "job_classifications", ["role_type"], unique=False)
+    op.create_index(
+        "idx_job_classifications_version_score",
+        "job_classifications",
+        ["rule_version", "new_grad_score", "job_id"],
+        unique=False,
+    )
+
+    op.drop_index("idx_jobs_active_deadline_at_key", table_name="jobs")
+    op.drop_index("idx_jobs_active_posted_at_key", table_name="jobs")
+    op.create_index("idx_jobs_deadline_at", "jobs", ["deadline_at"], unique=False)
+    op.create_index("idx_jobs_posted_at", "jobs", ["posted_at"], unique=False)
+    op.create_index("idx_jobs_active", "jobs", ["is_active"], unique=False)
+    op.create_index("idx_jobs_deadline_at_key", "jobs", [DEADLINE_AT_KEY, "id"], unique=False)
+    op.create_index("idx_jobs_posted_at_key", "jobs", [POSTED_AT_KEY, "id"], unique=False)
@@ -1,48 +1,157 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.core.db import get_db
-from app.services.classifier.rule_engine import classify_jobs
+from app.core.db import SessionLocal, get_db
+from app.services.classifier.reclassify import (
+    DEFAULT_WORKERS,
+    RECLASSIFY_CHUNK_SIZE,
+    list_reclassification_runs,
+    start_reclassification_in_background,
+)
+from app.services.classifier.rule_engine import (
+    PENDING_CHUNK_SIZE,
+    classify_jobs,
+    classify_pending_jobs,
+    get_compiled_rules,
+    rule_cache,
+)
+from app.services.classifier.shadow import SHADOW_CHUNK_SIZE, SHADOW_SAMPLE_SIZE, evaluate_candidate
+from app.services.crawler.orchestrator import DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT, run_all_crawls
 from app.services.crawler.runner import run_crawl
+from app.services.job_counts import job_count_cache
+from app.workers.scheduler import describe_schedule
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+ClassifyMode = Literal["recent", "pending"]
+
 
 @router.post("/crawl/run")
 def trigger_crawl(
     source_code: str = Query(default="remotive"),
+    full_refresh: bool = Query(default=False),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     try:
-        return run_crawl(db=db, source_code=source_code)
+        return run_crawl(db=db, source_code=source_code, full_refresh=full_refresh)
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+@router.post("/crawl/run-all")
+def trigger_crawl_all(
+    max_workers: int = Query(default=DEFAULT_MAX_WORKERS, ge=1, le=16),
+    per_host_limit: int = Query(default=DEFAULT_PER_HOST_LIMIT, ge=1, le=8),
+) -> dict[str, Any]:
+    return run_all_crawls(session_factory=SessionLocal, max_workers=max_workers, per_host_limit=per_host_limit)
+
+
+@router.get("/schedule")
+def get_schedule() -> dict[str, Any]:
+    return describe_schedule()
+
+
 @router.post("/classify/run")
 def trigger_classification(
     rule_version: str | None = Query(default=None),
     limit: int = Query(default=200, ge=1, le=1000),
+    mode: ClassifyMode = Query(default="recent"),
+    chunk_size: int = Query(default=PENDING_CHUNK_SIZE, ge=1, le=5000),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     settings = get_settings()
     selected_rule_version = rule_version or settings.rule_version
     try:
+        if mode == "pending":
+            # works through the whole backlog; `limit` only applies to the recent mode
+            return classify_pending_jobs(db=db, rule_version=selected_rule_version, chunk_size=chunk_size)
         return classify_jobs(db=db, rule_version=selected_rule_version, limit=limit)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
+@router.post("/classify/reclassify")
+def trigger_reclassification(
+    rule_version: str | None = Query(default=None),
+    workers: int = Query(default=DEFAULT_WORKERS, ge=1, le=16),
+    chunk_size: int = Query(default=RECLASSIFY_CHUNK_SIZE, ge=100, le=10000),
+    restart: bool = Query(default=False),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    selected_rule_version = rule_version or get_settings().rule_version
+    try:
+        get_compiled_rules(db, selected_rule_version)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    started = start_reclassification_in_background(
+        SessionLocal,
+        rule_version=selected_rule_version,
+        workers=workers,
+        chunk_size=chunk_size,
+        restart=restart,
+    )
+    if not started:
+        raise HTTPException(status_code=409, detail=f"reclassification already running for {selected_rule_version}")
+    return {"rule_version": selected_rule_version, "started": True, "progress": "/api/v1/admin/classify/reclassify"}
+
+
+@router.get("/classify/reclassify")
+def list_reclassifications(
+    rule_version: str | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    return {"items": list_reclassification_runs(db, rule_version=rule_version, limit=limit)}
+
+
+@router.get("/classify/shadow")
+def shadow_evaluate(
+    candidate_version: str = Query(...),
+    baseline_version: str | None = Query(default=None),
+    sample_size: int = Query(default=SHADOW_SAMPLE_SIZE, ge=0, le=200),
+    chunk_size: int = Query(default=SHADOW_CHUNK_SIZE, ge=100, le=10000),
+    max_jobs: int | None = Query(default=None, ge=1),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    # dry run only: job_classifications is not touched
+    try:
+        return evaluate_candidate(
+            db,
+            candidate_version=candidate_version,
+            baseline_version=baseline_version or get_settings().rule_version,
+            chunk_size=chunk_size,
+            sample_size=sample_size,
+            max_jobs=max_jobs,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/classify/rule-cache")
+def get_rule_cache_stats() -> dict[str, Any]:
+    return rule_cache.stats()
+
+
+@router.get("/jobs/count-cache")
+def get_job_count_cache_stats() -> dict[str, Any]:
+    return job_count_cache.stats()
+
+
 @router.get("/runs")
-def list_runs(limit: int = Query(default=20, ge=1, le=100), db: Session = Depends(get_db)) -> dict[str, Any]:
+def list_runs(
+    limit: int = Query(default=20, ge=1, le=100),
+    stats_window: int = Query(default=20, ge=1, le=500),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
     rows = db.execute(
         text(
             """
@@ -55,7 +164,12 @@ def list_runs(limit: int = Query(default=20, ge=1, le=100), db: Session = Depend
               cr.fetched_count,
               cr.inserted_count,
               cr.updated_count,
+              cr.unchanged_count,
+              cr.deactivated_count,
               cr.failed_count,
+              cr.bytes_downloaded,
+              cr.not_modified_count,
+              cr.metrics,
               cr.error_message
             FROM crawl_runs cr
             LEFT JOIN sources s ON s.id = cr.source_id
@@ -78,9 +192,61 @@ def list_runs(limit: int = Query(default=20, ge=1, le=100), db: Session = Depend
                 "fetched_count": row["fetched_count"],
                 "inserted_count": row["inserted_count"],
                 "updated_count": row["updated_count"],
+                "unchanged_count": row["unchanged_count"],
+                "deactivated_count": row["deactivated_count"],
                 "failed_count": row["failed_count"],
+                "bytes_downloaded": row["bytes_downloaded"],
+                "not_modified_count": row["not_modified_count"],
+                "metrics": row["metrics"],
                 "error_message": row["error_message"],
             }
         )
 
-    return {"items": items, "limit": limit}
+    # runs recorded before phase metrics existed fall back to their wall-clock duration
+    stat_rows = db.execute(
+        text(
+            """
+            WITH ranked AS (
+              SELECT
+                cr.source_id,
+                COALESCE(
+                  (cr.metrics->>'total_ms')::numeric,
+                  EXTRACT(EPOCH FROM cr.finished_at - cr.started_at) * 1000
+                ) AS total_ms,
+                (cr.metrics->>'rows_per_sec')::numeric AS rows_per_sec,
+                cr.bytes_downloaded,
+                ROW_NUMBER() OVER (PARTITION BY cr.source_id ORDER BY cr.started_at DESC) AS rn
+              FROM crawl_runs cr
+              WHERE cr.status = 'success'
+                AND cr.finished_at IS NOT NULL
+            )
+            SELECT
+              s.code AS source_code,
+              COUNT(*) AS run_count,
+              percentile_cont(0.5) WITHIN GROUP (ORDER BY r.total_ms) AS p50_ms,
+              percentile_cont(0.95) WITHIN GROUP (ORDER BY r.total_ms) AS p95_ms,
+              AVG(r.rows_per_sec) AS avg_rows_per_sec,
+              SUM(r.bytes_downloaded) AS bytes_downloaded
+            FROM ranked r
+            JOIN sources s ON s.id = r.source_id
+            WHERE r.rn <= :stats_window
+            GROUP BY s.code
+            ORDER BY s.code
+            """
+        ),
+        {"stats_window": stats_window},
+    ).mappings().all()
+
+    source_stats = [
+        {
+            "source_code": row["source_code"],
+            "run_count": row["run_count"],
+            "p50_ms": round(float(row["p50_ms"]), 1) if row["p50_ms"] is not None else None,
+            "p95_ms": round(float(row["p95_ms"]), 1) if row["p95_ms"] is not None else None,
+            "avg_rows_per_sec": round(float(row["avg_rows_per_sec"]), 1) if row["avg_rows_per_sec"] is not None else None,
+            "bytes_downloaded": int(row["bytes_downloaded"] or 0),
+        }
+        for row in stat_rows
+    ]
+
+    return {"items": items, "limit": limit, "source_stats": source_stats, "stats_window": stats_window}
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import base64
 from datetime import datetime, time, timezone
+import json
 from typing import Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -9,10 +11,93 @@ from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
 from app.core.db import get_db
+from app.services.job_counts import job_count_cache
+from app.services.search_text import fold_text
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
-SortOption = Literal["posted_at_desc", "deadline_asc", "score_desc"]
+SortOption = Literal["posted_at_desc", "deadline_asc", "score_desc", "relevance"]
+# exact: COUNT(*), served from job_count_cache until a crawl or classification run finishes;
+# estimate: the planner's row estimate; none: no total, only has_more
+CountOption = Literal["exact", "estimate", "none"]
+# values of employment_type_enum / role_type_enum; an empty filter means "any"
+EMPLOYMENT_TYPES = ("intern_experience", "intern_convertible", "new_grad", "experienced", "unknown")
+ROLE_TYPES = ("backend", "frontend", "fullstack", "data", "mobile", "devops", "unknown")
+
+# q parsed by the same 'simple' parser that built jobs.search_vector, every term ANDed as a prefix:
+# Korean particles attach to the end of a word (백엔드 -> 백엔드에서) and English inflects at the end
+# (engineer -> engineers), so prefixes stand in for the stemming 'simple' does not do.
+SEARCH_QUERY_SQL = """
+    (SELECT to_tsquery('simple', string_agg(quote_literal(lexeme) || ':*', ' & '))
+     FROM unnest(to_tsvector('simple', :q_text)))
+"""
+
+# Sort keys as (expression, type) with j.id as the final tie-break. Every key of a sort runs in the
+# same direction and COALESCE stands in for NULLS LAST, so "rows after the cursor" is a single row
+# comparison that the matching composite index serves as a range (idx_jobs_active_posted_at_key,
+# idx_jobs_active_deadline_at_key, idx_job_classifications_role_score/employment_score).
+POSTED_AT_KEY = ("COALESCE(j.posted_at, '-infinity'::timestamptz)", "timestamptz")
+DEADLINE_AT_KEY = ("COALESCE(j.deadline_at, 'infinity'::timestamptz)", "timestamptz")
+JOB_ID_KEY = ("j.id", "bigint")
+# with a classification filter every row has a job_classifications match, and the bare column is
+# what the job_classifications indexes cover; otherwise unclassified jobs sort last
+CLASSIFIED_SCORE_KEY = ("jc.new_grad_score", "integer")
+SCORE_KEY = ("COALESCE(jc.new_grad_score, -1)", "integer")
+
+SUGGEST_LIMIT = 5
+
+# Typeahead completions. ILIKE catches substrings as they are typed ("sendb"), the pg_trgm operators
+# catch typos ("sendbrid"); both are served by the trigram GIN indexes. Company names are short, so
+# whole-string similarity (%) works; titles are long, so q is compared with their best-matching
+# words instead (<%). Prefix matches rank first.
+SUGGEST_COMPANIES_SQL = text(
+    """
+    SELECT company_name AS value, COUNT(*) AS job_count, MAX(similarity(company_name, :q)) AS score
+    FROM jobs
+    WHERE is_active = :is_active
+      AND (company_name ILIKE :q_like OR company_name % :q)
+    GROUP BY company_name
+    ORDER BY bool_or(company_name ILIKE :q_prefix) DESC, score DESC, job_count DESC, value
+    LIMIT :limit
+    """
+)
+SUGGEST_TITLES_SQL = text(
+    """
+    SELECT title AS value, COUNT(*) AS job_count, MAX(word_similarity(:q, title)) AS score
+    FROM jobs
+    WHERE is_active = :is_active
+      AND (title ILIKE :q_like OR :q <% title)
+    GROUP BY title
+    ORDER BY bool_or(title ILIKE :q_prefix) DESC, score DESC, job_count DESC, value
+    LIMIT :limit
+    """
+)
+# Without pg_trgm (the migration skips it when the server lacks the extension) suggest only matches
+# substrings; the score is the share of the value that q covers.
+SUGGEST_COMPANIES_SUBSTRING_SQL = text(
+    """
+    SELECT company_name AS value, COUNT(*) AS job_count,
+           MAX(length(:q)::float / GREATEST(length(company_name), 1)) AS score
+    FROM jobs
+    WHERE is_active = :is_active
+      AND company_name ILIKE :q_like
+    GROUP BY company_name
+    ORDER BY bool_or(company_name ILIKE :q_prefix) DESC, score DESC, job_count DESC, value
+    LIMIT :limit
+    """
+)
+SUGGEST_TITLES_SUBSTRING_SQL = text(
+    """
+    SELECT title AS value, COUNT(*) AS job_count,
+           MAX(length(:q)::float / GREATEST(length(title), 1)) AS score
+    FROM jobs
+    WHERE is_active = :is_active
+      AND title ILIKE :q_like
+    GROUP BY title
+    ORDER BY bool_or(title ILIKE :q_prefix) DESC, score DESC, job_count DESC, value
+    LIMIT :limit
+    """
+)
 
 
 def _to_iso(value: Any) -> str | None:
@@ -23,6 +108,10 @@ def _to_iso(value: Any) -> str | None:
     return str(value)
 
 
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 def _build_jobs_filters(
     employment_type: str | None,
     role_type: str | None,
@@ -32,8 +121,16 @@ def _build_jobs_filters(
     posted_to: datetime | None,
     deadline_before: datetime | None,
 ) -> tuple[list[str], dict[str, Any]]:
-    where_clauses = ["j.is_active = :is_active"]
-    params: dict[str, Any] = {"is_active": is_active}
+    # inlined rather than bound: the sort key indexes are partial on is_active, and only a literal
+    # lets the planner match them in every plan, generic ones included
+    where_clauses = ["j.is_active" if is_active else "NOT j.is_active"]
+    params: dict[str, Any] = {}
+
+    # checked here, not left to the enum cast: a failed cast is a DataError from the query
+    if employment_type and employment_type not in EMPLOYMENT_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown employment_type: {employment_type}")
+    if role_type and role_type not in ROLE_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unknown role_type: {role_type}")
 
     if employment_type:
         where_clauses.append("jc.employment_type = :employment_type")
@@ -44,30 +141,109 @@ def _build_jobs_filters(
         params["role_type"] = role_type
 
     if q:
-        where_clauses.append("(j.company_name ILIKE :q OR j.title ILIKE :q)")
-        params["q"] = f"%{q}%"
-
+        # whole words over title, company, tech stack and description (search_vector), plus
+        # substrings of company and title; each arm has its own GIN index, combined by a BitmapOr
+        where_clauses.append(
+            f"(j.search_vector @@ {SEARCH_QUERY_SQL} OR j.company_name ILIKE :q_like OR j.title ILIKE :q_like)"
+        )
+        params["q_text"] = fold_text(q)
+        params["q_like"] = f"%{_like_escape(q.strip())}%"
+
+    # date bounds go on the sort key expressions, so the index that orders the page also ranges it;
+    # same rows as comparing the bare columns, since a NULL date never passes either way
     if posted_from:
-        where_clauses.append("j.posted_at >= :posted_from")
+        where_clauses.append(f"{POSTED_AT_KEY[0]} >= :posted_from")
         params["posted_from"] = posted_from
 
     if posted_to:
-        where_clauses.append("j.posted_at <= :posted_to")
+        where_clauses.append(f"{POSTED_AT_KEY[0]} <= :posted_to AND j.posted_at IS NOT NULL")
         params["posted_to"] = posted_to
 
     if deadline_before:
-        where_clauses.append("j.deadline_at <= :deadline_before")
+        where_clauses.append(f"{DEADLINE_AT_KEY[0]} <= :deadline_before")
         params["deadline_before"] = deadline_before
 
     return where_clauses, params
 
 
-def _sort_clause(sort: SortOption) -> str:
+def _jobs_from_sql(where_clauses: list[str]) -> str:
+    return f"""
+        FROM jobs j
+        LEFT JOIN job_classifications jc
+          ON jc.job_id = j.id
+         AND jc.rule_version = :rule_version
+        WHERE {" AND ".join(where_clauses)}
+    """
+
+
+def _sort_keys(sort: SortOption, classified_only: bool) -> tuple[str, list[tuple[str, str]]]:
     if sort == "deadline_asc":
-        return "j.deadline_at ASC NULLS LAST"
+        return "ASC", [DEADLINE_AT_KEY, JOB_ID_KEY]
     if sort == "score_desc":
-        return "jc.new_grad_score DESC NULLS LAST, j.posted_at DESC NULLS LAST"
-    return "j.posted_at DESC NULLS LAST"
+        return "DESC", [CLASSIFIED_SCORE_KEY if classified_only else SCORE_KEY, POSTED_AT_KEY, JOB_ID_KEY]
+    return "DESC", [POSTED_AT_KEY, JOB_ID_KEY]
+
+
+def _sort_clause(direction: str, keys: list[tuple[str, str]]) -> str:
+    return ", ".join(f"{expression} {direction}" for expression, _ in keys)
+
+
+def _relevance_sort_clause() -> str:
+    # title matches (weight A) outrank company, tech stack and description; normalization 1
+    # keeps long descriptions from winning on repetition alone
+    return f"ts_rank(j.search_vector, {SEARCH_QUERY_SQL}, 1) DESC, {POSTED_AT_KEY[0]} DESC, j.id DESC"
+
+
+def _count_total(db: Session, count: CountOption, from_sql: str, params: dict[str, Any]) -> tuple[int | None, str]:
+    if count == "none":
+        return None, "none"
+    if count == "estimate":
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) SELECT 1 {from_sql}"), params).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), "estimate"
+
+    # the normalized filters: which clauses are set (the SQL) and their bound values
+    key = (from_sql, tuple(sorted(params.items())))
+    total = job_count_cache.get(key)
+    if total is not None:
+        return total, "cached"
+    generation = job_count_cache.generation
+    total = db.execute(text(f"SELECT COUNT(*) {from_sql}"), params).scalar_one()
+    job_count_cache.put(key, total, generation)
+    return total, "exact"
+
+
+def _encode_cursor(payload: dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _cursor_value(value: Any, cast: str) -> Any:
+    # parsed back to the key's type here, so a tampered value is a 400 and never reaches the query
+    if not isinstance(value, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        if cast == "timestamptz":
+            # sort keys come back as Postgres timestamptz text, with +/-infinity for missing dates
+            return value if value in ("infinity", "-infinity") else datetime.fromisoformat(value)
+        number = int(value)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    bits = 32 if cast == "integer" else 64
+    if not -(2 ** (bits - 1)) <= number < 2 ** (bits - 1):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return number
+
+
+def _decode_cursor(cursor: str, sort: str) -> dict[str, Any]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if not isinstance(payload, dict) or payload.get("s") != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not belong to this sort")
+    return payload
 
 
 @router.get("")
@@ -82,9 +258,14 @@ def list_jobs(
     sort: SortOption = Query(default="posted_at_desc"),
     page: int = Query(default=1, ge=1),
     size: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    count: CountOption = Query(default="exact"),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     settings = get_settings()
+    if q:
+        # "backend  api" and " backend api" are the same search, and share one cached total
+        q = " ".join(q.split()) or None
     where_clauses, params = _build_jobs_filters(
         employment_type=employment_type,
         role_type=role_type,
@@ -95,21 +276,45 @@ def list_jobs(
         deadline_before=deadline_before,
     )
 
-    where_sql = " AND ".join(where_clauses)
-    order_sql = _sort_clause(sort)
-    offset = (page - 1) * size
-
-    base_from_sql = f"""
-        FROM jobs j
-        LEFT JOIN job_classifications jc
-          ON jc.job_id = j.id
-         AND jc.rule_version = :rule_version
-        WHERE {where_sql}
-    """
-
-    count_sql = text(f"SELECT COUNT(*) {base_from_sql}")
-    total = db.execute(count_sql, {**params, "rule_version": settings.rule_version}).scalar_one()
+    # the total counts the filters only, before a cursor narrows them to the rows after it
+    count_from_sql = _jobs_from_sql(where_clauses)
+    count_params = {**params, "rule_version": settings.rule_version}
 
+    # page/size is plain OFFSET paging; a cursor continues after the last row of the previous
+    # response instead, so deep pages cost the same as the first and new rows do not shift them
+    offset = (page - 1) * size
+    keys: list[tuple[str, str]] = []
+    if sort == "relevance" and q:
+        # ts_rank is computed per query, no index to seek into: the cursor carries an offset
+        sort_name = "relevance"
+        order_sql = _relevance_sort_clause()
+        if cursor:
+            offset = _decode_cursor(cursor, sort_name).get("o")
+            if not isinstance(offset, int) or offset < 0:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        sort_name = "posted_at_desc" if sort == "relevance" else sort
+        direction, keys = _sort_keys(sort_name, classified_only=bool(employment_type or role_type))
+        order_sql = _sort_clause(direction, keys)
+        if cursor:
+            values = _decode_cursor(cursor, sort_name).get("k")
+            if not isinstance(values, list) or len(values) != len(keys):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            operator = "<" if direction == "DESC" else ">"
+            expressions = ", ".join(expression for expression, _ in keys)
+            bounds = ", ".join(f"CAST(:cursor_{index} AS {cast})" for index, (_, cast) in enumerate(keys))
+            where_clauses.append(f"({expressions}) {operator} ({bounds})")
+            # score_desc compares columns of two tables, which no single index covers; bounding the
+            # leading key on its own lets the job_classifications index seek to the cursor
+            where_clauses.append(f"{keys[0][0]} {operator}= CAST(:cursor_0 AS {keys[0][1]})")
+            params.update(
+                {f"cursor_{index}": _cursor_value(value, cast) for index, (value, (_, cast)) in enumerate(zip(values, keys))}
+            )
+            offset = 0
+
+    sort_key_sql = "".join(
+        f",\n          CAST({expression} AS text) AS sort_key_{index}" for index, (expression, _) in enumerate(keys)
+    )
     data_sql = text(
         f"""
         SELECT
@@ -122,8 +327,8 @@ def list_jobs(
           COALESCE(jc.new_grad_score, 0) AS new_grad_score,
           j.posted_at,
           j.deadline_at,
-          j.is_active
-        {base_from_sql}
+          j.is_active{sort_key_sql}
+        {_jobs_from_sql(where_clauses)}
         ORDER BY {order_sql}
         LIMIT :limit OFFSET :offset
         """
@@ -134,11 +339,21 @@ def list_jobs(
         {
             **params,
             "rule_version": settings.rule_version,
-            "limit": size,
+            # one extra row says whether there is a next page
+            "limit": size + 1,
             "offset": offset,
         },
     ).mappings().all()
 
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        if keys:
+            last = rows[-1]
+            next_cursor = _encode_cursor({"s": sort_name, "k": [last[f"sort_key_{index}"] for index in range(len(keys))]})
+        else:
+            next_cursor = _encode_cursor({"s": sort_name, "o": offset + size})
+
     items = [
         {
             "job_id": row["job_id"],
@@ -155,7 +370,20 @@ def list_jobs(
         for row in rows
     ]
 
-    return {"items": items, "page": page, "size": size, "total": total}
+    total, total_kind = _count_total(db, count, count_from_sql, count_params)
+    if total_kind == "estimate" and items:
+        # never report fewer rows than this response has already shown to exist
+        total = max(total, offset + len(items) + (1 if next_cursor else 0))
+
+    return {
+        "items": items,
+        "page": page,
+        "size": size,
+        "total": total,
+        "total_kind": total_kind,
+        "has_more": next_cursor is not None,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/today")
@@ -164,6 +392,8 @@ def list_today_jobs(
     is_active: bool = Query(default=True),
     page: int = Query(default=1, ge=1),
     size: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    count: CountOption = Query(default="exact"),
     db: Session = Depends(get_db),
 ) -> dict[str, Any]:
     now = datetime.now(timezone.utc)
@@ -180,10 +410,53 @@ def list_today_jobs(
         sort="posted_at_desc",
         page=page,
         size=size,
+        cursor=cursor,
+        count=count,
         db=db,
     )
 
 
+def _trigram_installed(db: Session) -> bool:
+    return db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+
+
+@router.get("/suggest")
+def suggest_jobs(
+    q: str = Query(min_length=2, max_length=100),
+    limit: int = Query(default=SUGGEST_LIMIT, ge=1, le=20),
+    is_active: bool = Query(default=True),
+    db: Session = Depends(get_db),
+) -> dict[str, Any]:
+    term = q.strip()
+    params = {
+        "q": term,
+        "q_like": f"%{_like_escape(term)}%",
+        "q_prefix": f"{_like_escape(term)}%",
+        "is_active": is_active,
+        "limit": limit,
+    }
+
+    def completions(sql) -> list[dict[str, Any]]:
+        return [
+            {"value": row["value"], "job_count": row["job_count"], "score": round(float(row["score"]), 3)}
+            for row in db.execute(sql, params).mappings().all()
+        ]
+
+    if _trigram_installed(db):
+        return {
+            "q": term,
+            "fuzzy": True,
+            "companies": completions(SUGGEST_COMPANIES_SQL),
+            "titles": completions(SUGGEST_TITLES_SQL),
+        }
+    return {
+        "q": term,
+        "fuzzy": False,
+        "companies": completions(SUGGEST_COMPANIES_SUBSTRING_SQL),
+        "titles": completions(SUGGEST_TITLES_SUBSTRING_SQL),
+    }
+
+
 @router.get("/{job_id}")
 def get_job_detail(job_id: int, db: Session = Depends(get_db)) -> dict[str, Any]:
     settings = get_settings()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.core.db import SessionLocal
+from app.services.search_text import BACKFILL_BATCH_SIZE, backfill_search_text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fill jobs.search_text for rows written before it existed")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE)
+    parser.add_argument("--recompute", action="store_true", help="rewrite every row, not only empty ones")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        updated = backfill_search_text(db, batch_size=args.batch_size, recompute=args.recompute)
+    finally:
+        db.close()
+    print(f"[search_text] {updated} jobs in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import time
+import tracemalloc
+from typing import Any, Iterator
+
+from app.services.classifier.rule_engine import (
+    Rule,
+    _build_text_blob,
+    _compute_score,
+    _pick_employment,
+    _pick_role,
+    compile_rules,
+)
+
+# Micro-benchmark of the rule engine's per-job path (text blob -> keyword scan -> employment, role and
+# score picks) over a synthetic Korean/English corpus. No database needed.
+#   python -m app.scripts.bench_classifier --output cls.json    (the full matrix takes a few minutes)
+#   python -m app.scripts.bench_classifier --sizes 1000,10000 --rule-counts 50,500 --baseline cls.json
+# Jobs are generated lazily from a seed, so a 100k run does not hold the corpus in memory and every
+# run with the same seed sees the same postings.
+
+KO_TERMS = [
+    "신입", "경력", "경력무관", "채용연계형", "체험형 인턴", "정규직 전환", "현장실습", "졸업예정", "백엔드", "서버",
+    "프론트엔드", "데이터 엔지니어", "인프라", "클라우드", "대용량 트래픽", "코드 리뷰", "멘토링", "우대사항", "자격요건",
+    "3년 이상", "5년 이상", "신입 가능", "디자이너", "마케터", "주니어", "시니어", "병역특례", "원격 근무", "스타트업",
+]
+EN_TERMS = [
+    "backend", "server", "api", "spring", "java", "kotlin", "django", "fastapi", "node", "go", "python", "postgresql",
+    "kafka", "redis", "kubernetes", "aws", "frontend", "react", "typescript", "intern", "internship", "new grad",
+    "junior", "senior", "entry level", "3+ years", "5+ years", "designer", "marketing", "platform", "reliability",
+]
+KO_FILLER = [
+    "저희 팀은 빠르게 성장하는 서비스를 함께 만들어 갈 동료를 찾고 있습니다.",
+    "지원서는 수시로 검토하며 적합한 분을 찾으면 채용이 조기 마감될 수 있습니다.",
+    "복지: 점심 식대 지원, 최신 장비 제공, 도서 구입비 지원, 자율 출퇴근.",
+    "전형 절차는 서류 전형, 1차 기술 면접, 2차 컬처핏 면접, 처우 협의 순입니다.",
+    "사내 스터디와 컨퍼런스 참가를 적극적으로 지원합니다.",
+]
+EN_FILLER = [
+    "We value ownership, clear written communication and shipping small changes often.",
+    "You will collaborate with product managers and designers to plan and deliver features.",
+    "Benefits include flexible hours, a learning budget and a home office allowance.",
+    "Our hiring process has a short screening call, a technical interview and a team chat.",
+    "We are an equal opportunity employer and welcome applicants from all backgrounds.",
+]
+TITLES = [
+    "Backend Engineer", "Junior Backend Developer", "신입 백엔드 개발자", "Server Engineer (Java/Spring)",
+    "Platform Engineer", "백엔드 엔지니어 (경력 3년 이상)", "Software Engineer Intern", "채용연계형 인턴 - 서버 개발",
+    "Data Engineer", "Product Designer", "프론트엔드 개발자", "Site Reliability Engineer", "그로스 마케터",
+]
+HTML_WRAPPERS = [
+    ("<p>", "</p>"), ("<li>", "</li>"), ("<div><span>", "</span></div>"), ("<strong>", "</strong>"), ("", "<br/>"),
+]
+HTML_ENTITIES = ["&nbsp;", "&amp;", "&lt;br&gt;", "&#39;", "&quot;"]
+EMPLOYMENT_RAW = [None, "full_time", "contract", "internship", "정규직", "인턴"]
+EXPERIENCE_RAW = [None, "신입", "경력 3년 이상", "경력무관", "3+ years", "Entry level"]
+
+CATEGORIES = ("employment", "role", "exclude", "score")
+TARGETS = {
+    "employment": ["intern_convertible", "intern_experience", "experienced", "new_grad"],
+    "role": ["backend", "frontend", "data", "devops"],
+    "exclude": ["backend"],
+    "score": ["new_grad"],
+}
+MATCH_TYPES = ["contains"] * 17 + ["word", "word", "regex"]
+REPORT_COLUMNS = [
+    ("jobs", 8),
+    ("rules", 7),
+    ("compile_ms", 11),
+    ("jobs/s", 10),
+    ("blob_us", 9),
+    ("match_us", 9),
+    ("pick_us", 9),
+    ("avg_chars", 10),
+    ("peak_kb", 9),
+]
+
+
+def _sentence(rng: random.Random, keyword_density: float) -> str:
+    korean = rng.random() < 0.5
+    sentence = rng.choice(KO_FILLER if korean else EN_FILLER)
+    if rng.random() < keyword_density:
+        term = rng.choice(KO_TERMS if korean else EN_TERMS)
+        # mixed casing, as boards write it
+        if not korean and rng.random() < 0.3:
+            term = term.upper() if rng.random() < 0.5 else term.title()
+        sentence = f"{term} {sentence}" if rng.random() < 0.5 else f"{sentence} ({term})"
+    if rng.random() < 0.15:
+        sentence += rng.choice(HTML_ENTITIES)
+    opening, closing = rng.choice(HTML_WRAPPERS)
+    return f"{opening}{sentence}{closing}"
+
+
+def iter_jobs(count: int, seed: int, keyword_density: float = 0.3, mean_chars: int = 2500) -> Iterator[dict[str, Any]]:
+    # description lengths are log-normal around mean_chars: most postings are a few KB, a few are long
+    rng = random.Random(seed)
+    for index in range(count):
+        target_chars = int(min(20 * mean_chars, rng.lognormvariate(0, 0.6) * mean_chars * 0.85))
+        parts: list[str] = []
+        length = 0
+        while length < target_chars:
+            sentence = _sentence(rng, keyword_density)
+            parts.append(sentence)
+            length += len(sentence)
+        yield {
+            "id": index + 1,
+            "title": rng.choice(TITLES),
+            "description_text": "\n".join(parts),
+            "employment_text_raw": rng.choice(EMPLOYMENT_RAW),
+            "experience_text_raw": rng.choice(EXPERIENCE_RAW),
+            "tech_stack_text": ", ".join(rng.sample(EN_TERMS[:16], rng.randint(0, 6))) or None,
+        }
+
+
+def synthetic_rules(count: int, seed: int) -> list[Rule]:
+    # real terms first so every rule set contains keywords that hit; made-up ones pad large sets
+    rng = random.Random(seed)
+    vocabulary = KO_TERMS + EN_TERMS
+    keywords = list(vocabulary)
+    index = 0
+    while len(keywords) < count:
+        if index % 2:
+            keywords.append(f"{rng.choice(EN_TERMS)}-{index}")
+        else:
+            keywords.append(f"{rng.choice(KO_TERMS)} {index}호")
+        index += 1
+    rng.shuffle(keywords)
+
+    rules = []
+    for position, keyword in enumerate(keywords[:count]):
+        category = CATEGORIES[position % len(CATEGORIES)]
+        match_type = rng.choice(MATCH_TYPES)
+        if match_type == "regex":
+            keyword = keyword.replace(" ", r"\s*")
+        rules.append(
+            Rule(
+                category=category,
+                target_value=rng.choice(TARGETS[category]),
+                keyword=keyword,
+                match_type=match_type,
+                priority=rng.randint(1, 50),
+                weight=rng.randint(-20, 20) if category == "score" else 0,
+                is_negation=False,
+            )
+        )
+    return rules
+
+
+def bench_case(size: int, rule_count: int, seed: int, keyword_density: float, trace_memory: bool) -> dict[str, Any]:
+    rules = synthetic_rules(rule_count, seed)
+    started = time.perf_counter()
+    compiled = compile_rules("bench", rules)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    employment_rules = compiled.grouped.get("employment", [])
+    role_rules = compiled.grouped.get("role", [])
+    exclude_rules = compiled.grouped.get("exclude", [])
+    score_rules = compiled.grouped.get("score", [])
+
+    blob_seconds = match_seconds = pick_seconds = 0.0
+    chars = 0
+    peak_kb = None
+    if trace_memory:
+        tracemalloc.start()
+    clock = time.perf_counter
+    for job in iter_jobs(size, seed, keyword_density):
+        if trace_memory:
+            # only the engine's own allocations count, not the generated posting
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        t0 = clock()
+        blob = _build_text_blob(job)
+        t1 = clock()
+        hits = compiled.hits(blob)
+        t2 = clock()
+        _pick_employment(employment_rules, hits)
+        _pick_role(role_rules, exclude_rules, hits)
+        _compute_score(score_rules, hits)
+        t3 = clock()
+        if trace_memory:
+            job_peak = (tracemalloc.get_traced_memory()[1] - baseline) // 1024
+            peak_kb = job_peak if peak_kb is None else max(peak_kb, job_peak)
+        blob_seconds += t1 - t0
+        match_seconds += t2 - t1
+        pick_seconds += t3 - t2
+        chars += len(blob)
+    if trace_memory:
+        tracemalloc.stop()
+
+    total = blob_seconds + match_seconds + pick_seconds
+    return {
+        "size": size,
+        "rule_count": rule_count,
+        "uses_automaton": compiled.matcher.uses_automaton,
+        "compile_ms": round(compile_ms, 2),
+        "jobs_per_sec": round(size / total, 1) if total > 0 else None,
+        "blob_us": round(blob_seconds / size * 1_000_000, 2),
+        "match_us": round(match_seconds / size * 1_000_000, 2),
+        "pick_us": round(pick_seconds / size * 1_000_000, 2),
+        "avg_chars": round(chars / size),
+        "tracemalloc_peak_kb": peak_kb,
+    }
+
+
+def _row_cells(row: dict[str, Any]) -> list[str]:
+    peak = row["tracemalloc_peak_kb"]
+    return [
+        str(row["size"]),
+        str(row["rule_count"]),
+        f"{row['compile_ms']:.1f}",
+        f"{row['jobs_per_sec']:.0f}" if row["jobs_per_sec"] is not None else "-",
+        f"{row['blob_us']:.1f}",
+        f"{row['match_us']:.1f}",
+        f"{row['pick_us']:.1f}",
+        str(row["avg_chars"]),
+        str(peak) if peak is not None else "-",
+    ]
+
+
+def print_report(results: list[dict[str, Any]], baseline: list[dict[str, Any]] | None = None) -> None:
+    header = "".join(name.rjust(width) for name, width in REPORT_COLUMNS)
+    if baseline is not None:
+        header += "  vs baseline"
+    print(header)
+
+    baseline_by_key = {(row["size"], row["rule_count"]): row for row in baseline or []}
+    for row in results:
+        line = "".join(cell.rjust(width) for cell, (_, width) in zip(_row_cells(row), REPORT_COLUMNS))
+        previous = baseline_by_key.get((row["size"], row["rule_count"]))
+        if previous and previous.get("jobs_per_sec") and row["jobs_per_sec"]:
+            change = (row["jobs_per_sec"] / previous["jobs_per_sec"] - 1) * 100
+            line += f"  {change:+.1f}% jobs/s"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the rule engine on a synthetic Korean/English corpus")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="comma separated job counts")
+    parser.add_argument("--rule-counts", default="50,500,5000", help="comma separated rule counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keyword-density", type=float, default=0.3, help="share of sentences carrying a term")
+    parser.add_argument("--trace-memory", action="store_true", help="report tracemalloc peak per job (slows runs)")
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare with an earlier --output file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    rule_counts = [int(count) for count in args.rule_counts.split(",") if count.strip()]
+
+    results = []
+    for rule_count in rule_counts:
+        for size in sizes:
+            print(f"[bench] {size} jobs x {rule_count} rules")
+            results.append(bench_case(size, rule_count, args.seed, args.keyword_density, args.trace_memory))
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"] if args.baseline else None
+    print_report(results, baseline)
+    if args.output:
+        payload = {"args": {key: str(value) for key, value in vars(args).items()}, "results": results}
+        args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"[bench] wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+from pathlib import Path
+import time
+import tracemalloc
+from typing import Any
+from urllib.request import Request, urlopen
+
+from sqlalchemy import create_engine, event, make_url, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import get_settings
+from app.scripts.replay_server import BOARD_TOKEN, serve
+from app.services.crawler.base import BaseCrawler
+from app.services.crawler.greenhouse import GreenhouseCrawler
+from app.services.crawler.remotive import RemotiveCrawler
+from app.services.crawler.runner import run_crawl
+
+# End-to-end ingestion benchmark: synthetic boards served from a local replay server are crawled
+# into a local Postgres through run_crawl, once cold and then once per generation of churn.
+#   python -m app.scripts.bench_ingest --database-url $BENCH_DATABASE_URL --sizes 1000,10000 --runs 3 --churn 0.05 --output bench.json
+#   python -m app.scripts.bench_ingest --database-url $BENCH_DATABASE_URL --sizes 1000,10000 --baseline bench.json
+# Bench sources are named bench_<kind>; their jobs and runs are deleted before each size.
+
+KINDS = ("remotive", "greenhouse")
+REPORT_COLUMNS = [
+    ("kind", 10),
+    ("size", 7),
+    ("run", 4),
+    ("fetched", 8),
+    ("ins", 7),
+    ("upd", 6),
+    ("unch", 7),
+    ("deact", 6),
+    ("total_ms", 9),
+    ("rows/s", 9),
+    ("stmts", 6),
+    ("reqs", 6),
+    ("MiB", 7),
+    ("peak_kb", 9),
+]
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.count += 1
+
+
+def _bench_source_code(kind: str) -> str:
+    return f"bench_{kind}"
+
+
+def _reset_source(db, source_code: str) -> None:
+    db.execute(
+        text(
+            """
+            INSERT INTO sources (code, name, base_url, is_active, crawl_interval_min)
+            VALUES (:code, :code, 'http://127.0.0.1', true, 1440)
+            ON CONFLICT (code) DO UPDATE SET is_active = true
+            """
+        ),
+        {"code": source_code},
+    )
+    source_id = db.execute(text("SELECT id FROM sources WHERE code = :code"), {"code": source_code}).scalar_one()
+    db.execute(text("DELETE FROM jobs WHERE source_id = :source_id"), {"source_id": source_id})
+    db.execute(text("DELETE FROM crawl_runs WHERE source_id = :source_id"), {"source_id": source_id})
+    db.commit()
+
+
+def _deactivate_source(db, source_code: str) -> None:
+    # the scheduler only plans sources with a registered crawler, but keep bench rows out of /jobs too
+    db.execute(
+        text(
+            """
+            UPDATE jobs SET is_active = false
+            WHERE source_id = (SELECT id FROM sources WHERE code = :code)
+            """
+        ),
+        {"code": source_code},
+    )
+    db.execute(text("UPDATE sources SET is_active = false WHERE code = :code"), {"code": source_code})
+    db.commit()
+
+
+def _start_server(size: int, churn: float, seed: int, description_chars: int) -> tuple[multiprocessing.Process, str]:
+    # a separate process keeps payload generation off this interpreter's GIL and allocator
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=serve,
+        args=(size, churn, seed, description_chars, 0, sender),
+        daemon=True,
+    )
+    process.start()
+    sender.close()
+    if not receiver.poll(30):
+        process.terminate()
+        raise RuntimeError("replay server did not start")
+    port = receiver.recv()
+    return process, f"http://127.0.0.1:{port}"
+
+
+def _advance(base_url: str) -> dict[str, int]:
+    with urlopen(Request(f"{base_url}/_control/advance", method="POST", data=b""), timeout=30) as response:
+        return json.loads(response.read())
+
+
+def _make_crawler(kind: str, base_url: str) -> BaseCrawler:
+    if kind == "remotive":
+        crawler = RemotiveCrawler()
+        crawler.source_code = _bench_source_code(kind)
+        crawler.endpoint = f"{base_url}/remotive/api/remote-jobs"
+        return crawler
+    return GreenhouseCrawler(
+        source_code=_bench_source_code(kind),
+        board_token=BOARD_TOKEN,
+        company_name="Bench",
+        api_base_url=f"{base_url}/greenhouse",
+    )
+
+
+def bench_size(
+    Session,
+    counter: StatementCounter,
+    kind: str,
+    size: int,
+    runs: int,
+    churn: float,
+    seed: int,
+    description_chars: int,
+    trace_memory: bool,
+) -> list[dict[str, Any]]:
+    source_code = _bench_source_code(kind)
+    results = []
+    process, base_url = _start_server(size, churn, seed, description_chars)
+    db = Session()
+    try:
+        _reset_source(db, source_code)
+        for run_index in range(runs):
+            if run_index:
+                _advance(base_url)
+
+            crawler = _make_crawler(kind, base_url)
+            statements_before = counter.count
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            result = run_crawl(db, source_code=source_code, crawler=crawler)
+            wall_ms = (time.perf_counter() - started) * 1000
+            peak_kb = None
+            if trace_memory:
+                peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+                tracemalloc.stop()
+
+            metrics = result["metrics"]
+            results.append(
+                {
+                    "kind": kind,
+                    "size": size,
+                    "run": run_index,
+                    "fetched": result["fetched_count"],
+                    "inserted": result["inserted_count"],
+                    "updated": result["updated_count"],
+                    "unchanged": result["unchanged_count"],
+                    "deactivated": result["deactivated_count"],
+                    "wall_ms": round(wall_ms, 1),
+                    "rows_per_sec": round(result["fetched_count"] / (wall_ms / 1000), 1) if wall_ms else None,
+                    "statements": counter.count - statements_before,
+                    "requests": metrics["request_count"],
+                    "bytes_downloaded": result["bytes_downloaded"],
+                    "fetch_ms": metrics["fetch_ms"],
+                    "parse_ms": metrics["parse_ms"],
+                    "upsert_ms": metrics["upsert_ms"],
+                    "tracemalloc_peak_kb": peak_kb,
+                }
+            )
+        _deactivate_source(db, source_code)
+    finally:
+        db.close()
+        process.terminate()
+        process.join()
+    return results
+
+
+def _row_cells(row: dict[str, Any]) -> list[str]:
+    peak = row["tracemalloc_peak_kb"]
+    return [
+        row["kind"],
+        str(row["size"]),
+        str(row["run"]),
+        str(row["fetched"]),
+        str(row["inserted"]),
+        str(row["updated"]),
+        str(row["unchanged"]),
+        str(row["deactivated"]),
+        f"{row['wall_ms']:.0f}",
+        f"{row['rows_per_sec']:.0f}" if row["rows_per_sec"] is not None else "-",
+        str(row["statements"]),
+        str(row["requests"]),
+        f"{row['bytes_downloaded'] / 1024 / 1024:.1f}",
+        str(peak) if peak is not None else "-",
+    ]
+
+
+def print_report(results: list[dict[str, Any]], baseline: list[dict[str, Any]] | None = None) -> None:
+    header = "".join(name.rjust(width) for name, width in REPORT_COLUMNS)
+    if baseline is not None:
+        header += "  vs baseline"
+    print(header)
+
+    baseline_by_key = {(row["kind"], row["size"], row["run"]): row for row in baseline or []}
+    for row in results:
+        line = "".join(cell.rjust(width) for cell, (_, width) in zip(_row_cells(row), REPORT_COLUMNS))
+        previous = baseline_by_key.get((row["kind"], row["size"], row["run"]))
+        if previous and previous.get("rows_per_sec") and row["rows_per_sec"]:
+            change = (row["rows_per_sec"] / previous["rows_per_sec"] - 1) * 100
+            line += f"  {change:+.1f}% rows/s, {row['statements'] - previous['statements']:+d} stmts"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark crawl ingestion against a local replay server")
+    parser.add_argument("--kinds", default=",".join(KINDS), help="comma separated: remotive,greenhouse")
+    parser.add_argument("--sizes", default="1000,10000", help="comma separated posting counts")
+    parser.add_argument("--runs", type=int, default=3, help="first run is cold, each later one applies churn")
+    parser.add_argument("--churn", type=float, default=0.05, help="share of postings changed per run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--description-chars", type=int, default=2000)
+    parser.add_argument(
+        "--database-url",
+        required=True,
+        help="a scratch database migrated to head; the app's own DATABASE_URL is refused",
+    )
+    parser.add_argument("--trace-memory", action="store_true", help="report tracemalloc peak (slows runs)")
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare with an earlier --output file")
+    args = parser.parse_args()
+
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()]
+    unknown = set(kinds) - set(KINDS)
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(sorted(unknown))}")
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    # the bench resets and rewrites its sources' jobs and crawl runs; keep it off the app's database
+    if make_url(args.database_url) == make_url(get_settings().database_url):
+        parser.error("--database-url is the app's DATABASE_URL; point the bench at a scratch database")
+
+    engine = create_engine(args.database_url)
+    Session = sessionmaker(bind=engine)
+    counter = StatementCounter(engine)
+
+    results = []
+    try:
+        for kind in kinds:
+            for size in sizes:
+                print(f"[bench] {kind} x {size} ({args.runs} runs, churn {args.churn})")
+                results.extend(
+                    bench_size(
+                        Session,
+                        counter,
+                        kind=kind,
+                        size=size,
+                        runs=args.runs,
+                        churn=args.churn,
+                        seed=args.seed,
+                        description_chars=args.description_chars,
+                        trace_memory=args.trace_memory,
+                    )
+                )
+    finally:
+        engine.dispose()
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"] if args.baseline else None
+    print_report(results, baseline)
+    if args.output:
+        payload = {"args": {key: str(value) for key, value in vars(args).items()}, "results": results}
+        args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"[bench] wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import random
+import re
+import time
+from typing import Any
+
+from app.scripts.replay_server import PARAGRAPHS, TAGS, TITLES
+from app.services.classifier.rule_engine import Rule, classify_job, compile_rules
+
+# Per-job classification cost of the same keywords as `contains`, `word` and `regex` rules, plus the
+# shipped seed rule versions. No database needed: jobs are built from the replay server's corpus.
+#   python -m app.scripts.bench_match_types --jobs 5000 --rule-counts 30,300,3000 --output match.json
+
+SEEDS_DIR = Path(__file__).resolve().parents[1] / "seeds"
+SEED_FILES = {"v1.0.0": "classification_rules_v1.sql", "v1.1.0": "classification_rules_v1_1.sql"}
+SEED_ROW = re.compile(r"\('([^']*)','([^']*)','([^']*)','([^']*)','([^']*)',(-?\d+),(-?\d+),(true|false),(true|false)\)")
+CATEGORIES = ("employment", "role", "exclude", "score")
+
+
+def seed_rules(rule_version: str) -> list[Rule]:
+    rules = []
+    for row in SEED_ROW.findall((SEEDS_DIR / SEED_FILES[rule_version]).read_text(encoding="utf-8")):
+        _, category, target_value, keyword, match_type, priority, weight, is_negation, _ = row
+        rules.append(Rule(category, target_value, keyword, match_type, int(priority), int(weight), is_negation == "true"))
+    return rules
+
+
+def synthetic_jobs(count: int, seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": index,
+            "title": rng.choice(TITLES),
+            "description_text": " ".join(rng.choices(PARAGRAPHS, k=rng.randint(2, 8))),
+            "employment_text_raw": rng.choice([None, "full_time", "internship"]),
+            "experience_text_raw": rng.choice([None, "신입", "경력 3년 이상", "3+ years"]),
+            "tech_stack_text": ", ".join(rng.sample(TAGS, 4)),
+        }
+        for index in range(count)
+    ]
+
+
+def keyword_pool(count: int, seed: int) -> list[str]:
+    # real words from the corpus first, then made-up ones that never hit
+    words = sorted({word.lower() for text in TITLES + PARAGRAPHS + TAGS for word in re.findall(r"\w{3,}", text)})
+    rng = random.Random(seed)
+    rng.shuffle(words)
+    return (words + [f"kw{index:05d}" for index in range(count)])[:count]
+
+
+def rules_as(match_type: str, keywords: list[str]) -> list[Rule]:
+    rules = []
+    for index, keyword in enumerate(keywords):
+        pattern = rf"\b{re.escape(keyword)}\b" if match_type == "regex" else keyword
+        category = CATEGORIES[index % len(CATEGORIES)]
+        rules.append(Rule(category, f"target_{index % 5}", pattern, match_type, index % 50, index % 7 - 3, False))
+    return rules
+
+
+def time_rule_set(rules: list[Rule], jobs: list[dict[str, Any]], repeat: int) -> dict[str, Any]:
+    started = time.perf_counter()
+    compiled = compile_rules("bench", rules)
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for job in jobs:
+            classify_job(compiled, job)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "rule_count": len(rules),
+        "compile_ms": round(compile_ms, 2),
+        "us_per_job": round(best / len(jobs) * 1_000_000, 2),
+        "jobs_per_sec": round(len(jobs) / best, 1),
+    }
+
+
+def run(jobs: list[dict[str, Any]], rule_counts: list[int], repeat: int, seed: int) -> list[dict[str, Any]]:
+    results = []
+    for rule_version in SEED_FILES:
+        results.append({"rule_set": f"seed {rule_version}", **time_rule_set(seed_rules(rule_version), jobs, repeat)})
+    for count in rule_counts:
+        keywords = keyword_pool(count, seed)
+        for match_type in ("contains", "word", "regex"):
+            timing = time_rule_set(rules_as(match_type, keywords), jobs, repeat)
+            results.append({"rule_set": f"{count} {match_type}", **timing})
+    return results
+
+
+def print_report(results: list[dict[str, Any]], baseline: list[dict[str, Any]] | None = None) -> None:
+    contains_cost = {
+        row["rule_count"]: row["us_per_job"] for row in results if row["rule_set"].endswith(" contains")
+    }
+    baseline_by_set = {row["rule_set"]: row for row in baseline or []}
+    print(f"{'rule_set':>16}{'rules':>7}{'compile_ms':>12}{'us/job':>9}{'jobs/s':>10}{'x contains':>12}")
+    for row in results:
+        contains_us = contains_cost.get(row["rule_count"]) if not row["rule_set"].startswith("seed") else None
+        relative = f"{row['us_per_job'] / contains_us:.2f}" if contains_us else "-"
+        line = (
+            f"{row['rule_set']:>16}{row['rule_count']:>7}{row['compile_ms']:>12.1f}"
+            f"{row['us_per_job']:>9.1f}{row['jobs_per_sec']:>10.0f}{relative:>12}"
+        )
+        previous = baseline_by_set.get(row["rule_set"])
+        if previous:
+            line += f"  {(row['us_per_job'] / previous['us_per_job'] - 1) * 100:+.1f}% us/job vs baseline"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-job cost of contains, word and regex rules")
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--rule-counts", default="30,300", help="comma separated rule counts per match type")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N passes over the jobs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare with an earlier --output file")
+    args = parser.parse_args()
+
+    jobs = synthetic_jobs(args.jobs, args.seed)
+    rule_counts = [int(count) for count in args.rule_counts.split(",") if count.strip()]
+    print(f"[bench] {len(jobs)} jobs, rule counts {rule_counts}, best of {args.repeat}")
+    results = run(jobs, rule_counts, args.repeat, args.seed)
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"] if args.baseline else None
+    print_report(results, baseline)
+    if args.output:
+        payload = {"args": {key: str(value) for key, value in vars(args).items()}, "results": results}
+        args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"[bench] wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
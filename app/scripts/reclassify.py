@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import argparse
+
+from app.core.config import get_settings
+from app.core.db import SessionLocal
+from app.services.classifier.reclassify import DEFAULT_WORKERS, RECLASSIFY_CHUNK_SIZE, run_reclassification
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reclassify every active job under a rule version")
+    parser.add_argument("--rule-version", default=None, help="defaults to RULE_VERSION")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=RECLASSIFY_CHUNK_SIZE)
+    parser.add_argument("--restart", action="store_true", help="start over instead of resuming an unfinished run")
+    args = parser.parse_args()
+
+    result = run_reclassification(
+        SessionLocal,
+        rule_version=args.rule_version or get_settings().rule_version,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        restart=args.restart,
+    )
+    print(
+        f"[reclassify] run {result['run_id']}: {result['processed_count']} jobs "
+        f"in {result['elapsed_ms']:.0f} ms ({result['jobs_per_sec']} jobs/s, {result['workers']} workers)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+from typing import Any, Iterator
+from urllib.parse import parse_qs, urlsplit
+import zlib
+
+# Serves synthetic Remotive- and Greenhouse-shaped boards so crawls can be benchmarked without
+# touching real job boards.
+#   python -m app.scripts.replay_server --size 10000 --churn 0.05 --port 8765
+#   GET  /remotive/api/remote-jobs                 Remotive listing
+#   GET  /greenhouse/<token>/jobs[?content=true]   Greenhouse index / full board
+#   GET  /greenhouse/<token>/jobs/<id>             Greenhouse detail
+#   POST /_control/advance                         apply one generation of churn
+
+BOARD_TOKEN = "bench"
+WRITE_CHUNK_SIZE = 64 * 1024
+BASE_TIME = datetime(2026, 10, 1, tzinfo=timezone.utc)
+
+TITLES = [
+    "Backend Engineer",
+    "Junior Backend Developer",
+    "신입 백엔드 개발자",
+    "Server Engineer (Java/Spring)",
+    "Platform Engineer",
+    "백엔드 엔지니어 (경력 3년 이상)",
+    "Software Engineer Intern",
+    "채용연계형 인턴 - 서버 개발",
+    "Data Engineer",
+    "Site Reliability Engineer",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "토스랩", "당근마켓", "Umbrella", "Hooli", "우아한형제들"]
+TAGS = ["python", "java", "spring", "kotlin", "fastapi", "django", "postgresql", "kafka", "aws", "kubernetes"]
+LOCATIONS = ["Seoul, Korea", "Remote", "Worldwide", "Pangyo", "Busan"]
+PARAGRAPHS = [
+    "We are looking for an engineer to design and operate reliable APIs used by millions of users.",
+    "신입 및 주니어 개발자 지원을 환영합니다. 코드 리뷰와 멘토링 문화가 자리잡혀 있습니다.",
+    "You will own services end to end: design, implementation, testing, deployment and monitoring.",
+    "우대사항: 대용량 트래픽 처리 경험, 클라우드 환경 운영 경험, 테스트 코드 작성 습관.",
+    "Experience with relational databases, message queues and container orchestration is a plus.",
+    "근무 형태: 정규직 (수습 3개월), 자율 출퇴근, 원격 근무 주 2회 가능.",
+]
+
+
+class SyntheticBoard:
+    # Postings are numbered; each generation drops the oldest churn/2 postings, appends as many new
+    # ones and edits another churn/2 of the survivors, so a crawl after advance() sees all four outcomes.
+    def __init__(self, size: int, churn: float = 0.05, seed: int = 0, description_chars: int = 2000):
+        self.size = size
+        self.churn = churn
+        self.seed = seed
+        self.description_chars = description_chars
+        self.generation = 0
+        self.first_id = 1
+        self._edited: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.seed}-{self.size}-{self.generation}"'
+
+    def advance(self) -> dict[str, int]:
+        step = int(self.size * self.churn)
+        removed = step // 2
+        with self._lock:
+            survivors = range(self.first_id + removed, self.first_id + self.size)
+            self.generation += 1
+            self.first_id += removed
+            rng = random.Random(f"{self.seed}:{self.generation}")
+            edited = rng.sample(survivors, min(step - removed, len(survivors)))
+            for posting_id in edited:
+                self._edited[posting_id] = self.generation
+            self._edited = {key: value for key, value in self._edited.items() if key >= self.first_id}
+        return {"generation": self.generation, "removed": removed, "added": removed, "edited": len(edited)}
+
+    def snapshot(self) -> tuple[range, dict[int, int]]:
+        with self._lock:
+            return range(self.first_id, self.first_id + self.size), dict(self._edited)
+
+    def has_posting(self, posting_id: int) -> bool:
+        with self._lock:
+            return self.first_id <= posting_id < self.first_id + self.size
+
+    def version(self, posting_id: int, edited: dict[int, int] | None = None) -> int:
+        if edited is None:
+            with self._lock:
+                return self._edited.get(posting_id, 0)
+        return edited.get(posting_id, 0)
+
+    def description(self, posting_id: int, version: int) -> str:
+        paragraphs = []
+        length = 0
+        index = posting_id
+        while length < self.description_chars:
+            paragraph = f"<p>{PARAGRAPHS[index % len(PARAGRAPHS)]}</p>"
+            paragraphs.append(paragraph)
+            length += len(paragraph)
+            index += 7
+        if version:
+            paragraphs.append(f"<p>Updated in revision {version}.</p>")
+        return "".join(paragraphs)
+
+    def _common(self, posting_id: int, version: int) -> dict[str, Any]:
+        title = TITLES[posting_id % len(TITLES)]
+        return {
+            "title": f"{title} (rev {version})" if version else title,
+            "company": COMPANIES[posting_id % len(COMPANIES)],
+            "tags": [TAGS[(posting_id + offset) % len(TAGS)] for offset in range(3)],
+            "location": LOCATIONS[posting_id % len(LOCATIONS)],
+            "updated_at": (BASE_TIME + timedelta(minutes=posting_id, days=version)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+
+    def remotive_item(self, posting_id: int, version: int) -> dict[str, Any]:
+        common = self._common(posting_id, version)
+        return {
+            "id": posting_id,
+            "url": f"https://remotive.test/remote-jobs/software-dev/{posting_id}",
+            "title": common["title"],
+            "company_name": common["company"],
+            "category": "Software Development",
+            "tags": common["tags"],
+            "job_type": "internship" if posting_id % 5 == 0 else "full_time",
+            "publication_date": common["updated_at"],
+            "candidate_required_location": common["location"],
+            "salary": "",
+            "description": self.description(posting_id, version),
+        }
+
+    def greenhouse_item(self, posting_id: int, version: int, content: bool) -> dict[str, Any]:
+        common = self._common(posting_id, version)
+        item: dict[str, Any] = {
+            "id": posting_id,
+            "internal_job_id": posting_id * 10,
+            "absolute_url": f"https://boards.greenhouse.test/{BOARD_TOKEN}/jobs/{posting_id}",
+            "title": common["title"],
+            "updated_at": common["updated_at"],
+            "location": {"name": common["location"]},
+            "metadata": None,
+        }
+        if content:
+            item["content"] = self.description(posting_id, version)
+            item["departments"] = [{"id": 1, "name": "Engineering"}]
+            item["offices"] = [{"id": 1, "name": common["location"]}]
+        return item
+
+    def iter_listing(self, kind: str, content: bool = True) -> Iterator[bytes]:
+        # the body is generated while it is written so a 100k-posting board never sits in memory
+        ids, edited = self.snapshot()
+        yield b'{"jobs":['
+        buffer: list[str] = []
+        buffered = 0
+        for index, posting_id in enumerate(ids):
+            version = self.version(posting_id, edited)
+            if kind == "remotive":
+                item = self.remotive_item(posting_id, version)
+            else:
+                item = self.greenhouse_item(posting_id, version, content)
+            encoded = ("," if index else "") + json.dumps(item, ensure_ascii=False)
+            buffer.append(encoded)
+            buffered += len(encoded)
+            if buffered >= WRITE_CHUNK_SIZE:
+                yield "".join(buffer).encode("utf-8")
+                buffer, buffered = [], 0
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+        yield f'],"meta":{{"total":{len(ids)}}}}}'.encode("utf-8")
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    board: SyntheticBoard
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        segments = [segment for segment in parts.path.split("/") if segment]
+        query = parse_qs(parts.query)
+
+        if segments == ["remotive", "api", "remote-jobs"]:
+            self._send_listing(self.board.iter_listing("remotive"))
+        elif len(segments) == 3 and segments[0] == "greenhouse" and segments[2] == "jobs":
+            content = query.get("content", ["false"])[0] == "true"
+            self._send_listing(self.board.iter_listing("greenhouse", content=content))
+        elif len(segments) == 4 and segments[0] == "greenhouse" and segments[2] == "jobs" and segments[3].isdigit():
+            posting_id = int(segments[3])
+            if not self.board.has_posting(posting_id):
+                self._send_bytes(404, b'{"status":404}')
+                return
+            item = self.board.greenhouse_item(posting_id, self.board.version(posting_id), content=True)
+            self._send_bytes(200, json.dumps(item, ensure_ascii=False).encode("utf-8"))
+        else:
+            self._send_bytes(404, b'{"status":404}')
+
+    def do_POST(self):
+        if urlsplit(self.path).path == "/_control/advance":
+            self._send_bytes(200, json.dumps(self.board.advance()).encode("utf-8"))
+        else:
+            self._send_bytes(404, b'{"status":404}')
+
+    def _send_listing(self, body: Iterator[bytes]) -> None:
+        etag = self.board.etag
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        gzipped = "gzip" in (self.headers.get("Accept-Encoding") or "")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Transfer-Encoding", "chunked")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if gzipped else None
+        for chunk in body:
+            self._write_chunk(compressor.compress(chunk) if compressor else chunk)
+        if compressor:
+            self._write_chunk(compressor.flush())
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _send_bytes(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(board: SyntheticBoard, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    handler = type("BoundReplayHandler", (ReplayHandler,), {"board": board})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(size: int, churn: float, seed: int, description_chars: int, port: int, ready=None) -> None:
+    # `ready` is an optional multiprocessing connection that receives the bound port
+    server = make_server(SyntheticBoard(size, churn=churn, seed=seed, description_chars=description_chars), port=port)
+    if ready is not None:
+        ready.send(server.server_port)
+        ready.close()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve synthetic job boards for crawl benchmarks")
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--churn", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--description-chars", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"[replay] serving {args.size} postings on http://127.0.0.1:{args.port}")
+    serve(args.size, args.churn, args.seed, args.description_chars, args.port)
+
+
+if __name__ == "__main__":
+    main()
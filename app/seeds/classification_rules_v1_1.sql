@@ -0,0 +1,52 @@
+-- v1.1.0: short ASCII keywords match whole words only ("go" no longer hits "google"),
+-- year requirements and a few spellings are regex rules
+INSERT INTO classification_rules
+(rule_version, category, target_value, keyword, match_type, priority, weight, is_negation, is_active)
+VALUES
+-- employment: intern convertible
+('v1.1.0','employment','intern_convertible','채용연계형','contains',10,0,false,true),
+('v1.1.0','employment','intern_convertible','정규직 전환','contains',10,0,false,true),
+('v1.1.0','employment','intern_convertible','전환형 인턴','contains',10,0,false,true),
+
+-- employment: intern experience
+('v1.1.0','employment','intern_experience','체험형 인턴','contains',20,0,false,true),
+('v1.1.0','employment','intern_experience','직무체험','contains',20,0,false,true),
+('v1.1.0','employment','intern_experience','현장실습','contains',20,0,false,true),
+
+-- employment: experienced
+('v1.1.0','employment','experienced','3년 이상','contains',30,0,false,true),
+('v1.1.0','employment','experienced','경력','contains',30,0,false,true),
+('v1.1.0','employment','experienced','([3-9]|[1-9][0-9])\s*년\s*이상','regex',30,0,false,true),
+('v1.1.0','employment','experienced','([3-9]|[1-9][0-9])\+?\s*years','regex',30,0,false,true),
+
+-- employment: new grad
+('v1.1.0','employment','new_grad','신입','contains',40,0,false,true),
+('v1.1.0','employment','new_grad','경력무관','contains',40,0,false,true),
+('v1.1.0','employment','new_grad','졸업예정','contains',40,0,false,true),
+
+-- role: backend
+('v1.1.0','role','backend','백엔드','contains',10,0,false,true),
+('v1.1.0','role','backend','backend','contains',10,0,false,true),
+('v1.1.0','role','backend','server','word',10,0,false,true),
+('v1.1.0','role','backend','api','word',10,0,false,true),
+('v1.1.0','role','backend','spring','word',10,0,false,true),
+('v1.1.0','role','backend','java','word',10,0,false,true),
+('v1.1.0','role','backend','kotlin','word',10,0,false,true),
+('v1.1.0','role','backend','django','word',10,0,false,true),
+('v1.1.0','role','backend','fastapi','word',10,0,false,true),
+('v1.1.0','role','backend','node','word',10,0,false,true),
+('v1.1.0','role','backend','go','word',10,0,false,true),
+('v1.1.0','role','backend','golang','word',10,0,false,true),
+('v1.1.0','role','backend','node\.?js','regex',10,0,false,true),
+
+-- exclude
+('v1.1.0','exclude','backend','디자이너','contains',5,0,false,true),
+('v1.1.0','exclude','backend','마케터','contains',5,0,false,true),
+
+-- score
+('v1.1.0','score','new_grad','신입 가능','contains',10,15,false,true),
+('v1.1.0','score','new_grad','경력무관','contains',10,10,false,true),
+('v1.1.0','score','new_grad','3년 이상','contains',10,-20,false,true),
+('v1.1.0','score','new_grad','entry[- ]?level','regex',10,10,false,true),
+('v1.1.0','score','new_grad','junior','word',10,10,false,true)
+ON CONFLICT (rule_version, category, target_value, keyword, is_negation) DO NOTHING;
@@ -10,7 +10,7 @@ from app.core.config import get_settings
 def run_seed() -> None:
     settings = get_settings()
     root = Path(__file__).resolve().parent
-    files = [root / "sources_seed.sql", root / "classification_rules_v1.sql"]
+    files = [root / "sources_seed.sql", root / "classification_rules_v1.sql", root / "classification_rules_v1_1.sql"]
 
     dsn = settings.database_url.replace("+psycopg", "")
     with psycopg.connect(dsn) as conn:
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from collections import deque
+import re
+from typing import Iterable
+
+# Below this many distinct keywords, one C-level substring search per keyword over the
+# lower-cased blob beats walking an automaton character by character in Python.
+SCAN_KEYWORD_LIMIT = 128
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _at_word_boundary(text: str, start: int, end: int) -> bool:
+    return (start == 0 or not _is_word_char(text[start - 1])) and (end == len(text) or not _is_word_char(text[end]))
+
+
+class KeywordAutomaton:
+    # Aho-Corasick: a trie of all keywords plus failure links, so one pass over the text reports
+    # every keyword it contains, overlapping ones included.
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._outputs: list[tuple[str, ...]] = [()]
+        for keyword in dict.fromkeys(keyword for keyword in keywords if keyword):
+            node = 0
+            for char in keyword:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][char] = child
+                    self._goto.append({})
+                    self._outputs.append(())
+                node = child
+            self._outputs[node] += (keyword,)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # a node also reports every keyword that ends at its longest proper suffix
+                self._outputs[child] += self._outputs[self._fail[child]]
+
+    def find(self, text: str) -> set[str]:
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found: set[str] = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return found
+
+
+def _skip_class(pattern: str, index: int) -> int:
+    # index points at "["; returns the index just past the closing "]" ("[]...]" and "[^]...]" included)
+    index += 1
+    if pattern[index : index + 1] == "^":
+        index += 1
+    if pattern[index : index + 1] == "]":
+        index += 1
+    while index < len(pattern) and pattern[index] != "]":
+        index += 2 if pattern[index] == "\\" else 1
+    return index + 1
+
+
+def _skip_group(pattern: str, index: int) -> int:
+    # index points at "("; returns the index just past its matching ")"
+    depth = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == "[":
+            index = _skip_class(pattern, index)
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return index + 1
+        index += 1
+    return index
+
+
+def required_literal(pattern: str) -> str | None:
+    # The longest run of plain characters every match of the pattern must contain, lower-cased, or
+    # None when there is no such run (or the pattern is too clever to tell). Conservative by design:
+    # groups, classes and escapes like \s end a run; a top-level | or a numeric escape gives up.
+    runs: list[str] = []
+    current: list[str] = []
+
+    def end_run() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            escaped = pattern[index + 1 : index + 2]
+            if escaped in ("x", "u", "U", "N") or escaped.isdigit():
+                return None
+            if escaped and not escaped.isalnum():
+                current.append(escaped)
+            else:
+                end_run()
+            index += 2
+            continue
+        if char == "|":
+            return None
+        if char == "(":
+            end_run()
+            index = _skip_group(pattern, index)
+            continue
+        if char == "[":
+            end_run()
+            index = _skip_class(pattern, index)
+            continue
+        if char in "*?{":
+            # the previous character may be absent
+            if current:
+                current.pop()
+            end_run()
+            if char == "{":
+                closing = pattern.find("}", index)
+                index = closing if closing != -1 else len(pattern)
+        elif char == "+":
+            # the previous character must occur but may repeat, so the run cannot continue past it
+            end_run()
+        elif char in ".^$":
+            end_run()
+        else:
+            current.append(char)
+        index += 1
+    end_run()
+
+    longest = max(runs, key=len, default="")
+    return longest.lower() if len(longest) >= 2 else None
+
+
+class PatternSet:
+    # Regex rules of a rule version, each compiled once. CPython's backtracking engine gains nothing
+    # from one big alternation (every alternative is tried at every offset, measured 2-3x slower than
+    # separate searches), so instead a pattern is only searched when a literal it requires showed up
+    # in the keyword scan that runs anyway; patterns without such a literal are always searched.
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: list[tuple[str, re.Pattern[str], str | None]] = []
+        # rules whose pattern does not compile never match; they are reported in the rule cache stats
+        self.invalid_patterns: list[dict[str, str]] = []
+        for pattern in dict.fromkeys(pattern for pattern in patterns if pattern):
+            try:
+                compiled = re.compile(pattern, re.IGNORECASE)
+            except re.error as exc:
+                self.invalid_patterns.append({"pattern": pattern, "error": str(exc)})
+                continue
+            # verbose patterns ignore whitespace, so their text is not what they match
+            literal = None if compiled.flags & re.VERBOSE else required_literal(pattern)
+            self.patterns.append((pattern, compiled, literal))
+
+    @property
+    def literals(self) -> list[str]:
+        return [literal for _, _, literal in self.patterns if literal]
+
+    def find(self, text: str, keyword_hits: set[str]) -> set[str]:
+        return {
+            pattern
+            for pattern, compiled, literal in self.patterns
+            if (literal is None or literal in keyword_hits) and compiled.search(text)
+        }
+
+
+class KeywordMatcher:
+    # Matches lower-cased text against all rule keywords of a rule version at once.
+    # `contains` keywords hit when they occur anywhere; `exact` keywords only when they equal the text;
+    # `word` keywords ride on the same substring pass and are then checked for word boundaries;
+    # regex patterns are gated by literals that also ride on that pass.
+    def __init__(
+        self,
+        contains_keywords: Iterable[str],
+        exact_keywords: Iterable[str] = (),
+        word_keywords: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+    ):
+        self.word_keywords = frozenset(keyword for keyword in word_keywords if keyword)
+        self.pattern_set = PatternSet(patterns)
+        scanned = (*contains_keywords, *sorted(self.word_keywords), *self.pattern_set.literals)
+        self.contains_keywords = tuple(dict.fromkeys(keyword for keyword in scanned if keyword))
+        self.exact_keywords = frozenset(keyword for keyword in exact_keywords if keyword)
+        self._automaton = (
+            KeywordAutomaton(self.contains_keywords) if len(self.contains_keywords) > SCAN_KEYWORD_LIMIT else None
+        )
+
+    @property
+    def uses_automaton(self) -> bool:
+        return self._automaton is not None
+
+    def contains_hits(self, text: str) -> set[str]:
+        if self._automaton is not None:
+            return self._automaton.find(text)
+        return {keyword for keyword in self.contains_keywords if keyword in text}
+
+    def exact_hit(self, text: str) -> str | None:
+        return text if text in self.exact_keywords else None
+
+    def word_hits(self, text: str, contains_hits: set[str]) -> set[str]:
+        found: set[str] = set()
+        for keyword in self.word_keywords & contains_hits:
+            start = text.find(keyword)
+            while start != -1:
+                if _at_word_boundary(text, start, start + len(keyword)):
+                    found.add(keyword)
+                    break
+                start = text.find(keyword, start + 1)
+        return found
+
+    def pattern_hits(self, text: str, contains_hits: set[str]) -> set[str]:
+        return self.pattern_set.find(text, contains_hits)
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.classifier.rule_engine import CLASSIFY_JOB_COLUMNS, CompiledRules, classify_job, rule_cache
+from app.services.classifier.writer import ClassificationWriter
+from app.services.job_counts import job_count_cache
+
+RECLASSIFY_CHUNK_SIZE = 1000
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+# chunks handed to the pool ahead of the writer, per worker
+IN_FLIGHT_PER_WORKER = 2
+
+STREAM_JOBS_SQL = text(
+    f"""
+    SELECT {CLASSIFY_JOB_COLUMNS}
+    FROM jobs j
+    WHERE j.is_active = true
+      AND j.id > :after_id
+    ORDER BY j.id
+    """
+)
+
+RUN_COLUMNS = """
+    id, rule_version, status::text AS status, workers, total_count, processed_count, last_job_id,
+    started_at, resumed_at, resumed_processed_count, updated_at, finished_at, error_message
+"""
+
+_worker_rules: CompiledRules | None = None
+_active_versions: set[str] = set()
+_active_lock = threading.Lock()
+
+
+def _init_worker(rules: CompiledRules) -> None:
+    # each worker process receives the compiled rules once instead of with every chunk
+    global _worker_rules
+    _worker_rules = rules
+
+
+def _classify_chunk(jobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [classify_job(_worker_rules, job) for job in jobs]
+
+
+def _submit(executor: ProcessPoolExecutor | None, rules: CompiledRules, jobs: list[dict[str, Any]]) -> Future:
+    if executor is not None:
+        return executor.submit(_classify_chunk, jobs)
+    future: Future = Future()
+    future.set_result([classify_job(rules, job) for job in jobs])
+    return future
+
+
+def _start_or_resume_run(db: Session, rule_version: str, workers: int, restart: bool) -> dict[str, Any]:
+    unfinished = db.execute(
+        text(
+            f"""
+            SELECT {RUN_COLUMNS}
+            FROM reclassification_runs
+            WHERE rule_version = :rule_version
+              AND status IN ('running', 'failed')
+            ORDER BY started_at DESC
+            """
+        ),
+        {"rule_version": rule_version},
+    ).mappings().all()
+
+    if unfinished and not restart:
+        # the advisory lock is held, so a 'running' row here belongs to a process that died
+        run = unfinished[0]
+        remaining = db.execute(
+            text("SELECT COUNT(*) FROM jobs WHERE is_active = true AND id > :after_id"),
+            {"after_id": run["last_job_id"]},
+        ).scalar_one()
+        resumed = db.execute(
+            text(
+                f"""
+                UPDATE reclassification_runs
+                SET status = 'running',
+                    workers = :workers,
+                    total_count = processed_count + :remaining,
+                    resumed_at = NOW(),
+                    resumed_processed_count = processed_count,
+                    updated_at = NOW(),
+                    finished_at = NULL,
+                    error_message = NULL
+                WHERE id = :run_id
+                RETURNING {RUN_COLUMNS}
+                """
+            ),
+            {"run_id": run["id"], "workers": workers, "remaining": remaining},
+        ).mappings().one()
+        db.commit()
+        return dict(resumed)
+
+    if unfinished:
+        db.execute(
+            text(
+                """
+                UPDATE reclassification_runs
+                SET status = 'failed', error_message = 'superseded by a restarted run', finished_at = NOW()
+                WHERE id = ANY(:run_ids)
+                """
+            ),
+            {"run_ids": [run["id"] for run in unfinished]},
+        )
+    created = db.execute(
+        text(
+            f"""
+            INSERT INTO reclassification_runs (rule_version, status, workers, total_count)
+            SELECT :rule_version, 'running', :workers, COUNT(*)
+            FROM jobs
+            WHERE is_active = true
+            RETURNING {RUN_COLUMNS}
+            """
+        ),
+        {"rule_version": rule_version, "workers": workers},
+    ).mappings().one()
+    db.commit()
+    return dict(created)
+
+
+def _checkpoint(db: Session, run_id: int, processed: int, last_job_id: int) -> None:
+    db.execute(
+        text(
+            """
+            UPDATE reclassification_runs
+            SET processed_count = processed_count + :processed,
+                last_job_id = :last_job_id,
+                updated_at = NOW()
+            WHERE id = :run_id
+            """
+        ),
+        {"run_id": run_id, "processed": processed, "last_job_id": last_job_id},
+    )
+    db.commit()
+
+
+def _finish_run(db: Session, run_id: int, status: str, error_message: str | None = None) -> None:
+    db.execute(
+        text(
+            """
+            UPDATE reclassification_runs
+            SET status = CAST(:status AS run_status_enum), finished_at = NOW(), updated_at = NOW(),
+                error_message = :error_message
+            WHERE id = :run_id
+            """
+        ),
+        {"run_id": run_id, "status": status, "error_message": error_message},
+    )
+    db.commit()
+
+
+def run_reclassification(
+    session_factory: Callable[[], Session],
+    rule_version: str,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = RECLASSIFY_CHUNK_SIZE,
+    restart: bool = False,
+) -> dict[str, Any]:
+    # Rewrites job_classifications for every active job under rule_version. Jobs are streamed in id
+    # order through a server-side cursor, classified on a process pool and written back a chunk at a
+    # time; last_job_id is committed after each chunk, so an interrupted run resumes after it.
+    db = session_factory()
+    reader = session_factory()
+    run: dict[str, Any] | None = None
+    try:
+        rules, _ = rule_cache.get(db, rule_version)
+        # The reader's transaction stays open for the whole run (it holds the cursor), so a
+        # transaction-level lock keeps other processes off this version and is released with it.
+        locked = reader.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"), {"key": f"reclassify:{rule_version}"}
+        ).scalar_one()
+        if not locked:
+            raise RuntimeError(f"reclassification is already running for rule_version={rule_version}")
+
+        run = _start_or_resume_run(db, rule_version, workers, restart)
+        writer = ClassificationWriter(db, rule_version, batch_size=chunk_size)
+        started = time.perf_counter()
+        processed = 0
+
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                # spawn: forking a process that runs server threads and holds DB connections is unsafe
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(rules,),
+            )
+        pending: deque[tuple[list[dict[str, Any]], Future]] = deque()
+
+        def write_oldest() -> None:
+            nonlocal processed
+            jobs, future = pending.popleft()
+            for job, result in zip(jobs, future.result()):
+                writer.add(job, result)
+            writer.flush()
+            _checkpoint(db, run["id"], len(jobs), jobs[-1]["id"])
+            processed += len(jobs)
+
+        try:
+            stream = reader.execute(
+                STREAM_JOBS_SQL,
+                {"after_id": run["last_job_id"]},
+                execution_options={"stream_results": True, "yield_per": chunk_size},
+            ).mappings()
+            for partition in stream.partitions(chunk_size):
+                jobs = [dict(row) for row in partition]
+                pending.append((jobs, _submit(executor, rules, jobs)))
+                if len(pending) >= max(1, workers) * IN_FLIGHT_PER_WORKER:
+                    write_oldest()
+            while pending:
+                write_oldest()
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        _finish_run(db, run["id"], "success")
+        elapsed = time.perf_counter() - started
+        return {
+            "run_id": run["id"],
+            "rule_version": rule_version,
+            "status": "success",
+            "resumed_from_job_id": run["last_job_id"],
+            "processed_count": processed,
+            "total_processed_count": run["processed_count"] + processed,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "jobs_per_sec": round(processed / elapsed, 1) if elapsed > 0 else None,
+            "workers": workers,
+        }
+    except Exception as exc:
+        db.rollback()
+        if run is not None:
+            _finish_run(db, run["id"], "failed", str(exc))
+        raise
+    finally:
+        # chunks written before a failure are committed as well
+        job_count_cache.invalidate()
+        reader.close()
+        db.close()
+
+
+def start_reclassification_in_background(
+    session_factory: Callable[[], Session],
+    rule_version: str,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = RECLASSIFY_CHUNK_SIZE,
+    restart: bool = False,
+) -> bool:
+    with _active_lock:
+        if rule_version in _active_versions:
+            return False
+        _active_versions.add(rule_version)
+
+    def target() -> None:
+        try:
+            result = run_reclassification(session_factory, rule_version, workers, chunk_size, restart)
+            print(f"[reclassify] {rule_version}: {result['processed_count']} jobs, {result['jobs_per_sec']} jobs/s")
+        except Exception as exc:  # recorded on the run row; nothing to return to
+            print(f"[reclassify] {rule_version} failed: {exc}")
+        finally:
+            with _active_lock:
+                _active_versions.discard(rule_version)
+
+    threading.Thread(target=target, name=f"reclassify-{rule_version}", daemon=True).start()
+    return True
+
+
+def list_reclassification_runs(db: Session, rule_version: str | None = None, limit: int = 20) -> list[dict[str, Any]]:
+    rows = db.execute(
+        text(
+            f"""
+            SELECT {RUN_COLUMNS}
+            FROM reclassification_runs
+            WHERE CAST(:rule_version AS text) IS NULL OR rule_version = :rule_version
+            ORDER BY started_at DESC
+            LIMIT :limit
+            """
+        ),
+        {"rule_version": rule_version, "limit": limit},
+    ).mappings().all()
+
+    items = []
+    for row in rows:
+        # throughput of the current attempt; a resumed run does not count work done before the restart
+        elapsed = (row["updated_at"] - row["resumed_at"]).total_seconds()
+        done_now = row["processed_count"] - row["resumed_processed_count"]
+        jobs_per_sec = done_now / elapsed if elapsed > 0 and done_now > 0 else None
+        remaining = max(0, row["total_count"] - row["processed_count"])
+        items.append(
+            {
+                "id": row["id"],
+                "rule_version": row["rule_version"],
+                "status": row["status"],
+                "workers": row["workers"],
+                "total_count": row["total_count"],
+                "processed_count": row["processed_count"],
+                "progress": round(row["processed_count"] / row["total_count"], 4) if row["total_count"] else 1.0,
+                "last_job_id": row["last_job_id"],
+                "jobs_per_sec": round(jobs_per_sec, 1) if jobs_per_sec else None,
+                "eta_sec": round(remaining / jobs_per_sec) if jobs_per_sec and row["status"] == "running" else None,
+                "started_at": row["started_at"].isoformat(),
+                "resumed_at": row["resumed_at"].isoformat(),
+                "updated_at": row["updated_at"].isoformat(),
+                "finished_at": row["finished_at"].isoformat() if row["finished_at"] else None,
+                "error_message": row["error_message"],
+            }
+        )
+    return items
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from app.services.classifier.rule_engine import CompiledRules
+
+# count/max id catch inserts and deletes; the digest also catches rules edited in place
+RULES_FINGERPRINT_SQL = text(
+    """
+    SELECT
+      COUNT(*) AS rule_count,
+      COALESCE(MAX(id), 0) AS max_id,
+      MAX(created_at) AS max_created_at,
+      md5(
+        COALESCE(
+          string_agg(
+            concat_ws(E'\\x1f', id, category, target_value, keyword, match_type, priority, weight, is_negation),
+            E'\\x1e' ORDER BY id
+          ),
+          ''
+        )
+      ) AS digest
+    FROM classification_rules
+    WHERE rule_version = :rule_version
+      AND is_active = true
+    """
+)
+
+MAX_CACHED_VERSIONS = 8
+
+
+def fetch_rules_fingerprint(db: Session, rule_version: str) -> tuple[int, str]:
+    row = db.execute(RULES_FINGERPRINT_SQL, {"rule_version": rule_version}).mappings().one()
+    max_created_at = row["max_created_at"].isoformat() if row["max_created_at"] else "-"
+    return row["rule_count"], f"{row['rule_count']}:{row['max_id']}:{max_created_at}:{row['digest']}"
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    rules: CompiledRules
+    rule_count: int
+    compiled_at: datetime
+    compile_ms: float
+    hits: int = 0
+
+
+class RuleSetCache:
+    # Process-wide cache of compiled rule sets. Every lookup re-reads the cheap fingerprint, so a
+    # rule added, edited or deactivated by another process is picked up on the next call.
+    def __init__(self, loader: Callable[[Session, str], CompiledRules], max_versions: int = MAX_CACHED_VERSIONS):
+        self._loader = loader
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+        self._entries: dict[str, _Entry] = {}
+        self.hit_count = 0
+        self.miss_count = 0
+        self.compile_seconds = 0.0
+
+    def get(self, db: Session, rule_version: str) -> tuple[CompiledRules, bool]:
+        rule_count, fingerprint = fetch_rules_fingerprint(db, rule_version)
+        if rule_count == 0:
+            self.invalidate(rule_version)
+            raise ValueError(f"No active rules found for rule_version={rule_version}")
+
+        with self._lock:
+            entry = self._entries.get(rule_version)
+            if entry is not None and entry.fingerprint == fingerprint:
+                # re-insert so the dict order doubles as least-recently-used order
+                self._entries[rule_version] = self._entries.pop(rule_version)
+                entry.hits += 1
+                self.hit_count += 1
+                return entry.rules, True
+
+        # compile outside the lock; two threads missing together both compile and the last one wins
+        started = time.perf_counter()
+        rules = self._loader(db, rule_version)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.miss_count += 1
+            self.compile_seconds += elapsed
+            self._entries.pop(rule_version, None)
+            self._entries[rule_version] = _Entry(
+                fingerprint=fingerprint,
+                rules=rules,
+                rule_count=rule_count,
+                compiled_at=datetime.now(timezone.utc),
+                compile_ms=round(elapsed * 1000, 2),
+            )
+            while len(self._entries) > self.max_versions:
+                self._entries.pop(next(iter(self._entries)))
+        return rules, False
+
+    def invalidate(self, rule_version: str | None = None) -> None:
+        with self._lock:
+            if rule_version is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(rule_version, None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hit_count + self.miss_count
+            return {
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+                "hit_ratio": round(self.hit_count / lookups, 3) if lookups else None,
+                "compile_ms_total": round(self.compile_seconds * 1000, 2),
+                "entries": [
+                    {
+                        "rule_version": rule_version,
+                        "rule_count": entry.rule_count,
+                        "fingerprint": entry.fingerprint,
+                        "compiled_at": entry.compiled_at.isoformat(),
+                        "compile_ms": entry.compile_ms,
+                        "hits": entry.hits,
+                        "invalid_patterns": entry.rules.matcher.pattern_set.invalid_patterns,
+                    }
+                    for rule_version, entry in self._entries.items()
+                ],
+            }
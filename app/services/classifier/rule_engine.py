@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-import json
+from dataclasses import dataclass, field
 from typing import Any
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.services.classifier.matcher import KeywordMatcher
+from app.services.classifier.rule_cache import RuleSetCache
+from app.services.classifier.writer import WRITE_BATCH_SIZE, ClassificationWriter
+from app.services.job_counts import job_count_cache
+from app.services.search_text import build_search_text, fold_text
+
 
 @dataclass
 class Rule:
@@ -17,43 +22,77 @@ class Rule:
     priority: int
     weight: int
     is_negation: bool
+    keyword_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # regex patterns keep their case (\D is not \d) and are matched case-insensitively instead
+        self.keyword_key = (self.keyword or "") if self.match_type == "regex" else fold_text(self.keyword)
+
+
+@dataclass
+class RuleHits:
+    contains: set[str]
+    exact: str | None
+    words: set[str]
+    patterns: set[str]
 
 
-def _normalize(value: str | None) -> str:
-    if not value:
-        return ""
-    return value.lower()
+@dataclass
+class CompiledRules:
+    rule_version: str
+    grouped: dict[str, list[Rule]]
+    matcher: KeywordMatcher
+
+    def hits(self, search_text: str) -> RuleHits:
+        # search_text is already normalized; it is scanned once for every keyword of the version
+        contains = self.matcher.contains_hits(search_text)
+        return RuleHits(
+            contains=contains,
+            exact=self.matcher.exact_hit(search_text),
+            words=self.matcher.word_hits(search_text, contains),
+            patterns=self.matcher.pattern_hits(search_text, contains),
+        )
 
 
-def _matches(match_type: str, keyword: str, haystack: str) -> bool:
-    if not keyword:
+def _matches(rule: Rule, hits: RuleHits) -> bool:
+    if not rule.keyword_key:
         return False
-    k = _normalize(keyword)
-    h = _normalize(haystack)
+    if rule.match_type == "exact":
+        return hits.exact == rule.keyword_key
+    if rule.match_type == "word":
+        return rule.keyword_key in hits.words
+    if rule.match_type == "regex":
+        return rule.keyword_key in hits.patterns
+    return rule.keyword_key in hits.contains
+
+
+def compile_rules(rule_version: str, rules: list[Rule]) -> CompiledRules:
+    grouped: dict[str, list[Rule]] = {"employment": [], "role": [], "exclude": [], "score": []}
+    for rule in rules:
+        grouped.setdefault(rule.category, []).append(rule)
 
-    if match_type == "exact":
-        return h == k
-    # MVP: regex is treated as contains for now
-    return k in h
+    matcher = KeywordMatcher(
+        contains_keywords=[
+            rule.keyword_key for rule in rules if rule.match_type not in ("exact", "word", "regex")
+        ],
+        exact_keywords=[rule.keyword_key for rule in rules if rule.match_type == "exact"],
+        word_keywords=[rule.keyword_key for rule in rules if rule.match_type == "word"],
+        patterns=[rule.keyword_key for rule in rules if rule.match_type == "regex"],
+    )
+    return CompiledRules(rule_version=rule_version, grouped=grouped, matcher=matcher)
 
 
 def _build_text_blob(job: dict[str, Any]) -> str:
-    fields = [
-        job.get("title"),
-        job.get("description_text"),
-        job.get("employment_text_raw"),
-        job.get("experience_text_raw"),
-        job.get("tech_stack_text"),
-    ]
-    return "\n".join([str(v) for v in fields if v])
+    # rows written before jobs.search_text existed (or not yet backfilled) are normalized here
+    return job.get("search_text") or build_search_text(job)
 
 
-def _pick_employment(employment_rules: list[Rule], text_blob: str) -> tuple[str, list[dict[str, Any]]]:
+def _pick_employment(employment_rules: list[Rule], hits: RuleHits) -> tuple[str, list[dict[str, Any]]]:
     matches: list[tuple[int, str, Rule]] = []
     matched_keywords: list[dict[str, Any]] = []
 
     for rule in employment_rules:
-        if _matches(rule.match_type, rule.keyword, text_blob):
+        if _matches(rule, hits):
             matches.append((rule.priority, rule.target_value, rule))
             matched_keywords.append(
                 {
@@ -71,12 +110,12 @@ def _pick_employment(employment_rules: list[Rule], text_blob: str) -> tuple[str,
     return matches[0][1], matched_keywords
 
 
-def _pick_role(role_rules: list[Rule], exclude_rules: list[Rule], text_blob: str) -> tuple[str, list[dict[str, Any]]]:
+def _pick_role(role_rules: list[Rule], exclude_rules: list[Rule], hits: RuleHits) -> tuple[str, list[dict[str, Any]]]:
     matched_keywords: list[dict[str, Any]] = []
 
     excluded = False
     for rule in exclude_rules:
-        if _matches(rule.match_type, rule.keyword, text_blob):
+        if _matches(rule, hits):
             excluded = True
             matched_keywords.append(
                 {
@@ -89,7 +128,7 @@ def _pick_role(role_rules: list[Rule], exclude_rules: list[Rule], text_blob: str
 
     role_matches: list[tuple[int, str, Rule]] = []
     for rule in role_rules:
-        if _matches(rule.match_type, rule.keyword, text_blob):
+        if _matches(rule, hits):
             role_matches.append((rule.priority, rule.target_value, rule))
             matched_keywords.append(
                 {
@@ -107,12 +146,12 @@ def _pick_role(role_rules: list[Rule], exclude_rules: list[Rule], text_blob: str
     return role_matches[0][1], matched_keywords
 
 
-def _compute_score(score_rules: list[Rule], text_blob: str) -> tuple[int, list[dict[str, Any]]]:
+def _compute_score(score_rules: list[Rule], hits: RuleHits) -> tuple[int, list[dict[str, Any]]]:
     score = 50
     matched_keywords: list[dict[str, Any]] = []
 
     for rule in score_rules:
-        if _matches(rule.match_type, rule.keyword, text_blob):
+        if _matches(rule, hits):
             score += rule.weight
             matched_keywords.append(
                 {
@@ -137,7 +176,31 @@ def _compute_confidence(employment_type: str, role_type: str, score_match_count:
     return round(min(1.0, confidence), 3)
 
 
-def classify_jobs(db: Session, rule_version: str, limit: int = 200) -> dict[str, Any]:
+def classify_job(rules: CompiledRules, job: dict[str, Any]) -> dict[str, Any]:
+    hits = rules.hits(_build_text_blob(job))
+
+    employment_type, employment_matches = _pick_employment(rules.grouped.get("employment", []), hits)
+    role_type, role_matches = _pick_role(rules.grouped.get("role", []), rules.grouped.get("exclude", []), hits)
+    score, score_matches = _compute_score(rules.grouped.get("score", []), hits)
+
+    matched_keywords = employment_matches + role_matches + score_matches
+    confidence = _compute_confidence(employment_type, role_type, len(score_matches))
+
+    reasoning = (
+        f"employment={employment_type}, role={role_type}, score={score}, "
+        f"matches={len(matched_keywords)}"
+    )
+    return {
+        "employment_type": employment_type,
+        "role_type": role_type,
+        "new_grad_score": score,
+        "confidence": confidence,
+        "matched_keywords": matched_keywords,
+        "reasoning": reasoning,
+    }
+
+
+def load_rules(db: Session, rule_version: str) -> CompiledRules:
     rule_rows = db.execute(
         text(
             """
@@ -154,30 +217,67 @@ def classify_jobs(db: Session, rule_version: str, limit: int = 200) -> dict[str,
     if not rule_rows:
         raise ValueError(f"No active rules found for rule_version={rule_version}")
 
-    grouped: dict[str, list[Rule]] = {"employment": [], "role": [], "exclude": [], "score": []}
-    for row in rule_rows:
-        grouped.setdefault(row["category"], []).append(
-            Rule(
-                category=row["category"],
-                target_value=row["target_value"],
-                keyword=row["keyword"],
-                match_type=row["match_type"],
-                priority=row["priority"],
-                weight=row["weight"],
-                is_negation=row["is_negation"],
-            )
+    rules = [
+        Rule(
+            category=row["category"],
+            target_value=row["target_value"],
+            keyword=row["keyword"],
+            match_type=row["match_type"],
+            priority=row["priority"],
+            weight=row["weight"],
+            is_negation=row["is_negation"],
         )
+        for row in rule_rows
+    ]
+    return compile_rules(rule_version, rules)
+
+
+rule_cache = RuleSetCache(loader=load_rules)
+
+
+def get_compiled_rules(db: Session, rule_version: str) -> CompiledRules:
+    return rule_cache.get(db, rule_version)[0]
+
+
+# the raw text columns are only needed for rows without search_text, so large descriptions are not
+# read twice
+CLASSIFY_JOB_COLUMNS = """
+    j.id,
+    j.title,
+    j.search_text,
+    CASE WHEN j.search_text IS NULL THEN j.description_text END AS description_text,
+    CASE WHEN j.search_text IS NULL THEN j.employment_text_raw END AS employment_text_raw,
+    CASE WHEN j.search_text IS NULL THEN j.experience_text_raw END AS experience_text_raw,
+    CASE WHEN j.search_text IS NULL THEN j.tech_stack_text END AS tech_stack_text,
+    j.content_hash
+"""
+
+# active jobs never classified under the version, or whose content changed after their classification;
+# a reactivated job without a row is picked up as soon as it is active again
+PENDING_JOBS_FILTER = """
+    FROM jobs j
+    LEFT JOIN job_classifications jc
+      ON jc.job_id = j.id
+     AND jc.rule_version = :rule_version
+    WHERE j.is_active = true
+      AND (jc.id IS NULL OR jc.content_hash IS DISTINCT FROM j.content_hash)
+"""
+
+PENDING_CHUNK_SIZE = 500
+
+
+def classify_jobs(
+    db: Session,
+    rule_version: str,
+    limit: int = 200,
+    batch_size: int = WRITE_BATCH_SIZE,
+) -> dict[str, Any]:
+    rules, cache_hit = rule_cache.get(db, rule_version)
 
     jobs = db.execute(
         text(
-            """
-            SELECT
-              j.id,
-              j.title,
-              j.description_text,
-              j.employment_text_raw,
-              j.experience_text_raw,
-              j.tech_stack_text
+            f"""
+            SELECT {CLASSIFY_JOB_COLUMNS}
             FROM jobs j
             ORDER BY j.updated_at DESC, j.id DESC
             LIMIT :limit
@@ -186,61 +286,73 @@ def classify_jobs(db: Session, rule_version: str, limit: int = 200) -> dict[str,
         {"limit": limit},
     ).mappings().all()
 
-    classified_count = 0
-
+    writer = ClassificationWriter(db, rule_version, batch_size=batch_size)
     for job in jobs:
-        text_blob = _build_text_blob(job)
+        writer.add(job, classify_job(rules, job))
+    writer.flush()
+    job_count_cache.invalidate()
 
-        employment_type, employment_matches = _pick_employment(grouped.get("employment", []), text_blob)
-        role_type, role_matches = _pick_role(grouped.get("role", []), grouped.get("exclude", []), text_blob)
-        score, score_matches = _compute_score(grouped.get("score", []), text_blob)
+    return {
+        "rule_version": rule_version,
+        "processed_count": len(jobs),
+        "classified_count": writer.written_count,
+        "write_batches": writer.batch_count,
+        "rule_cache_hit": cache_hit,
+    }
 
-        matched_keywords = employment_matches + role_matches + score_matches
-        confidence = _compute_confidence(employment_type, role_type, len(score_matches))
 
-        reasoning = (
-            f"employment={employment_type}, role={role_type}, score={score}, "
-            f"matches={len(matched_keywords)}"
-        )
+def count_pending_jobs(db: Session, rule_version: str) -> int:
+    return db.execute(text(f"SELECT COUNT(*) {PENDING_JOBS_FILTER}"), {"rule_version": rule_version}).scalar_one()
+
+
+def classify_pending_jobs(
+    db: Session,
+    rule_version: str,
+    chunk_size: int = PENDING_CHUNK_SIZE,
+    max_jobs: int | None = None,
+    batch_size: int = WRITE_BATCH_SIZE,
+) -> dict[str, Any]:
+    rules, cache_hit = rule_cache.get(db, rule_version)
+    backlog_before = count_pending_jobs(db, rule_version)
 
-        db.execute(
+    writer = ClassificationWriter(db, rule_version, batch_size=batch_size)
+    classified_count = 0
+    chunk_count = 0
+    after_id = 0
+    # one pass in id order; a job that changes behind the cursor is picked up by the next run
+    while max_jobs is None or classified_count < max_jobs:
+        size = chunk_size if max_jobs is None else min(chunk_size, max_jobs - classified_count)
+        jobs = db.execute(
             text(
-                """
-                INSERT INTO job_classifications (
-                    job_id, rule_version, employment_type, role_type,
-                    new_grad_score, confidence, matched_keywords, reasoning, created_at
-                ) VALUES (
-                    :job_id, :rule_version, :employment_type, :role_type,
-                    :new_grad_score, :confidence, CAST(:matched_keywords AS jsonb), :reasoning, NOW()
-                )
-                ON CONFLICT (job_id, rule_version)
-                DO UPDATE SET
-                    employment_type = EXCLUDED.employment_type,
-                    role_type = EXCLUDED.role_type,
-                    new_grad_score = EXCLUDED.new_grad_score,
-                    confidence = EXCLUDED.confidence,
-                    matched_keywords = EXCLUDED.matched_keywords,
-                    reasoning = EXCLUDED.reasoning,
-                    created_at = NOW()
+                f"""
+                SELECT {CLASSIFY_JOB_COLUMNS}
+                {PENDING_JOBS_FILTER}
+                  AND j.id > :after_id
+                ORDER BY j.id
+                LIMIT :limit
                 """
             ),
-            {
-                "job_id": job["id"],
-                "rule_version": rule_version,
-                "employment_type": employment_type,
-                "role_type": role_type,
-                "new_grad_score": score,
-                "confidence": confidence,
-                "matched_keywords": json.dumps(matched_keywords, ensure_ascii=False),
-                "reasoning": reasoning,
-            },
-        )
-        classified_count += 1
-
-    db.commit()
+            {"rule_version": rule_version, "after_id": after_id, "limit": size},
+        ).mappings().all()
+        if not jobs:
+            break
+
+        for job in jobs:
+            writer.add(job, classify_job(rules, job))
+        classified_count += len(jobs)
+        chunk_count += 1
+        after_id = jobs[-1]["id"]
+    writer.flush()
+    job_count_cache.invalidate()
 
     return {
         "rule_version": rule_version,
-        "processed_count": len(jobs),
+        "mode": "pending",
+        "backlog_before": backlog_before,
+        "processed_count": classified_count,
         "classified_count": classified_count,
+        "chunk_count": chunk_count,
+        "write_batches": writer.batch_count,
+        "backlog_after": count_pending_jobs(db, rule_version),
+        "rule_cache_hit": cache_hit,
     }
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from collections import Counter
+import random
+import time
+from typing import Any, Mapping
+
+from sqlalchemy.orm import Session
+
+from app.services.classifier.reclassify import STREAM_JOBS_SQL
+from app.services.classifier.rule_engine import classify_job, rule_cache
+
+SHADOW_CHUNK_SIZE = 1000
+SHADOW_SAMPLE_SIZE = 20
+
+
+class ShadowDiff:
+    # Aggregates baseline vs candidate results job by job. Everything kept is bounded by the label
+    # sets, the score range (-100..100 deltas) and the sample size, never by the corpus size.
+    def __init__(self, sample_size: int = SHADOW_SAMPLE_SIZE, seed: int = 0):
+        self.sample_size = sample_size
+        self.total_count = 0
+        self.changed_count = 0
+        self.employment_transitions: Counter[tuple[str, str]] = Counter()
+        self.role_transitions: Counter[tuple[str, str]] = Counter()
+        self.score_deltas: Counter[int] = Counter()
+        self.samples: list[dict[str, Any]] = []
+        self._rng = random.Random(seed)
+
+    def add(self, job: Mapping[str, Any], baseline: dict[str, Any], candidate: dict[str, Any]) -> None:
+        self.total_count += 1
+        employment = (baseline["employment_type"], candidate["employment_type"])
+        role = (baseline["role_type"], candidate["role_type"])
+        delta = candidate["new_grad_score"] - baseline["new_grad_score"]
+        self.employment_transitions[employment] += 1
+        self.role_transitions[role] += 1
+        self.score_deltas[delta] += 1
+
+        if employment[0] == employment[1] and role[0] == role[1] and delta == 0:
+            return
+        self.changed_count += 1
+        # reservoir sampling: every changed job ends up in the sample with the same probability
+        slot = len(self.samples) if len(self.samples) < self.sample_size else self._rng.randrange(self.changed_count)
+        if slot < self.sample_size:
+            sample = {
+                "job_id": job["id"],
+                "title": job.get("title"),
+                "employment_type": list(employment),
+                "role_type": list(role),
+                "new_grad_score": [baseline["new_grad_score"], candidate["new_grad_score"]],
+            }
+            if slot == len(self.samples):
+                self.samples.append(sample)
+            else:
+                self.samples[slot] = sample
+
+    @staticmethod
+    def _matrix(transitions: Counter[tuple[str, str]]) -> dict[str, dict[str, int]]:
+        matrix: dict[str, dict[str, int]] = {}
+        for (before, after), count in sorted(transitions.items()):
+            matrix.setdefault(before, {})[after] = count
+        return matrix
+
+    @staticmethod
+    def _changed(transitions: Counter[tuple[str, str]]) -> int:
+        return sum(count for (before, after), count in transitions.items() if before != after)
+
+    def report(self) -> dict[str, Any]:
+        delta_sum = sum(delta * count for delta, count in self.score_deltas.items())
+        return {
+            "total_count": self.total_count,
+            "changed_count": self.changed_count,
+            "changed_ratio": round(self.changed_count / self.total_count, 4) if self.total_count else 0.0,
+            "employment": {
+                "changed_count": self._changed(self.employment_transitions),
+                "transitions": self._matrix(self.employment_transitions),
+            },
+            "role": {
+                "changed_count": self._changed(self.role_transitions),
+                "transitions": self._matrix(self.role_transitions),
+            },
+            "score": {
+                "changed_count": self.total_count - self.score_deltas.get(0, 0),
+                "mean_delta": round(delta_sum / self.total_count, 3) if self.total_count else 0.0,
+                "delta_histogram": [
+                    {"delta": delta, "count": count} for delta, count in sorted(self.score_deltas.items())
+                ],
+            },
+            "samples": sorted(self.samples, key=lambda sample: sample["job_id"]),
+        }
+
+
+def evaluate_candidate(
+    db: Session,
+    candidate_version: str,
+    baseline_version: str,
+    chunk_size: int = SHADOW_CHUNK_SIZE,
+    sample_size: int = SHADOW_SAMPLE_SIZE,
+    max_jobs: int | None = None,
+) -> dict[str, Any]:
+    # Dry run of candidate_version over every active job: both versions classify each job in the
+    # same pass over a server-side cursor, and only the aggregated diff is kept. Nothing is written.
+    baseline_rules, _ = rule_cache.get(db, baseline_version)
+    candidate_rules, _ = rule_cache.get(db, candidate_version)
+
+    diff = ShadowDiff(sample_size=sample_size)
+    started = time.perf_counter()
+    try:
+        stream = db.execute(
+            STREAM_JOBS_SQL,
+            {"after_id": 0},
+            execution_options={"stream_results": True, "yield_per": chunk_size},
+        ).mappings()
+        for partition in stream.partitions(chunk_size):
+            if max_jobs is not None:
+                partition = partition[: max_jobs - diff.total_count]
+            for row in partition:
+                diff.add(row, classify_job(baseline_rules, row), classify_job(candidate_rules, row))
+            if max_jobs is not None and diff.total_count >= max_jobs:
+                break
+    finally:
+        # read-only; ends the transaction that held the cursor
+        db.rollback()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "baseline_version": baseline_version,
+        "candidate_version": candidate_version,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "jobs_per_sec": round(diff.total_count / elapsed, 1) if elapsed > 0 else None,
+        **diff.report(),
+    }
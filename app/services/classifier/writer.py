@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Mapping
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+WRITE_BATCH_SIZE = 500
+
+# One statement per batch, columns bound as arrays and unnested server-side (same shape as the
+# crawler's job upsert). Enum and jsonb columns travel as text and are cast per row.
+UPSERT_CLASSIFICATIONS_SQL = text(
+    """
+    INSERT INTO job_classifications (
+        job_id, rule_version, employment_type, role_type,
+        new_grad_score, confidence, matched_keywords, reasoning, content_hash, created_at
+    )
+    SELECT
+        t.job_id, :rule_version,
+        CAST(t.employment_type AS employment_type_enum), CAST(t.role_type AS role_type_enum),
+        t.new_grad_score, t.confidence, CAST(t.matched_keywords AS jsonb), t.reasoning, t.content_hash, NOW()
+    FROM unnest(
+        CAST(:job_id AS bigint[]),
+        CAST(:employment_type AS text[]),
+        CAST(:role_type AS text[]),
+        CAST(:new_grad_score AS integer[]),
+        CAST(:confidence AS numeric[]),
+        CAST(:matched_keywords AS text[]),
+        CAST(:reasoning AS text[]),
+        CAST(:content_hash AS text[])
+    ) AS t(
+        job_id, employment_type, role_type, new_grad_score,
+        confidence, matched_keywords, reasoning, content_hash
+    )
+    ON CONFLICT (job_id, rule_version)
+    DO UPDATE SET
+        employment_type = EXCLUDED.employment_type,
+        role_type = EXCLUDED.role_type,
+        new_grad_score = EXCLUDED.new_grad_score,
+        confidence = EXCLUDED.confidence,
+        matched_keywords = EXCLUDED.matched_keywords,
+        reasoning = EXCLUDED.reasoning,
+        content_hash = EXCLUDED.content_hash,
+        created_at = NOW()
+    """
+)
+
+
+class ClassificationWriter:
+    # Buffers classification results and writes them as one multi-row upsert per batch,
+    # committing after each batch so a long run never holds one big transaction open.
+    def __init__(self, db: Session, rule_version: str, batch_size: int = WRITE_BATCH_SIZE):
+        self.db = db
+        self.rule_version = rule_version
+        self.batch_size = batch_size
+        self.written_count = 0
+        self.batch_count = 0
+        # keyed by job id: ON CONFLICT DO UPDATE cannot touch the same row twice in one statement
+        self._pending: dict[int, tuple[str | None, dict[str, Any]]] = {}
+
+    def add(self, job: Mapping[str, Any], result: dict[str, Any]) -> None:
+        self._pending[job["id"]] = (job["content_hash"], result)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+
+        params: dict[str, Any] = {"rule_version": self.rule_version, "job_id": list(pending)}
+        results = [result for _, result in pending.values()]
+        for column in ("employment_type", "role_type", "new_grad_score", "confidence", "reasoning"):
+            params[column] = [result[column] for result in results]
+        params["matched_keywords"] = [
+            json.dumps(result["matched_keywords"], ensure_ascii=False) for result in results
+        ]
+        params["content_hash"] = [content_hash for content_hash, _ in pending.values()]
+
+        self.db.execute(UPSERT_CLASSIFICATIONS_SQL, params)
+        self.db.commit()
+        self.written_count += len(pending)
+        self.batch_count += 1
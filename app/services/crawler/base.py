@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
+import hashlib
+import json
+from typing import Iterator, Mapping
+from urllib.parse import urlparse
 
+from app.services.crawler.http_client import FetchStats
 
-@dataclass
+
+@dataclass(slots=True)
 class CrawlJob:
     source_job_id: str
     canonical_url: str
@@ -19,9 +25,32 @@ class CrawlJob:
     posted_at: datetime | None = None
     deadline_at: datetime | None = None
 
+    def content_hash(self) -> str:
+        values = [getattr(self, field.name) for field in fields(self)]
+        payload = json.dumps(values, ensure_ascii=False, default=str, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 
 class BaseCrawler:
     source_code: str
+    endpoint: str
+    supports_incremental = False
 
-    def fetch_jobs(self) -> list[CrawlJob]:
+    def __init__(self) -> None:
+        self.fetch_stats = FetchStats()
+        # Incremental crawlers compare against these stored versions (source_job_id -> posted_at)
+        # and report listed-but-unchanged postings instead of yielding them.
+        self.known_versions: Mapping[str, datetime | None] | None = None
+        self.unchanged_source_job_ids: list[str] = []
+        # listed postings whose content could not be fetched this run; neither fetched nor unchanged
+        self.detail_failed_source_job_ids: list[str] = []
+
+    @property
+    def host(self) -> str:
+        return urlparse(self.endpoint).netloc
+
+    def iter_jobs(self) -> Iterator[CrawlJob]:
         raise NotImplementedError
+
+    def fetch_jobs(self) -> list[CrawlJob]:
+        return list(self.iter_jobs())
@@ -1,66 +1,134 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
+from typing import Any, Iterator
 
 from app.services.crawler.base import BaseCrawler, CrawlJob
-from app.services.crawler.http_client import fetch_json
+from app.services.crawler.http_client import default_client, fetch_json, stream_json_items
+
+API_BASE_URL = "https://boards-api.greenhouse.io/v1/boards"
+DETAIL_CONCURRENCY = 4
 
 
 class GreenhouseCrawler(BaseCrawler):
-    def __init__(self, source_code: str, board_token: str, company_name: str):
+    supports_incremental = True
+
+    def __init__(
+        self,
+        source_code: str,
+        board_token: str,
+        company_name: str,
+        api_base_url: str = API_BASE_URL,
+        detail_concurrency: int = DETAIL_CONCURRENCY,
+    ):
+        super().__init__()
         self.source_code = source_code
         self.board_token = board_token
         self.company_name = company_name
-        self.endpoint = f"https://boards-api.greenhouse.io/v1/boards/{board_token}/jobs?content=true"
+        self.detail_concurrency = detail_concurrency
+        self.board_url = f"{api_base_url}/{board_token}/jobs"
+        self.endpoint = f"{self.board_url}?content=true"
 
-    def fetch_jobs(self) -> list[CrawlJob]:
-        payload = fetch_json(self.endpoint)
+    def iter_jobs(self) -> Iterator[CrawlJob]:
+        self.unchanged_source_job_ids = []
+        self.detail_failed_source_job_ids = []
+        if self.known_versions:
+            yield from self._iter_changed_jobs()
+            return
 
-        jobs: list[CrawlJob] = []
-        for item in payload.get("jobs", []):
+        for item in stream_json_items(self.endpoint, "jobs", conditional=True, stats=self.fetch_stats):
+            job = self._to_crawl_job(item)
+            if job is not None:
+                yield job
+
+    def _iter_changed_jobs(self) -> Iterator[CrawlJob]:
+        # Phase 1: the index without content is small; only new or re-dated postings need their body.
+        known_versions = self.known_versions or {}
+        changed_ids: list[str] = []
+        listed_count = 0
+        for item in stream_json_items(self.board_url, "jobs", conditional=True, stats=self.fetch_stats):
             job_id = str(item.get("id") or "")
-            absolute_url = item.get("absolute_url")
-            title = item.get("title")
-            if not job_id or not absolute_url or not title:
+            if not job_id:
                 continue
+            listed_count += 1
+            updated_at = self._parse_datetime(item.get("updated_at"))
+            if updated_at is not None and job_id in known_versions and known_versions[job_id] == updated_at:
+                self.unchanged_source_job_ids.append(job_id)
+            else:
+                changed_ids.append(job_id)
+
+        if len(changed_ids) * 2 > listed_count:
+            # most of the board changed: one content=true download beats many detail requests
+            self.unchanged_source_job_ids = []
+            for item in stream_json_items(self.endpoint, "jobs", stats=self.fetch_stats):
+                job = self._to_crawl_job(item)
+                if job is not None:
+                    yield job
+            return
+
+        # Phase 2: fetch changed postings with bounded concurrency, a window at a time so at most
+        # a few detail payloads are held in memory.
+        pending = iter(changed_ids)
+        with ThreadPoolExecutor(max_workers=self.detail_concurrency, thread_name_prefix="greenhouse") as executor:
+            while window := list(islice(pending, self.detail_concurrency * 4)):
+                for job_id, item in zip(window, executor.map(self._fetch_detail, window)):
+                    job = self._to_crawl_job(item) if item is not None else None
+                    if job is not None:
+                        yield job
+                    else:
+                        # drop the index's validators: otherwise the next run gets a 304 for the
+                        # unchanged board and never retries this posting
+                        self.detail_failed_source_job_ids.append(job_id)
+                        default_client.forget([self.board_url])
+
+    def _fetch_detail(self, job_id: str) -> dict[str, Any] | None:
+        try:
+            return fetch_json(f"{self.board_url}/{job_id}", retries=1, stats=self.fetch_stats)
+        except RuntimeError:
+            return None
+
+    def _to_crawl_job(self, item: dict[str, Any]) -> CrawlJob | None:
+        job_id = str(item.get("id") or "")
+        absolute_url = item.get("absolute_url")
+        title = item.get("title")
+        if not job_id or not absolute_url or not title:
+            return None
+
+        location_obj = item.get("location") or {}
+        metadata = item.get("metadata") or []
+        dept = item.get("departments") or []
+        offices = item.get("offices") or []
+        content = item.get("content") or ""
+
+        posted_at = self._parse_datetime(item.get("updated_at"))
+
+        tags = []
+        if dept:
+            tags.extend([d.get("name") for d in dept if d.get("name")])
+        if offices:
+            tags.extend([o.get("name") for o in offices if o.get("name")])
+        for meta in metadata:
+            meta_name = meta.get("name")
+            meta_value = meta.get("value")
+            if meta_name and meta_value:
+                tags.append(f"{meta_name}:{meta_value}")
 
-            location_obj = item.get("location") or {}
-            metadata = item.get("metadata") or []
-            dept = item.get("departments") or []
-            offices = item.get("offices") or []
-            content = item.get("content") or ""
-
-            posted_at = self._parse_datetime(item.get("updated_at"))
-
-            tags = []
-            if dept:
-                tags.extend([d.get("name") for d in dept if d.get("name")])
-            if offices:
-                tags.extend([o.get("name") for o in offices if o.get("name")])
-            for meta in metadata:
-                meta_name = meta.get("name")
-                meta_value = meta.get("value")
-                if meta_name and meta_value:
-                    tags.append(f"{meta_name}:{meta_value}")
-
-            jobs.append(
-                CrawlJob(
-                    source_job_id=job_id,
-                    canonical_url=absolute_url,
-                    company_name=self.company_name,
-                    title=title,
-                    description_text=content,
-                    location_text=location_obj.get("name"),
-                    employment_text_raw=None,
-                    experience_text_raw=None,
-                    tech_stack_text=", ".join(tags) if tags else None,
-                    salary_text=None,
-                    posted_at=posted_at,
-                    deadline_at=None,
-                )
-            )
-
-        return jobs
+        return CrawlJob(
+            source_job_id=job_id,
+            canonical_url=absolute_url,
+            company_name=self.company_name,
+            title=title,
+            description_text=content,
+            location_text=location_obj.get("name"),
+            employment_text_raw=None,
+            experience_text_raw=None,
+            tech_stack_text=", ".join(tags) if tags else None,
+            salary_text=None,
+            posted_at=posted_at,
+            deadline_at=None,
+        )
 
     @staticmethod
     def _parse_datetime(value: str | None) -> datetime | None:
@@ -1,25 +1,280 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+from http.client import HTTPConnection, HTTPException, HTTPResponse, HTTPSConnection
 import json
+import threading
 import time
-from typing import Any
-from urllib.request import Request, urlopen
+from typing import Any, Iterator
+from urllib.parse import urljoin, urlsplit
+import zlib
+
+from app.services.crawler.json_stream import iter_json_array_items
 
 DEFAULT_HEADERS = {
     "User-Agent": "JobLogCrawler/1.0 (+https://joblog.local)",
     "Accept": "application/json,text/plain,*/*",
+    "Accept-Encoding": "gzip",
 }
 
+MAX_REDIRECTS = 5
+MAX_IDLE_PER_HOST = 4
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class NotModified(Exception):
+    def __init__(self, url: str):
+        super().__init__(f"not modified: {url}")
+        self.url = url
+
+
+@dataclass
+class FetchStats:
+    request_count: int = 0
+    bytes_downloaded: int = 0
+    not_modified_count: int = 0
+    # time spent waiting on the network (connect, response headers, body reads), summed across threads
+    network_seconds: float = 0.0
+    urls: list[str] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(
+        self,
+        requests: int = 0,
+        bytes_downloaded: int = 0,
+        not_modified: int = 0,
+        network_seconds: float = 0.0,
+    ) -> None:
+        # crawlers may fetch detail pages from several threads into one stats object
+        with self._lock:
+            self.request_count += requests
+            self.bytes_downloaded += bytes_downloaded
+            self.not_modified_count += not_modified
+            self.network_seconds += network_seconds
+
+
+class HttpClient:
+    def __init__(self, timeout: int = 15, max_idle_per_host: int = MAX_IDLE_PER_HOST):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str], list[HTTPConnection]] = {}
+        self._validators: dict[str, dict[str, str]] = {}
+
+    def get(
+        self,
+        url: str,
+        conditional: bool = False,
+        stats: FetchStats | None = None,
+        timeout: int | None = None,
+    ) -> bytes:
+        return b"".join(self.stream(url, conditional=conditional, stats=stats, timeout=timeout))
+
+    def stream(
+        self,
+        url: str,
+        conditional: bool = False,
+        stats: FetchStats | None = None,
+        timeout: int | None = None,
+    ) -> Iterator[bytes]:
+        headers = dict(DEFAULT_HEADERS)
+        if conditional:
+            with self._lock:
+                headers.update(self._validators.get(url, {}))
+        if stats is not None:
+            stats.urls.append(url)
+
+        target = url
+        for _ in range(MAX_REDIRECTS + 1):
+            started = time.perf_counter()
+            key, conn, response = self._open(target, headers, timeout or self.timeout)
+            if stats is not None:
+                stats.record(requests=1, network_seconds=time.perf_counter() - started)
+            if response.status == 200:
+                break
+
+            started = time.perf_counter()
+            raw = self._read_all(key, conn, response)
+            if stats is not None:
+                stats.record(bytes_downloaded=len(raw), network_seconds=time.perf_counter() - started)
+            location = response.getheader("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                target = urljoin(target, location)
+                continue
+            if response.status == 304:
+                if stats is not None:
+                    stats.record(not_modified=1)
+                raise NotModified(url)
+            raise HTTPException(f"HTTP {response.status} for {target}")
+        else:
+            raise HTTPException(f"too many redirects for {url}")
+
+        gzipped = (response.getheader("Content-Encoding") or "").lower() == "gzip"
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+        completed = False
+        try:
+            while True:
+                started = time.perf_counter()
+                raw = response.read(STREAM_CHUNK_SIZE)
+                if stats is not None:
+                    stats.record(bytes_downloaded=len(raw), network_seconds=time.perf_counter() - started)
+                if not raw:
+                    break
+                yield decompressor.decompress(raw) if decompressor else raw
+            if decompressor:
+                yield decompressor.flush()
+            completed = True
+        finally:
+            if completed:
+                self._finish(key, conn, response)
+                if conditional:
+                    self._remember_validators(url, response)
+            else:
+                # the consumer stopped early or the read failed; the connection state is unknown
+                conn.close()
+
+    def forget(self, urls: list[str]) -> None:
+        with self._lock:
+            for url in urls:
+                self._validators.pop(url, None)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def _open(
+        self, url: str, headers: dict[str, str], timeout: int
+    ) -> tuple[tuple[str, str], HTTPConnection, HTTPResponse]:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        conn, reused = self._acquire(key)
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        try:
+            return key, conn, self._send(conn, path, headers)
+        except (ConnectionError, HTTPException):
+            conn.close()
+            if not reused:
+                raise
+        # the server may have dropped an idle keep-alive connection; retry once on a fresh one
+        conn = self._connect(key, timeout)
+        try:
+            return key, conn, self._send(conn, path, headers)
+        except Exception:
+            conn.close()
+            raise
+
+    def _read_all(self, key: tuple[str, str], conn: HTTPConnection, response: HTTPResponse) -> bytes:
+        try:
+            raw = response.read()
+        except Exception:
+            conn.close()
+            raise
+        self._finish(key, conn, response)
+        return raw
+
+    def _finish(self, key: tuple[str, str], conn: HTTPConnection, response: HTTPResponse) -> None:
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+    @staticmethod
+    def _send(conn: HTTPConnection, path: str, headers: dict[str, str]) -> HTTPResponse:
+        conn.request("GET", path, headers=headers)
+        return conn.getresponse()
+
+    def _acquire(self, key: tuple[str, str]) -> tuple[HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(key, self.timeout), False
+
+    @staticmethod
+    def _connect(key: tuple[str, str], timeout: int) -> HTTPConnection:
+        scheme, netloc = key
+        if scheme == "https":
+            return HTTPSConnection(netloc, timeout=timeout)
+        return HTTPConnection(netloc, timeout=timeout)
+
+    def _release(self, key: tuple[str, str], conn: HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _remember_validators(self, url: str, response: HTTPResponse) -> None:
+        validators = {}
+        if response.getheader("ETag"):
+            validators["If-None-Match"] = response.getheader("ETag")
+        if response.getheader("Last-Modified"):
+            validators["If-Modified-Since"] = response.getheader("Last-Modified")
+        with self._lock:
+            if validators:
+                self._validators[url] = validators
+            else:
+                self._validators.pop(url, None)
+
+
+default_client = HttpClient()
+
+
+def fetch_json(
+    url: str,
+    timeout: int = 15,
+    retries: int = 2,
+    conditional: bool = False,
+    stats: FetchStats | None = None,
+) -> dict[str, Any]:
+    last_error: Exception | None = None
+    for attempt in range(retries + 1):
+        try:
+            payload = default_client.get(url, conditional=conditional, stats=stats, timeout=timeout)
+            return json.loads(payload.decode("utf-8"))
+        except NotModified:
+            raise
+        except Exception as exc:  # network/domain dependent
+            last_error = exc
+            if attempt < retries:
+                time.sleep(0.5 * (attempt + 1))
+
+    raise RuntimeError(f"failed to fetch json from {url}: {last_error}")
+
 
-def fetch_json(url: str, timeout: int = 15, retries: int = 2) -> dict[str, Any]:
+def stream_json_items(
+    url: str,
+    key: str,
+    timeout: int = 15,
+    retries: int = 2,
+    conditional: bool = False,
+    stats: FetchStats | None = None,
+) -> Iterator[Any]:
     last_error: Exception | None = None
     for attempt in range(retries + 1):
+        started = False
         try:
-            req = Request(url, headers=DEFAULT_HEADERS)
-            with urlopen(req, timeout=timeout) as response:
-                payload = response.read().decode("utf-8")
-            return json.loads(payload)
+            chunks = default_client.stream(url, conditional=conditional, stats=stats, timeout=timeout)
+            for item in iter_json_array_items(chunks, key):
+                started = True
+                yield item
+            return
+        except NotModified:
+            raise
         except Exception as exc:  # network/domain dependent
+            if started:
+                # items were already handed to the caller, so the stream cannot be replayed
+                raise RuntimeError(f"json stream from {url} broke off: {exc}") from exc
             last_error = exc
             if attempt < retries:
                 time.sleep(0.5 * (attempt + 1))
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _TextBuffer:
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        # drop everything already consumed so the buffer only holds the value being parsed
+        self.text = self.text[self.pos :]
+        self.pos = 0
+        for chunk in self._chunks:
+            decoded = self._decoder.decode(chunk)
+            if decoded:
+                self.text += decoded
+                return True
+        self.eof = True
+        tail = self._decoder.decode(b"", final=True)
+        self.text += tail
+        return bool(tail)
+
+    def drain(self) -> None:
+        for _ in self._chunks:
+            pass
+        self.eof = True
+
+    def next_char(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                char = self.text[self.pos]
+                self.pos += 1
+                return char
+            if not self.fill():
+                raise ValueError("unexpected end of JSON stream")
+
+    def peek_char(self) -> str:
+        char = self.next_char()
+        self.pos -= 1
+        return char
+
+    def expect(self, expected: str) -> None:
+        char = self.next_char()
+        if char != expected:
+            raise ValueError(f"expected {expected!r} in JSON stream, got {char!r}")
+
+    def decode_value(self) -> Any:
+        self.peek_char()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # a number or literal ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.text) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(buffer: _TextBuffer) -> Iterator[Any]:
+    buffer.expect("[")
+    if buffer.peek_char() == "]":
+        buffer.next_char()
+        return
+    while True:
+        yield buffer.decode_value()
+        separator = buffer.next_char()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"expected ',' or ']' in JSON array, got {separator!r}")
+
+
+def iter_json_array_items(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    # Yields the elements of the top-level `key` array one at a time; other members are skipped.
+    buffer = _TextBuffer(chunks)
+    buffer.expect("{")
+    if buffer.peek_char() == "}":
+        buffer.drain()
+        return
+    while True:
+        name = buffer.decode_value()
+        buffer.expect(":")
+        if name == key:
+            yield from _iter_array(buffer)
+        else:
+            buffer.decode_value()
+        separator = buffer.next_char()
+        if separator == "}":
+            # read the rest of the stream so the HTTP connection can go back to the pool
+            buffer.drain()
+            return
+        if separator != ",":
+            raise ValueError(f"expected ',' or '}}' in JSON object, got {separator!r}")
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from itertools import chain, zip_longest
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.crawler.registry import get_crawler, supported_source_codes
+from app.services.crawler.runner import run_crawl
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_PER_HOST_LIMIT = 2
+
+
+def _interleave_by_host(crawlers_by_host: dict[str, list[str]]) -> list[str]:
+    # Round-robin across hosts so workers blocked on one host's cap don't hold up the others.
+    rounds = zip_longest(*crawlers_by_host.values())
+    return [code for code in chain.from_iterable(rounds) if code is not None]
+
+
+def run_all_crawls(
+    session_factory: Callable[[], Session],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+    rule_version: str | None = None,
+) -> dict[str, Any]:
+    db = session_factory()
+    try:
+        active_codes = db.execute(
+            text("SELECT code FROM sources WHERE is_active = true ORDER BY code")
+        ).scalars().all()
+    finally:
+        db.close()
+
+    supported = set(supported_source_codes())
+    skipped = [code for code in active_codes if code not in supported]
+
+    codes_by_host: dict[str, list[str]] = defaultdict(list)
+    for code in active_codes:
+        if code in supported:
+            codes_by_host[get_crawler(code).host].append(code)
+    host_limits = {host: threading.BoundedSemaphore(per_host_limit) for host in codes_by_host}
+
+    def crawl_source(source_code: str) -> dict[str, Any]:
+        crawler = get_crawler(source_code)
+        with host_limits[crawler.host]:
+            source_db = session_factory()
+            try:
+                return run_crawl(db=source_db, source_code=source_code, crawler=crawler, rule_version=rule_version)
+            except Exception as exc:  # one failing source must not abort the others
+                return {"status": "failed", "source_code": source_code, "error_message": str(exc)}
+            finally:
+                source_db.close()
+
+    started_at = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    ordered_codes = _interleave_by_host(codes_by_host)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="crawl") as executor:
+        results = list(executor.map(crawl_source, ordered_codes))
+
+    return {
+        "started_at": started_at.isoformat(),
+        "elapsed_ms": int((time.perf_counter() - started) * 1000),
+        "success_count": sum(1 for result in results if result["status"] == "success"),
+        "failed_count": sum(1 for result in results if result["status"] == "failed"),
+        "skipped_sources": skipped,
+        "results": results,
+    }
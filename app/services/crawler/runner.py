@@ -1,15 +1,223 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from itertools import islice
+import json
+import time
 from typing import Any
 
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.services.classifier.rule_engine import CompiledRules, classify_job, rule_cache
+from app.services.classifier.writer import ClassificationWriter
+from app.services.crawler.base import BaseCrawler, CrawlJob
+from app.services.crawler.http_client import FetchStats, NotModified, default_client
 from app.services.crawler.registry import get_crawler
+from app.services.job_counts import job_count_cache
+from app.services.search_text import SEARCH_TEXT_FIELDS, build_search_text
 
+UPSERT_BATCH_SIZE = 500
 
-def run_crawl(db: Session, source_code: str = "remotive") -> dict[str, Any]:
+# One statement per batch: columns are bound as arrays and unnested server-side.
+# Rows whose content_hash did not change are skipped by the DO UPDATE ... WHERE and
+# not returned; xmax = 0 on a returned row means it was inserted rather than updated.
+UPSERT_JOBS_SQL = text(
+    """
+    INSERT INTO jobs (
+        source_id, source_job_id, canonical_url, company_name, title,
+        description_text, location_text, employment_text_raw,
+        experience_text_raw, tech_stack_text, salary_text,
+        posted_at, deadline_at, content_hash, search_text, is_active,
+        first_seen_at, last_seen_at, created_at, updated_at
+    )
+    SELECT
+        :source_id, t.source_job_id, t.canonical_url, t.company_name, t.title,
+        t.description_text, t.location_text, t.employment_text_raw,
+        t.experience_text_raw, t.tech_stack_text, t.salary_text,
+        t.posted_at, t.deadline_at, t.content_hash, t.search_text, true,
+        NOW(), NOW(), NOW(), NOW()
+    FROM unnest(
+        CAST(:source_job_id AS text[]),
+        CAST(:canonical_url AS text[]),
+        CAST(:company_name AS text[]),
+        CAST(:title AS text[]),
+        CAST(:description_text AS text[]),
+        CAST(:location_text AS text[]),
+        CAST(:employment_text_raw AS text[]),
+        CAST(:experience_text_raw AS text[]),
+        CAST(:tech_stack_text AS text[]),
+        CAST(:salary_text AS text[]),
+        CAST(:posted_at AS timestamptz[]),
+        CAST(:deadline_at AS timestamptz[]),
+        CAST(:content_hash AS text[]),
+        CAST(:search_text AS text[])
+    ) AS t(
+        source_job_id, canonical_url, company_name, title,
+        description_text, location_text, employment_text_raw,
+        experience_text_raw, tech_stack_text, salary_text,
+        posted_at, deadline_at, content_hash, search_text
+    )
+    ON CONFLICT (source_id, source_job_id)
+    DO UPDATE SET
+        canonical_url = EXCLUDED.canonical_url,
+        company_name = EXCLUDED.company_name,
+        title = EXCLUDED.title,
+        description_text = EXCLUDED.description_text,
+        location_text = EXCLUDED.location_text,
+        employment_text_raw = EXCLUDED.employment_text_raw,
+        experience_text_raw = EXCLUDED.experience_text_raw,
+        tech_stack_text = EXCLUDED.tech_stack_text,
+        salary_text = EXCLUDED.salary_text,
+        posted_at = EXCLUDED.posted_at,
+        deadline_at = EXCLUDED.deadline_at,
+        content_hash = EXCLUDED.content_hash,
+        search_text = EXCLUDED.search_text,
+        is_active = true,
+        last_seen_at = NOW(),
+        updated_at = NOW()
+    WHERE jobs.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+    RETURNING id, source_job_id, (xmax = 0) AS inserted
+    """
+)
+
+TOUCH_UNCHANGED_JOBS_SQL = text(
+    """
+    UPDATE jobs
+    SET is_active = true,
+        last_seen_at = NOW()
+    WHERE source_id = :source_id
+      AND source_job_id = ANY(CAST(:source_job_ids AS text[]))
+    """
+)
+
+# Postings the run did not see (last_seen_at older than the run start) or past their deadline.
+# The unseen half is skipped when the listing was not actually read (304 or empty response).
+DEACTIVATE_STALE_JOBS_SQL = text(
+    """
+    UPDATE jobs
+    SET is_active = false
+    WHERE source_id = :source_id
+      AND is_active = true
+      AND (
+        (CAST(:sweep_unseen AS boolean) AND last_seen_at < :run_started_at)
+        OR deadline_at < NOW()
+      )
+    """
+)
+
+_JOB_COLUMNS = (
+    "source_job_id",
+    "canonical_url",
+    "company_name",
+    "title",
+    "description_text",
+    "location_text",
+    "employment_text_raw",
+    "experience_text_raw",
+    "tech_stack_text",
+    "salary_text",
+    "posted_at",
+    "deadline_at",
+)
+
+
+def _upsert_jobs(
+    db: Session, source_id: int, jobs: list[CrawlJob]
+) -> tuple[int, int, int, list[dict[str, Any]]]:
+    # ON CONFLICT DO UPDATE cannot touch the same row twice in one statement, so keep the last duplicate.
+    jobs_by_source_id = {job.source_job_id: job for job in jobs}
+    unique_jobs = list(jobs_by_source_id.values())
+    if not unique_jobs:
+        return 0, 0, 0, []
+
+    params: dict[str, Any] = {"source_id": source_id}
+    for column in _JOB_COLUMNS:
+        params[column] = [getattr(job, column) for job in unique_jobs]
+    params["content_hash"] = [job.content_hash() for job in unique_jobs]
+    params["search_text"] = [
+        build_search_text({field: getattr(job, field) for field in SEARCH_TEXT_FIELDS}) for job in unique_jobs
+    ]
+
+    written = db.execute(UPSERT_JOBS_SQL, params).mappings().all()
+    inserted = sum(1 for row in written if row["inserted"])
+    updated = len(written) - inserted
+
+    # inserted and content-changed rows, shaped like a jobs row so the classifier can use them as they are
+    derived = dict(zip(jobs_by_source_id, zip(params["content_hash"], params["search_text"])))
+    written_jobs = []
+    for row in written:
+        content_hash, search_text = derived[row["source_job_id"]]
+        job = jobs_by_source_id[row["source_job_id"]]
+        written_jobs.append(
+            {
+                "id": row["id"],
+                **{column: getattr(job, column) for column in _JOB_COLUMNS},
+                "content_hash": content_hash,
+                "search_text": search_text,
+            }
+        )
+
+    written_ids = {row["source_job_id"] for row in written}
+    unchanged_ids = [job.source_job_id for job in unique_jobs if job.source_job_id not in written_ids]
+    _touch_unchanged_jobs(db, source_id, unchanged_ids)
+
+    return inserted, updated, len(unchanged_ids), written_jobs
+
+
+def _load_known_versions(db: Session, source_id: int) -> dict[str, datetime | None]:
+    rows = db.execute(
+        text("SELECT source_job_id, posted_at FROM jobs WHERE source_id = :source_id"),
+        {"source_id": source_id},
+    ).all()
+    return {row.source_job_id: row.posted_at for row in rows}
+
+
+def _touch_unchanged_jobs(db: Session, source_id: int, source_job_ids: list[str]) -> None:
+    for start in range(0, len(source_job_ids), UPSERT_BATCH_SIZE):
+        db.execute(
+            TOUCH_UNCHANGED_JOBS_SQL,
+            {"source_id": source_id, "source_job_ids": source_job_ids[start : start + UPSERT_BATCH_SIZE]},
+        )
+
+
+def _phase_metrics(
+    fetch_stats: FetchStats,
+    iterate_seconds: float,
+    upsert_seconds: float,
+    total_seconds: float,
+    row_count: int,
+) -> dict[str, Any]:
+    # Pulling from the crawler interleaves network reads and JSON decoding; the HTTP client times the
+    # network part, the rest is parse. Concurrent detail fetches can sum past wall time, hence the cap.
+    fetch_seconds = min(fetch_stats.network_seconds, iterate_seconds)
+    return {
+        "fetch_ms": round(fetch_seconds * 1000, 1),
+        "parse_ms": round((iterate_seconds - fetch_seconds) * 1000, 1),
+        "upsert_ms": round(upsert_seconds * 1000, 1),
+        "total_ms": round(total_seconds * 1000, 1),
+        "rows_per_sec": round(row_count / total_seconds, 1) if total_seconds > 0 else None,
+        "request_count": fetch_stats.request_count,
+    }
+
+
+def record_run_metrics(db: Session, run_id: int, metrics: dict[str, Any]) -> None:
+    db.execute(
+        text("UPDATE crawl_runs SET metrics = metrics || CAST(:metrics AS jsonb) WHERE id = :run_id"),
+        {"run_id": run_id, "metrics": json.dumps(metrics)},
+    )
+    db.commit()
+
+
+def run_crawl(
+    db: Session,
+    source_code: str = "remotive",
+    crawler: BaseCrawler | None = None,
+    full_refresh: bool = False,
+    rule_version: str | None = None,
+) -> dict[str, Any]:
+    # With a rule_version, rows this run inserts or changes are classified right after each batch
+    # from the CrawlJob text already in memory, instead of being re-read by a later classify pass.
     source_row = db.execute(
         text("SELECT id, code FROM sources WHERE code = :code AND is_active = true"),
         {"code": source_code},
@@ -17,123 +225,134 @@ def run_crawl(db: Session, source_code: str = "remotive") -> dict[str, Any]:
     if source_row is None:
         raise ValueError(f"Active source not found: {source_code}")
 
-    run_id = db.execute(
+    if crawler is None:
+        crawler = get_crawler(source_code)
+
+    rules: CompiledRules | None = None
+    classify_skipped: str | None = None
+    if rule_version is not None:
+        try:
+            rules, _ = rule_cache.get(db, rule_version)
+        except ValueError as exc:
+            # a bad rule version must not stop the crawl; the reason is kept on the run's metrics
+            classify_skipped = str(exc)
+
+    run_row = db.execute(
         text(
             """
             INSERT INTO crawl_runs (source_id, status, started_at)
             VALUES (:source_id, 'running', NOW())
-            RETURNING id
+            RETURNING id, started_at
             """
         ),
         {"source_id": source_row["id"]},
-    ).scalar_one()
+    ).mappings().one()
     db.commit()
+    run_id = run_row["id"]
 
     fetched_count = 0
     inserted_count = 0
     updated_count = 0
+    unchanged_count = 0
+    deactivated_count = 0
     failed_count = 0
     error_message: str | None = None
-
-    crawler = get_crawler(source_code)
+    listing_read = True
+    run_started = time.perf_counter()
+    iterate_seconds = 0.0
+    upsert_seconds = 0.0
+    classify_seconds = 0.0
+    writer = ClassificationWriter(db, rule_version) if rules is not None else None
 
     try:
-        jobs = crawler.fetch_jobs()
-        fetched_count = len(jobs)
-
-        for job in jobs:
-            existing = db.execute(
-                text(
-                    """
-                    SELECT id
-                    FROM jobs
-                    WHERE source_id = :source_id
-                      AND source_job_id = :source_job_id
-                    """
-                ),
-                {"source_id": source_row["id"], "source_job_id": job.source_job_id},
-            ).mappings().first()
-
-            if existing is None:
-                db.execute(
-                    text(
-                        """
-                        INSERT INTO jobs (
-                            source_id, source_job_id, canonical_url, company_name, title,
-                            description_text, location_text, employment_text_raw,
-                            experience_text_raw, tech_stack_text, salary_text,
-                            posted_at, deadline_at, is_active,
-                            first_seen_at, last_seen_at, created_at, updated_at
-                        ) VALUES (
-                            :source_id, :source_job_id, :canonical_url, :company_name, :title,
-                            :description_text, :location_text, :employment_text_raw,
-                            :experience_text_raw, :tech_stack_text, :salary_text,
-                            :posted_at, :deadline_at, true,
-                            NOW(), NOW(), NOW(), NOW()
-                        )
-                        """
-                    ),
-                    {
-                        "source_id": source_row["id"],
-                        "source_job_id": job.source_job_id,
-                        "canonical_url": job.canonical_url,
-                        "company_name": job.company_name,
-                        "title": job.title,
-                        "description_text": job.description_text,
-                        "location_text": job.location_text,
-                        "employment_text_raw": job.employment_text_raw,
-                        "experience_text_raw": job.experience_text_raw,
-                        "tech_stack_text": job.tech_stack_text,
-                        "salary_text": job.salary_text,
-                        "posted_at": job.posted_at,
-                        "deadline_at": job.deadline_at,
-                    },
-                )
-                inserted_count += 1
-            else:
-                db.execute(
-                    text(
-                        """
-                        UPDATE jobs
-                        SET canonical_url = :canonical_url,
-                            company_name = :company_name,
-                            title = :title,
-                            description_text = :description_text,
-                            location_text = :location_text,
-                            employment_text_raw = :employment_text_raw,
-                            experience_text_raw = :experience_text_raw,
-                            tech_stack_text = :tech_stack_text,
-                            salary_text = :salary_text,
-                            posted_at = :posted_at,
-                            deadline_at = :deadline_at,
-                            is_active = true,
-                            last_seen_at = NOW(),
-                            updated_at = NOW()
-                        WHERE id = :job_id
-                        """
-                    ),
-                    {
-                        "job_id": existing["id"],
-                        "canonical_url": job.canonical_url,
-                        "company_name": job.company_name,
-                        "title": job.title,
-                        "description_text": job.description_text,
-                        "location_text": job.location_text,
-                        "employment_text_raw": job.employment_text_raw,
-                        "experience_text_raw": job.experience_text_raw,
-                        "tech_stack_text": job.tech_stack_text,
-                        "salary_text": job.salary_text,
-                        "posted_at": job.posted_at,
-                        "deadline_at": job.deadline_at,
-                    },
-                )
-                updated_count += 1
+        if crawler.supports_incremental and not full_refresh:
+            crawler.known_versions = _load_known_versions(db, source_row["id"])
 
+        # Jobs are pulled from the crawler's stream one batch at a time, so memory stays
+        # bounded by the batch size instead of the board size.
+        jobs = crawler.iter_jobs()
+        while True:
+            started = time.perf_counter()
+            batch = list(islice(jobs, UPSERT_BATCH_SIZE))
+            iterate_seconds += time.perf_counter() - started
+            if not batch:
+                break
+
+            started = time.perf_counter()
+            fetched_count += len(batch)
+            inserted, updated, unchanged, written_jobs = _upsert_jobs(db, source_row["id"], batch)
+            db.commit()
+            inserted_count += inserted
+            updated_count += updated
+            unchanged_count += unchanged
+            upsert_seconds += time.perf_counter() - started
+
+            if writer is not None and written_jobs:
+                started = time.perf_counter()
+                for job in written_jobs:
+                    writer.add(job, classify_job(rules, job))
+                classify_seconds += time.perf_counter() - started
+
+        # postings an incremental crawler listed but skipped because their version did not change
+        if crawler.unchanged_source_job_ids:
+            started = time.perf_counter()
+            _touch_unchanged_jobs(db, source_row["id"], crawler.unchanged_source_job_ids)
+            db.commit()
+            fetched_count += len(crawler.unchanged_source_job_ids)
+            unchanged_count += len(crawler.unchanged_source_job_ids)
+            upsert_seconds += time.perf_counter() - started
+
+        # listed postings whose detail fetch failed: a stored one is kept alive (not counted as
+        # unchanged, its content was not compared), a new one is only picked up by a later run
+        if crawler.detail_failed_source_job_ids:
+            started = time.perf_counter()
+            _touch_unchanged_jobs(db, source_row["id"], crawler.detail_failed_source_job_ids)
+            db.commit()
+            upsert_seconds += time.perf_counter() - started
+
+        if writer is not None:
+            started = time.perf_counter()
+            writer.flush()
+            classify_seconds += time.perf_counter() - started
+
+        status = "success"
+    except NotModified:
+        # the board answered 304 to a conditional request: nothing to parse or write
         status = "success"
+        listing_read = False
     except Exception as exc:
+        db.rollback()
         status = "failed"
         failed_count = 1
         error_message = str(exc)
+        # drop cached validators so the next run refetches instead of getting a 304 for data never stored
+        default_client.forget(crawler.fetch_stats.urls)
+
+    if status == "success":
+        started = time.perf_counter()
+        deactivated_count = db.execute(
+            DEACTIVATE_STALE_JOBS_SQL,
+            {
+                "source_id": source_row["id"],
+                "sweep_unseen": listing_read and fetched_count > 0,
+                "run_started_at": run_row["started_at"],
+            },
+        ).rowcount
+        upsert_seconds += time.perf_counter() - started
+
+    fetch_stats = crawler.fetch_stats
+    metrics = _phase_metrics(
+        fetch_stats,
+        iterate_seconds=iterate_seconds,
+        upsert_seconds=upsert_seconds,
+        total_seconds=time.perf_counter() - run_started,
+        row_count=fetched_count,
+    )
+    metrics["detail_failed_count"] = len(crawler.detail_failed_source_job_ids)
+    if writer is not None:
+        metrics["classify_ms"] = round(classify_seconds * 1000, 1)
+    if classify_skipped is not None:
+        metrics["classify_skipped"] = classify_skipped
 
     db.execute(
         text(
@@ -144,7 +363,12 @@ def run_crawl(db: Session, source_code: str = "remotive") -> dict[str, Any]:
                 fetched_count = :fetched_count,
                 inserted_count = :inserted_count,
                 updated_count = :updated_count,
+                unchanged_count = :unchanged_count,
+                deactivated_count = :deactivated_count,
                 failed_count = :failed_count,
+                bytes_downloaded = :bytes_downloaded,
+                not_modified_count = :not_modified_count,
+                metrics = CAST(:metrics AS jsonb),
                 error_message = :error_message
             WHERE id = :run_id
             """
@@ -155,12 +379,19 @@ def run_crawl(db: Session, source_code: str = "remotive") -> dict[str, Any]:
             "fetched_count": fetched_count,
             "inserted_count": inserted_count,
             "updated_count": updated_count,
+            "unchanged_count": unchanged_count,
+            "deactivated_count": deactivated_count,
             "failed_count": failed_count,
+            "bytes_downloaded": fetch_stats.bytes_downloaded,
+            "not_modified_count": fetch_stats.not_modified_count,
+            "metrics": json.dumps(metrics),
             "error_message": error_message,
             "run_id": run_id,
         },
     )
     db.commit()
+    # batches committed before a failure changed the listings too
+    job_count_cache.invalidate()
 
     if status == "failed":
         raise RuntimeError(error_message or "crawl failed")
@@ -172,4 +403,11 @@ def run_crawl(db: Session, source_code: str = "remotive") -> dict[str, Any]:
         "fetched_count": fetched_count,
         "inserted_count": inserted_count,
         "updated_count": updated_count,
+        "unchanged_count": unchanged_count,
+        "deactivated_count": deactivated_count,
+        "bytes_downloaded": fetch_stats.bytes_downloaded,
+        "not_modified_count": fetch_stats.not_modified_count,
+        "classified_count": writer.written_count if writer is not None else 0,
+        "classify_skipped": classify_skipped,
+        "metrics": metrics,
     }
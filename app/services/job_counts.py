@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Hashable
+
+# /jobs totals only move when a crawl or a classification run writes; both call invalidate() when
+# they finish. The TTL bounds how stale a total can get when the writer is another process (a CLI
+# script) whose invalidation this process never sees.
+COUNT_CACHE_TTL_SECONDS = 600
+MAX_CACHED_COUNTS = 512
+
+
+class JobCountCache:
+    # Exact COUNT(*) results keyed by normalized filters, least recently used evicted first.
+    def __init__(self, ttl_seconds: float = COUNT_CACHE_TTL_SECONDS, max_entries: int = MAX_CACHED_COUNTS):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[Hashable, tuple[float, int]] = {}
+        self.generation = 0
+        self.hit_count = 0
+        self.miss_count = 0
+        self.invalidation_count = 0
+
+    def get(self, key: Hashable) -> int | None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                self.miss_count += 1
+                return None
+            # re-insert so the dict order doubles as least-recently-used order
+            self._entries[key] = entry
+            self.hit_count += 1
+            return entry[1]
+
+    def put(self, key: Hashable, total: int, generation: int) -> None:
+        # generation is read before counting: a count that raced with an invalidation is dropped
+        # instead of caching a total from before the write
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic(), total)
+            while len(self._entries) > self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidation_count += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hit_count + self.miss_count
+            return {
+                "entry_count": len(self._entries),
+                "hit_count": self.hit_count,
+                "miss_count": self.miss_count,
+                "hit_ratio": round(self.hit_count / lookups, 3) if lookups else None,
+                "invalidation_count": self.invalidation_count,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+job_count_cache = JobCountCache()
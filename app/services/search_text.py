@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import html
+import re
+from typing import Any, Mapping
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# jobs.search_text: the posting's text as the classifier and the jobs search read it, computed once
+# when a crawl writes the row instead of on every classification or query.
+SEARCH_TEXT_FIELDS = ("title", "description_text", "employment_text_raw", "experience_text_raw", "tech_stack_text")
+# generous on purpose: text past the cap is invisible to rules as well as to search
+SEARCH_TEXT_MAX_CHARS = 20000
+
+BACKFILL_BATCH_SIZE = 1000
+
+_TAG = re.compile(r"<[^>]*>")
+
+UPDATE_SEARCH_TEXT_SQL = text(
+    """
+    UPDATE jobs j
+    SET search_text = t.search_text
+    FROM unnest(CAST(:ids AS bigint[]), CAST(:search_text AS text[])) AS t(id, search_text)
+    WHERE j.id = t.id
+    """
+)
+
+
+def fold_text(value: str | None) -> str:
+    # case-folded, every whitespace run (newlines, &nbsp;) collapsed to one space
+    if not value:
+        return ""
+    return " ".join(value.casefold().split())
+
+
+def strip_html(value: str) -> str:
+    # Greenhouse escapes its HTML (&lt;p&gt;), Remotive does not. Only text without a raw tag is
+    # unescaped before the tags are dropped; in raw HTML an escaped &lt;b&gt; is literal text and
+    # must survive as "<b>".
+    if "<" not in value and "&" not in value:
+        return value
+    if "<" not in value:
+        value = html.unescape(value)
+    return html.unescape(_TAG.sub(" ", value))
+
+
+def normalize_text(value: str | None) -> str:
+    if not value:
+        return ""
+    return fold_text(strip_html(value))
+
+
+def build_search_text(job: Mapping[str, Any]) -> str:
+    # one line per field, so a multi-word keyword never matches across two fields
+    parts = [normalize_text(job.get(field)) for field in SEARCH_TEXT_FIELDS]
+    return "\n".join(part for part in parts if part)[:SEARCH_TEXT_MAX_CHARS]
+
+
+def backfill_search_text(db: Session, batch_size: int = BACKFILL_BATCH_SIZE, recompute: bool = False) -> int:
+    # Fills search_text for rows written before it existed (or, with recompute, for every row after
+    # the normalization changed). Keyset batches in id order, one commit per batch.
+    updated = 0
+    after_id = 0
+    while True:
+        rows = db.execute(
+            text(
+                f"""
+                SELECT id, {", ".join(SEARCH_TEXT_FIELDS)}
+                FROM jobs
+                WHERE id > :after_id
+                  AND (CAST(:recompute AS boolean) OR search_text IS NULL)
+                ORDER BY id
+                LIMIT :limit
+                """
+            ),
+            {"after_id": after_id, "recompute": recompute, "limit": batch_size},
+        ).mappings().all()
+        if not rows:
+            return updated
+
+        db.execute(
+            UPDATE_SEARCH_TEXT_SQL,
+            {"ids": [row["id"] for row in rows], "search_text": [build_search_text(row) for row in rows]},
+        )
+        db.commit()
+        updated += len(rows)
+        after_id = rows[-1]["id"]
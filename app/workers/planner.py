@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import random
+from typing import Any, Mapping, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+HISTORY_SIZE = 10
+JITTER_RATIO = 0.1
+FIRST_RUN_SPREAD_SEC = 300
+UNCHANGED_GROWTH = 1.5
+MAX_UNCHANGED_FACTOR = 4.0
+MAX_BACKOFF_MIN = 24 * 60
+
+
+@dataclass
+class SourcePlan:
+    source_code: str
+    base_interval_min: int
+    interval_min: float
+    next_run_at: datetime
+    last_run_at: datetime | None
+    unchanged_streak: int
+    failure_streak: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "source_code": self.source_code,
+            "base_interval_min": self.base_interval_min,
+            "interval_min": round(self.interval_min, 1),
+            "next_run_at": self.next_run_at.isoformat(),
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "unchanged_streak": self.unchanged_streak,
+            "failure_streak": self.failure_streak,
+        }
+
+
+def _leading_streak(runs: Sequence[Mapping[str, Any]], predicate) -> int:
+    streak = 0
+    for run in runs:
+        if not predicate(run):
+            break
+        streak += 1
+    return streak
+
+
+def _is_unchanged(run: Mapping[str, Any]) -> bool:
+    if run["status"] != "success":
+        return False
+    return run["inserted_count"] + run["updated_count"] + run["deactivated_count"] == 0
+
+
+def plan_source(
+    source_code: str,
+    base_interval_min: int,
+    recent_runs: Sequence[Mapping[str, Any]],
+    now: datetime,
+) -> SourcePlan:
+    # recent_runs are newest first and only include finished runs
+    failure_streak = _leading_streak(recent_runs, lambda run: run["status"] == "failed")
+    unchanged_streak = 0 if failure_streak else _leading_streak(recent_runs, _is_unchanged)
+
+    if failure_streak:
+        interval_min = min(base_interval_min * 2**failure_streak, MAX_BACKOFF_MIN)
+    else:
+        interval_min = base_interval_min * min(UNCHANGED_GROWTH**unchanged_streak, MAX_UNCHANGED_FACTOR)
+
+    if not recent_runs:
+        # never crawled: start soon, spread so a fresh deployment doesn't hit every board at once
+        rng = random.Random(source_code)
+        next_run_at = now + timedelta(seconds=rng.uniform(0, FIRST_RUN_SPREAD_SEC))
+        return SourcePlan(source_code, base_interval_min, interval_min, next_run_at, None, 0, 0)
+
+    last_run = recent_runs[0]
+    # seeding with the last run id keeps the plan stable between reads but different on each cycle
+    rng = random.Random(f"{source_code}:{last_run['id']}")
+    jittered_min = interval_min * (1 + rng.uniform(-JITTER_RATIO, JITTER_RATIO))
+    next_run_at = last_run["started_at"] + timedelta(minutes=jittered_min)
+    if next_run_at < now:
+        next_run_at = now + timedelta(seconds=rng.uniform(0, FIRST_RUN_SPREAD_SEC))
+
+    return SourcePlan(
+        source_code=source_code,
+        base_interval_min=base_interval_min,
+        interval_min=interval_min,
+        next_run_at=next_run_at,
+        last_run_at=last_run["started_at"],
+        unchanged_streak=unchanged_streak,
+        failure_streak=failure_streak,
+    )
+
+
+def load_source_plans(db: Session, now: datetime, source_codes: Sequence[str] | None = None) -> list[SourcePlan]:
+    sources = db.execute(
+        text(
+            """
+            SELECT id, code, crawl_interval_min
+            FROM sources
+            WHERE is_active = true
+            ORDER BY code
+            """
+        )
+    ).mappings().all()
+    if source_codes is not None:
+        sources = [source for source in sources if source["code"] in source_codes]
+    if not sources:
+        return []
+
+    run_rows = db.execute(
+        text(
+            """
+            SELECT id, source_id, status, started_at, inserted_count, updated_count, deactivated_count
+            FROM (
+              SELECT
+                cr.id,
+                cr.source_id,
+                cr.status::text AS status,
+                cr.started_at,
+                cr.inserted_count,
+                cr.updated_count,
+                cr.deactivated_count,
+                ROW_NUMBER() OVER (PARTITION BY cr.source_id ORDER BY cr.started_at DESC) AS rn
+              FROM crawl_runs cr
+              WHERE cr.source_id = ANY(:source_ids)
+                AND cr.status <> 'running'
+            ) ranked
+            WHERE rn <= :history_size
+            ORDER BY source_id, started_at DESC
+            """
+        ),
+        {"source_ids": [source["id"] for source in sources], "history_size": HISTORY_SIZE},
+    ).mappings().all()
+
+    runs_by_source: dict[int, list[Mapping[str, Any]]] = {}
+    for row in run_rows:
+        runs_by_source.setdefault(row["source_id"], []).append(row)
+
+    return [
+        plan_source(
+            source_code=source["code"],
+            base_interval_min=source["crawl_interval_min"],
+            recent_runs=runs_by_source.get(source["id"], []),
+            now=now,
+        )
+        for source in sources
+    ]
@@ -1,27 +1,119 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
+import threading
+from typing import Any
+
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
+from app.core.db import SessionLocal
+from app.services.crawler.registry import supported_source_codes
+from app.workers.planner import SourcePlan, load_source_plans
 from app.workers.tasks import crawl_and_classify_once
 
 scheduler = BackgroundScheduler(timezone="Asia/Seoul")
 
+JOB_ID_PREFIX = "crawl:"
+SYNC_INTERVAL_MIN = 30
+
+# a date-triggered job leaves the job store while it executes; track those so sync doesn't re-add them
+_in_flight: set[str] = set()
+_in_flight_lock = threading.Lock()
+
+
+def _job_id(source_code: str) -> str:
+    return f"{JOB_ID_PREFIX}{source_code}"
+
+
+def _load_plans(source_codes: list[str] | None = None) -> list[SourcePlan]:
+    db = SessionLocal()
+    try:
+        return load_source_plans(db, now=datetime.now(timezone.utc), source_codes=source_codes or supported_source_codes())
+    finally:
+        db.close()
+
+
+def _schedule(plan: SourcePlan) -> None:
+    scheduler.add_job(
+        run_source_and_reschedule,
+        trigger=DateTrigger(run_date=plan.next_run_at),
+        args=[plan.source_code],
+        id=_job_id(plan.source_code),
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=None,
+    )
+
+
+def run_source_and_reschedule(source_code: str) -> None:
+    with _in_flight_lock:
+        _in_flight.add(source_code)
+    try:
+        crawl_and_classify_once(source_code=source_code)
+    except Exception as exc:  # the failed run is already recorded in crawl_runs; keep the schedule alive
+        print(f"[scheduler] crawl failed for {source_code}: {exc}")
+    finally:
+        try:
+            for plan in _load_plans([source_code]):
+                _schedule(plan)
+        finally:
+            with _in_flight_lock:
+                _in_flight.discard(source_code)
+
+
+def sync_source_jobs() -> None:
+    # pick up sources activated after startup and drop the ones that were deactivated
+    plans = _load_plans()
+    planned_ids = {_job_id(plan.source_code) for plan in plans}
+    for job in scheduler.get_jobs():
+        if job.id.startswith(JOB_ID_PREFIX) and job.id not in planned_ids:
+            job.remove()
+    with _in_flight_lock:
+        in_flight = set(_in_flight)
+    for plan in plans:
+        if plan.source_code not in in_flight and scheduler.get_job(_job_id(plan.source_code)) is None:
+            _schedule(plan)
+
+
+def scheduled_runs() -> dict[str, datetime | None]:
+    if not scheduler.running:
+        return {}
+    return {
+        job.id.removeprefix(JOB_ID_PREFIX): job.next_run_time
+        for job in scheduler.get_jobs()
+        if job.id.startswith(JOB_ID_PREFIX)
+    }
+
+
+def describe_schedule() -> dict[str, Any]:
+    scheduled = scheduled_runs()
+    items = []
+    for plan in _load_plans():
+        item = plan.to_dict()
+        scheduled_at = scheduled.get(plan.source_code)
+        item["scheduled_at"] = scheduled_at.isoformat() if scheduled_at else None
+        items.append(item)
+    return {"scheduler_running": scheduler.running, "items": items}
+
 
 def start_scheduler() -> None:
     if scheduler.running:
         return
 
-    # MVP: 하루 2회 실행 (09:00, 18:00 KST)
+    # 소스별 crawl_interval_min 기준으로 각각 스케줄 (변화 없으면 간격을 늘리고, 실패가 이어지면 백오프)
+    scheduler.start()
     scheduler.add_job(
-        crawl_and_classify_once,
-        trigger=CronTrigger(hour="9,18", minute=0),
-        id="crawl_and_classify_job",
+        sync_source_jobs,
+        trigger=IntervalTrigger(minutes=SYNC_INTERVAL_MIN),
+        id="sync_source_jobs",
         replace_existing=True,
         max_instances=1,
         coalesce=True,
+        next_run_time=datetime.now(timezone.utc),
     )
-    scheduler.start()
 
 
 def stop_scheduler() -> None:
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
+import time
+
 from app.core.config import get_settings
 from app.core.db import SessionLocal
-from app.services.classifier.rule_engine import classify_jobs
-from app.services.crawler.runner import run_crawl
+from app.services.classifier.rule_engine import classify_pending_jobs
+from app.services.crawler.runner import record_run_metrics, run_crawl
 
 
-def crawl_and_classify_once(source_code: str = "remotive", classify_limit: int = 300) -> dict[str, object]:
+def crawl_and_classify_once(source_code: str = "remotive") -> dict[str, object]:
     settings = get_settings()
     db = SessionLocal()
     try:
-        crawl_result = run_crawl(db=db, source_code=source_code)
-        classify_result = classify_jobs(db=db, rule_version=settings.rule_version, limit=classify_limit)
+        crawl_result = run_crawl(db=db, source_code=source_code, rule_version=settings.rule_version)
+        # the crawl classified what it wrote; this picks up the rest (reactivated rows, a new rule version)
+        started = time.perf_counter()
+        classify_result = classify_pending_jobs(db=db, rule_version=settings.rule_version)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        record_run_metrics(db, crawl_result["run_id"], {"classify_pending_ms": elapsed_ms})
         return {"crawl": crawl_result, "classify": classify_result}
     finally:
         db.close()
+
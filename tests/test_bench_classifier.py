@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import unittest
+
+from app.scripts.bench_classifier import bench_case, iter_jobs, synthetic_rules
+from app.services.classifier.rule_engine import classify_job, compile_rules
+
+
+class SyntheticCorpusTest(unittest.TestCase):
+    def test_corpus_is_deterministic_and_mixed(self):
+        first = list(iter_jobs(50, seed=3))
+        self.assertEqual(first, list(iter_jobs(50, seed=3)))
+        self.assertNotEqual(first, list(iter_jobs(50, seed=4)))
+
+        descriptions = "\n".join(job["description_text"] for job in first)
+        self.assertIn("<", descriptions)
+        self.assertRegex(descriptions, "[가-힣]")
+        self.assertRegex(descriptions, "[A-Za-z]{4}")
+
+    def test_synthetic_rules_hit_the_corpus(self):
+        rules = synthetic_rules(500, seed=0)
+        self.assertEqual(len(rules), 500)
+        self.assertEqual(len({rule.keyword for rule in rules}), 500)
+
+        compiled = compile_rules("bench", rules)
+        results = [classify_job(compiled, job) for job in iter_jobs(30, seed=0)]
+        self.assertTrue(any(result["matched_keywords"] for result in results))
+
+    def test_bench_case_reports_phases(self):
+        row = bench_case(size=20, rule_count=50, seed=0, keyword_density=0.3, trace_memory=True)
+        self.assertEqual((row["size"], row["rule_count"]), (20, 50))
+        for key in ("jobs_per_sec", "blob_us", "match_us", "pick_us", "tracemalloc_peak_kb"):
+            self.assertIsNotNone(row[key])
+
+
+if __name__ == "__main__":
+    unittest.main()
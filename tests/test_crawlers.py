@@ -1,18 +1,76 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
 import unittest
 from unittest.mock import patch
 
+from app.services.crawler.base import CrawlJob
 from app.services.crawler.greenhouse import GreenhouseCrawler
+from app.services.crawler.http_client import NotModified, default_client
 from app.services.crawler.registry import get_crawler
 from app.services.crawler.remotive import RemotiveCrawler
 
+BOARD_ETAG = '"board-v1"'
+BOARD_INDEX = {
+    "jobs": [
+        {"id": 1, "title": "Backend Engineer", "updated_at": "2026-02-17T00:00:00Z"},
+        {"id": 2, "title": "Server Engineer", "updated_at": "2026-02-18T00:00:00Z"},
+    ]
+}
+
+
+class FlakyBoardHandler(BaseHTTPRequestHandler):
+    # a Greenhouse board whose index honours If-None-Match and whose detail endpoint fails while
+    # failing_details is set
+    protocol_version = "HTTP/1.1"
+    failing_details = True
+    index_conditional: list[bool] = []
+
+    def do_GET(self):
+        if self.path.endswith("/jobs"):
+            FlakyBoardHandler.index_conditional.append("If-None-Match" in self.headers)
+            if self.headers.get("If-None-Match") == BOARD_ETAG:
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.respond(200, BOARD_INDEX)
+        elif FlakyBoardHandler.failing_details:
+            self.respond(503, {})
+        else:
+            job_id = int(self.path.rsplit("/", 1)[1])
+            self.respond(
+                200,
+                {
+                    "id": job_id,
+                    "absolute_url": f"https://boards.greenhouse.io/flaky/jobs/{job_id}",
+                    "title": "Server Engineer",
+                    "content": "Build services",
+                    "updated_at": "2026-02-18T00:00:00Z",
+                },
+            )
+
+    def respond(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", BOARD_ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
 
 class CrawlerTest(unittest.TestCase):
-    @patch("app.services.crawler.remotive.fetch_json")
-    def test_remotive_fetch_jobs(self, mock_fetch_json):
-        mock_fetch_json.return_value = {
-            "jobs": [
+    @patch("app.services.crawler.remotive.stream_json_items")
+    def test_remotive_fetch_jobs(self, mock_stream_json_items):
+        mock_stream_json_items.return_value = iter(
+            [
                 {
                     "id": 123,
                     "url": "https://remotive.com/remote-jobs/software-dev/backend-engineer-123",
@@ -26,7 +84,7 @@ class CrawlerTest(unittest.TestCase):
                     "publication_date": "2026-02-17T00:00:00+00:00",
                 }
             ]
-        }
+        )
 
         crawler = RemotiveCrawler()
         jobs = crawler.fetch_jobs()
@@ -36,10 +94,10 @@ class CrawlerTest(unittest.TestCase):
         self.assertEqual(jobs[0].company_name, "Acme")
         self.assertIn("python", jobs[0].tech_stack_text or "")
 
-    @patch("app.services.crawler.greenhouse.fetch_json")
-    def test_greenhouse_fetch_jobs(self, mock_fetch_json):
-        mock_fetch_json.return_value = {
-            "jobs": [
+    @patch("app.services.crawler.greenhouse.stream_json_items")
+    def test_greenhouse_fetch_jobs(self, mock_stream_json_items):
+        mock_stream_json_items.return_value = iter(
+            [
                 {
                     "id": 77,
                     "absolute_url": "https://boards.greenhouse.io/moloco/jobs/77",
@@ -52,7 +110,7 @@ class CrawlerTest(unittest.TestCase):
                     "metadata": [{"name": "employment_type", "value": "Full-time"}],
                 }
             ]
-        }
+        )
 
         crawler = GreenhouseCrawler(source_code="moloco_gh", board_token="moloco", company_name="Moloco")
         jobs = crawler.fetch_jobs()
@@ -62,6 +120,88 @@ class CrawlerTest(unittest.TestCase):
         self.assertEqual(jobs[0].company_name, "Moloco")
         self.assertIn("Engineering", jobs[0].tech_stack_text or "")
 
+    @patch("app.services.crawler.greenhouse.fetch_json")
+    @patch("app.services.crawler.greenhouse.stream_json_items")
+    def test_greenhouse_incremental_fetches_only_changed_content(self, mock_stream_json_items, mock_fetch_json):
+        stable_at = "2026-02-17T00:00:00Z"
+        mock_stream_json_items.return_value = iter(
+            [
+                {"id": 1, "title": "Backend Engineer", "updated_at": stable_at},
+                {"id": 2, "title": "Server Engineer", "updated_at": stable_at},
+                {"id": 3, "title": "Data Engineer", "updated_at": "2026-02-18T00:00:00Z"},
+            ]
+        )
+        mock_fetch_json.return_value = {
+            "id": 3,
+            "absolute_url": "https://boards.greenhouse.io/moloco/jobs/3",
+            "title": "Data Engineer",
+            "content": "Build pipelines",
+            "updated_at": "2026-02-18T00:00:00Z",
+        }
+
+        crawler = GreenhouseCrawler(source_code="moloco_gh", board_token="moloco", company_name="Moloco")
+        stored_at = datetime(2026, 2, 17, tzinfo=timezone.utc)
+        crawler.known_versions = {"1": stored_at, "2": stored_at, "3": stored_at}
+        jobs = crawler.fetch_jobs()
+
+        self.assertEqual([job.source_job_id for job in jobs], ["3"])
+        self.assertEqual(jobs[0].description_text, "Build pipelines")
+        self.assertEqual(sorted(crawler.unchanged_source_job_ids), ["1", "2"])
+        self.assertNotIn("content=true", mock_stream_json_items.call_args.args[0])
+        mock_fetch_json.assert_called_once()
+        self.assertTrue(mock_fetch_json.call_args.args[0].endswith("/moloco/jobs/3"))
+
+    def test_greenhouse_failed_detail_is_retried_on_an_unchanged_board(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyBoardHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        FlakyBoardHandler.failing_details = True
+        FlakyBoardHandler.index_conditional = []
+
+        def crawl() -> GreenhouseCrawler:
+            crawler = GreenhouseCrawler(
+                source_code="flaky_gh",
+                board_token="flaky",
+                company_name="Flaky",
+                api_base_url=f"http://127.0.0.1:{server.server_port}/v1/boards",
+            )
+            crawler.known_versions = {"1": datetime(2026, 2, 17, tzinfo=timezone.utc)}
+            self.addCleanup(default_client.forget, [crawler.board_url])
+            crawler.jobs = crawler.fetch_jobs()
+            return crawler
+
+        first = crawl()
+        self.assertEqual(first.jobs, [])
+        self.assertEqual(first.unchanged_source_job_ids, ["1"])
+        self.assertEqual(first.detail_failed_source_job_ids, ["2"])
+
+        # the board did not change, yet the index is requested without its ETag so posting 2 is retried
+        FlakyBoardHandler.failing_details = False
+        second = crawl()
+        self.assertEqual([job.source_job_id for job in second.jobs], ["2"])
+        self.assertEqual(second.detail_failed_source_job_ids, [])
+        self.assertEqual(FlakyBoardHandler.index_conditional, [False, False])
+
+        # once every detail succeeded, the unchanged board is skipped again
+        with self.assertRaises(NotModified):
+            crawl()
+        self.assertEqual(FlakyBoardHandler.index_conditional, [False, False, True])
+
+    def test_content_hash_tracks_field_changes(self):
+        job = CrawlJob(source_job_id="1", canonical_url="https://example.test/1", company_name="Acme", title="Backend")
+        same = CrawlJob(source_job_id="1", canonical_url="https://example.test/1", company_name="Acme", title="Backend")
+        changed = CrawlJob(
+            source_job_id="1",
+            canonical_url="https://example.test/1",
+            company_name="Acme",
+            title="Backend",
+            description_text="now with a description",
+        )
+
+        self.assertEqual(job.content_hash(), same.content_hash())
+        self.assertNotEqual(job.content_hash(), changed.content_hash())
+
     def test_registry(self):
         remotive = get_crawler("remotive")
         self.assertIsInstance(remotive, RemotiveCrawler)
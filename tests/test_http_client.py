@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import unittest
+
+from app.services.crawler.http_client import FetchStats, HttpClient, NotModified
+
+PAYLOAD = json.dumps({"jobs": [{"id": index, "title": "Backend Engineer"} for index in range(200)]}).encode("utf-8")
+ETAG = '"board-v1"'
+
+
+class BoardHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set[int] = set()
+
+    def do_GET(self):
+        BoardHandler.connections.add(id(self.connection))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = PAYLOAD
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", ETAG)
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpClientTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), BoardHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        BoardHandler.connections.clear()
+        self.client = HttpClient(timeout=5)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_gzip_body_is_decoded_and_compressed_bytes_counted(self):
+        stats = FetchStats()
+        body = self.client.get(f"{self.base_url}/jobs", stats=stats)
+
+        self.assertEqual(body, PAYLOAD)
+        self.assertLess(stats.bytes_downloaded, len(PAYLOAD))
+
+    def test_conditional_request_raises_not_modified_on_reused_connection(self):
+        url = f"{self.base_url}/boards/acme/jobs"
+        stats = FetchStats()
+        self.client.get(url, conditional=True, stats=stats)
+
+        with self.assertRaises(NotModified):
+            self.client.get(url, conditional=True, stats=stats)
+
+        self.assertEqual(stats.request_count, 2)
+        self.assertEqual(stats.not_modified_count, 1)
+        self.assertEqual(len(BoardHandler.connections), 1)
+
+    def test_forget_drops_validators(self):
+        url = f"{self.base_url}/boards/acme/jobs"
+        self.client.get(url, conditional=True)
+        self.client.forget([url])
+
+        self.assertEqual(self.client.get(url, conditional=True), PAYLOAD)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from app.services import job_counts
+from app.services.job_counts import JobCountCache
+
+
+class JobCountCacheTest(unittest.TestCase):
+    def test_least_recently_used_total_is_evicted(self):
+        cache = JobCountCache(max_entries=2)
+        cache.put("a", 1, cache.generation)
+        cache.put("b", 2, cache.generation)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3, cache.generation)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+        self.assertEqual((cache.hit_count, cache.miss_count), (3, 1))
+
+    def test_invalidate_drops_totals_and_counts_that_raced_with_it(self):
+        cache = JobCountCache()
+        cache.put("a", 1, cache.generation)
+        generation = cache.generation
+        cache.invalidate()
+        self.assertIsNone(cache.get("a"))
+        # counted before the invalidation, stored after it
+        cache.put("a", 1, generation)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["invalidation_count"], 1)
+
+    def test_totals_expire(self):
+        cache = JobCountCache(ttl_seconds=60)
+        with patch.object(job_counts.time, "monotonic", return_value=1000.0):
+            cache.put("a", 1, cache.generation)
+        with patch.object(job_counts.time, "monotonic", return_value=1059.0):
+            self.assertEqual(cache.get("a"), 1)
+        with patch.object(job_counts.time, "monotonic", return_value=1061.0):
+            self.assertIsNone(cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
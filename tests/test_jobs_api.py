@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from fastapi import HTTPException
+
+from app.api.v1.jobs import _encode_cursor, _trigram_installed, list_jobs, suggest_jobs
+from app.core.config import get_settings
+from app.services.job_counts import job_count_cache
+from app.services.search_text import build_search_text
+
+TEST_DATABASE_URL = os.getenv("JOBLOG_TEST_DATABASE_URL")
+TEST_SOURCE_CODE = "test_jobs_api_src"
+# every test posting carries this token, so queries never pick up other rows in the database
+MARKER = "zqvmarker"
+
+JOBS = [
+    {"title": f"{MARKER} Backend Engineer", "company_name": "Acme", "description_text": "Java Spring"},
+    {"title": f"{MARKER} Data Analyst", "company_name": "Globex", "description_text": "&lt;p&gt;backend 팀과 협업&lt;/p&gt;"},
+    {"title": f"{MARKER} 신입 서버 개발자", "company_name": "한빛", "description_text": "<p>백엔드에서 Node.js로 API 개발</p>"},
+    {"title": f"{MARKER} Product Designer", "company_name": "Initech", "description_text": "Figma"},
+]
+# (posted days ago, deadline in days, role_type, new_grad_score); NULL dates sort last
+JOB_ORDER_FIELDS = [(0, 30, "backend", 80), (1, None, "data", 80), (2, 7, "backend", 95), (None, None, "unknown", 10)]
+
+
+def search(db, **overrides: Any) -> dict[str, Any]:
+    params = {
+        "employment_type": None,
+        "role_type": None,
+        "is_active": True,
+        "q": None,
+        "posted_from": None,
+        "posted_to": None,
+        "deadline_before": None,
+        "sort": "posted_at_desc",
+        "page": 1,
+        "size": 20,
+        "cursor": None,
+        "count": "exact",
+    }
+    params.update(overrides)
+    return list_jobs(db=db, **params)
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "JOBLOG_TEST_DATABASE_URL is not set")
+class JobSearchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        cls.Session = sessionmaker(bind=cls.engine)
+        with cls.engine.begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO sources (code, name, base_url, is_active, crawl_interval_min)
+                    VALUES (:code, 'Jobs API Test', 'https://example.test', false, 60)
+                    ON CONFLICT (code) DO NOTHING
+                    """
+                ),
+                {"code": TEST_SOURCE_CODE},
+            )
+            cls.source_id = conn.execute(
+                text("SELECT id FROM sources WHERE code = :code"), {"code": TEST_SOURCE_CODE}
+            ).scalar_one()
+            conn.execute(text("DELETE FROM jobs WHERE source_id = :source_id"), {"source_id": cls.source_id})
+            for index, (job, (posted_days, deadline_days, role_type, score)) in enumerate(zip(JOBS, JOB_ORDER_FIELDS)):
+                job_id = conn.execute(
+                    text(
+                        """
+                        INSERT INTO jobs (
+                          source_id, source_job_id, canonical_url, company_name, title, description_text,
+                          search_text, posted_at, deadline_at
+                        )
+                        VALUES (
+                          :source_id, :source_job_id, :url, :company_name, :title, :description_text,
+                          :search_text, now() - make_interval(days => :posted_days),
+                          now() + make_interval(days => :deadline_days)
+                        )
+                        RETURNING id
+                        """
+                    ),
+                    {
+                        **job,
+                        "source_id": cls.source_id,
+                        "source_job_id": f"job-{index}",
+                        "url": f"https://example.test/{TEST_SOURCE_CODE}/{index}",
+                        "search_text": build_search_text(job),
+                        "posted_days": posted_days,
+                        "deadline_days": deadline_days,
+                    },
+                ).scalar_one()
+                conn.execute(
+                    text(
+                        """
+                        INSERT INTO job_classifications (job_id, rule_version, role_type, new_grad_score)
+                        VALUES (:job_id, :rule_version, CAST(:role_type AS role_type_enum), :score)
+                        """
+                    ),
+                    {"job_id": job_id, "rule_version": get_settings().rule_version, "role_type": role_type, "score": score},
+                )
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.engine.begin() as conn:
+            conn.execute(text("DELETE FROM jobs WHERE source_id = :source_id"), {"source_id": cls.source_id})
+        cls.engine.dispose()
+
+    def setUp(self):
+        self.db = self.Session()
+        # the fixture rows are written directly, not by a crawl that would invalidate cached totals
+        job_count_cache.invalidate()
+
+    def tearDown(self):
+        self.db.close()
+
+    def titles(self, q: str, **overrides: Any) -> list[str]:
+        result = search(self.db, q=f"{MARKER} {q}", **overrides)
+        self.assertEqual(result["total"], len(result["items"]))
+        return [item["title"].removeprefix(f"{MARKER} ") for item in result["items"]]
+
+    def test_terms_match_title_company_and_description(self):
+        self.assertEqual(self.titles("spring"), ["Backend Engineer"])
+        self.assertEqual(self.titles("GLOBEX"), ["Data Analyst"])
+        self.assertEqual(self.titles("java analyst"), [])
+
+    def test_prefix_terms_cover_korean_particles_and_inflection(self):
+        self.assertEqual(self.titles("백엔드"), ["신입 서버 개발자"])
+        self.assertEqual(self.titles("node.js 개발"), ["신입 서버 개발자"])
+        self.assertEqual(self.titles("engine"), ["Backend Engineer"])
+
+    def test_escaped_html_is_not_indexed(self):
+        self.assertEqual(self.titles("lt"), [])
+        self.assertEqual(self.titles("협업"), ["Data Analyst"])
+
+    def test_relevance_ranks_title_matches_first(self):
+        self.assertEqual(self.titles("backend"), ["Backend Engineer", "Data Analyst"])
+        # make the description-only match the newest posting
+        self.db.execute(
+            text("UPDATE jobs SET posted_at = now() + interval '1 day' WHERE source_id = :source_id AND source_job_id = 'job-1'"),
+            {"source_id": self.source_id},
+        )
+        self.assertEqual(self.titles("backend", sort="posted_at_desc"), ["Data Analyst", "Backend Engineer"])
+        self.assertEqual(self.titles("backend", sort="relevance"), ["Backend Engineer", "Data Analyst"])
+        self.db.rollback()
+
+    def test_substrings_of_company_and_title_match(self):
+        # no word starts with "rker", so only the trigram-indexed ILIKE arm can find it
+        result = search(self.db, q=f"{MARKER[-4:]} backend eng")
+        self.assertEqual([item["title"] for item in result["items"]], [f"{MARKER} Backend Engineer"])
+        self.assertEqual(search(self.db, q=f"{MARKER} 100%")["total"], 0)
+
+    def test_suggest_completes_substrings(self):
+        # runs whichever SQL the test database supports, then the ILIKE-only fallback explicitly
+        for trigram_installed in (_trigram_installed(self.db), False):
+            with self.subTest(trigram_installed=trigram_installed):
+                with patch("app.api.v1.jobs._trigram_installed", return_value=trigram_installed):
+                    result = suggest_jobs(q="lobe", limit=20, is_active=True, db=self.db)
+                    self.assertEqual(result["fuzzy"], trigram_installed)
+                    self.assertIn("Globex", [company["value"] for company in result["companies"]])
+                    result = suggest_jobs(q=f"{MARKER} data anal", limit=20, is_active=True, db=self.db)
+                    self.assertEqual(result["titles"][0]["value"], f"{MARKER} Data Analyst")
+                    self.assertEqual(suggest_jobs(q=f"{MARKER} 100%", limit=20, is_active=True, db=self.db)["titles"], [])
+
+    def test_suggest_completes_typos(self):
+        if not _trigram_installed(self.db):
+            self.skipTest("pg_trgm is not installed in the test database")
+
+        result = suggest_jobs(q="globx", limit=20, is_active=True, db=self.db)
+        self.assertIn("Globex", [company["value"] for company in result["companies"]])
+        result = suggest_jobs(q=f"{MARKER} data anal", limit=20, is_active=True, db=self.db)
+        self.assertEqual(result["titles"][0]["value"], f"{MARKER} Data Analyst")
+
+    def pages(self, **overrides: Any) -> list[list[str]]:
+        # follows next_cursor to the end, one job per page
+        pages = []
+        result = search(self.db, q=MARKER, size=1, **overrides)
+        while True:
+            pages.append([item["title"].removeprefix(f"{MARKER} ") for item in result["items"]])
+            if result["next_cursor"] is None:
+                return pages
+            result = search(self.db, q=MARKER, size=1, cursor=result["next_cursor"], **overrides)
+
+    def test_cursor_pages_follow_each_sort(self):
+        expected = {
+            "posted_at_desc": ["Backend Engineer", "Data Analyst", "신입 서버 개발자", "Product Designer"],
+            "deadline_asc": ["신입 서버 개발자", "Backend Engineer", "Data Analyst", "Product Designer"],
+            "score_desc": ["신입 서버 개발자", "Backend Engineer", "Data Analyst", "Product Designer"],
+        }
+        for sort, titles in expected.items():
+            with self.subTest(sort=sort):
+                self.assertEqual(self.pages(sort=sort), [[title] for title in titles])
+                offset_pages = [
+                    [item["title"].removeprefix(f"{MARKER} ") for item in search(self.db, q=MARKER, sort=sort, size=1, page=page)["items"]]
+                    for page in range(1, 5)
+                ]
+                self.assertEqual(offset_pages, [[title] for title in titles])
+
+    def test_cursor_with_classification_filter(self):
+        self.assertEqual(self.pages(sort="score_desc", role_type="backend"), [["신입 서버 개발자"], ["Backend Engineer"]])
+        self.assertEqual(self.pages(sort="relevance", role_type="backend"), [["Backend Engineer"], ["신입 서버 개발자"]])
+
+    def test_cursor_is_not_shifted_by_new_rows(self):
+        first = search(self.db, q=MARKER, size=2)
+        self.db.execute(
+            text("UPDATE jobs SET posted_at = now() + interval '1 day' WHERE source_id = :source_id AND source_job_id = 'job-3'"),
+            {"source_id": self.source_id},
+        )
+        second = search(self.db, q=MARKER, size=2, cursor=first["next_cursor"])
+        self.assertEqual([item["title"] for item in second["items"]], [f"{MARKER} 신입 서버 개발자"])
+        self.db.rollback()
+
+    def test_bad_cursor_is_rejected(self):
+        cursor = search(self.db, q=MARKER, size=1)["next_cursor"]
+        tampered = [
+            ({"s": "posted_at_desc", "k": ["yesterday", "1"]}, "posted_at_desc"),
+            ({"s": "score_desc", "k": ["99999999999", "infinity", "1"]}, "score_desc"),
+            ({"s": "deadline_asc", "k": ["infinity", None]}, "deadline_asc"),
+        ]
+        cases = [("not-a-cursor", "posted_at_desc"), (cursor, "deadline_asc"), (cursor[:-4], "posted_at_desc")]
+        cases += [(_encode_cursor(payload), sort) for payload, sort in tampered]
+        for bad_cursor, sort in cases:
+            with self.subTest(cursor=bad_cursor, sort=sort):
+                with self.assertRaises(HTTPException) as raised:
+                    search(self.db, q=MARKER, sort=sort, cursor=bad_cursor)
+                self.assertEqual(raised.exception.status_code, 400)
+                self.assertIn("cursor", raised.exception.detail.lower())
+
+    def test_unknown_classification_filter_is_rejected(self):
+        for overrides in ({"role_type": "bogus"}, {"employment_type": "bogus"}):
+            with self.subTest(**overrides):
+                with self.assertRaises(HTTPException) as raised:
+                    search(self.db, q=MARKER, **overrides)
+                self.assertEqual(raised.exception.status_code, 400)
+                self.assertEqual(raised.exception.detail, f"Unknown {next(iter(overrides))}: bogus")
+        # an empty filter still means any role
+        self.assertEqual(search(self.db, q=MARKER, role_type="")["total"], 4)
+
+    def test_count_options_report_their_kind(self):
+        exact = search(self.db, q=MARKER, size=1)
+        self.assertEqual((exact["total"], exact["total_kind"], exact["has_more"]), (4, "exact", True))
+        cached = search(self.db, q=f"  {MARKER} ", size=1, page=4)
+        self.assertEqual((cached["total"], cached["total_kind"], cached["has_more"]), (4, "cached", False))
+        job_count_cache.invalidate()
+        self.assertEqual(search(self.db, q=MARKER)["total_kind"], "exact")
+
+        none = search(self.db, q=MARKER, size=3, count="none")
+        self.assertEqual((none["total"], none["total_kind"], none["has_more"]), (None, "none", True))
+        estimate = search(self.db, q=MARKER, size=3, count="estimate")
+        self.assertEqual(estimate["total_kind"], "estimate")
+        self.assertGreaterEqual(estimate["total"], 4)
+
+    def test_query_without_terms_matches_nothing(self):
+        self.assertEqual(search(self.db, q="!!!")["total"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import os
+from typing import Any, Iterator
+import unittest
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.jobs import list_jobs
+from app.core.config import get_settings
+
+TEST_DATABASE_URL = os.getenv("JOBLOG_TEST_DATABASE_URL")
+TEST_SOURCE_CODE = "test_jobs_plans_src"
+# large enough that a sort over a sequential scan costs more than walking an index for one page
+PLAN_JOB_COUNT = 40_000
+
+SEED_JOBS_SQL = text(
+    """
+    INSERT INTO jobs (
+      source_id, source_job_id, canonical_url, company_name, title, search_text, posted_at, deadline_at, is_active
+    )
+    SELECT
+      :source_id,
+      'plan-' || g,
+      'https://example.test/' || :source_code || '/' || g,
+      'Company ' || (g % 500),
+      'Backend Engineer ' || g,
+      'backend engineer java spring tag' || (g % 2000),
+      CASE WHEN g % 20 = 0 THEN NULL ELSE now() - make_interval(mins => g % 100000) END,
+      CASE WHEN g % 3 = 0 THEN NULL ELSE now() + make_interval(hours => g % 5000) END,
+      g % 10 <> 0
+    FROM generate_series(1, :job_count) AS g
+    """
+)
+SEED_CLASSIFICATIONS_SQL = text(
+    """
+    INSERT INTO job_classifications (job_id, rule_version, employment_type, role_type, new_grad_score)
+    SELECT
+      id,
+      :rule_version,
+      CAST((ARRAY['new_grad', 'experienced', 'intern_convertible', 'unknown'])[1 + id % 4] AS employment_type_enum),
+      CAST((ARRAY['backend', 'backend', 'frontend', 'data', 'unknown'])[1 + id % 5] AS role_type_enum),
+      (id * 7) % 101
+    FROM jobs
+    WHERE source_id = :source_id
+    """
+)
+
+
+def plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "JOBLOG_TEST_DATABASE_URL is not set")
+class JobsQueryPlanTest(unittest.TestCase):
+    # Regression tests for the /jobs access paths (20261018_10, 20261018_11): each sort option must be
+    # served by its index, never by sorting a sequential scan of jobs. The one path without an index
+    # (score_desc with no classification filter) has its accepted plan pinned instead.
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        cls.Session = sessionmaker(bind=cls.engine)
+        with cls.engine.begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO sources (code, name, base_url, is_active, crawl_interval_min)
+                    VALUES (:code, 'Jobs Plan Test', 'https://example.test', false, 60)
+                    ON CONFLICT (code) DO NOTHING
+                    """
+                ),
+                {"code": TEST_SOURCE_CODE},
+            )
+            cls.source_id = conn.execute(
+                text("SELECT id FROM sources WHERE code = :code"), {"code": TEST_SOURCE_CODE}
+            ).scalar_one()
+            conn.execute(text("DELETE FROM jobs WHERE source_id = :source_id"), {"source_id": cls.source_id})
+            conn.execute(
+                SEED_JOBS_SQL,
+                {"source_id": cls.source_id, "source_code": TEST_SOURCE_CODE, "job_count": PLAN_JOB_COUNT},
+            )
+            conn.execute(
+                SEED_CLASSIFICATIONS_SQL, {"source_id": cls.source_id, "rule_version": get_settings().rule_version}
+            )
+            cls.has_trigram = conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+        with cls.engine.connect() as conn:
+            conn.execute(text("ANALYZE jobs"))
+            conn.execute(text("ANALYZE job_classifications"))
+            conn.commit()
+
+        cls.statements: list[tuple[str, Any]] = []
+        event.listen(cls.engine, "before_cursor_execute", cls._capture)
+
+    @classmethod
+    def _capture(cls, conn, cursor, statement, parameters, context, executemany):
+        cls.statements.append((statement, parameters))
+
+    @classmethod
+    def tearDownClass(cls):
+        event.remove(cls.engine, "before_cursor_execute", cls._capture)
+        with cls.engine.begin() as conn:
+            conn.execute(text("DELETE FROM jobs WHERE source_id = :source_id"), {"source_id": cls.source_id})
+        cls.engine.dispose()
+
+    def setUp(self):
+        self.db = self.Session()
+
+    def tearDown(self):
+        self.db.close()
+
+    def list(self, **overrides: Any) -> dict[str, Any]:
+        params = {
+            "employment_type": None,
+            "role_type": "backend",
+            "is_active": True,
+            "q": None,
+            "posted_from": None,
+            "posted_to": None,
+            "deadline_before": None,
+            "sort": "posted_at_desc",
+            "page": 1,
+            "size": 20,
+            "cursor": None,
+            "count": "none",
+        }
+        params.update(overrides)
+        return list_jobs(db=self.db, **params)
+
+    def plan(self, analyze: bool = False, **overrides: Any) -> list[dict[str, Any]]:
+        self.statements.clear()
+        self.list(**overrides)
+        statement, parameters = next(
+            (statement, parameters) for statement, parameters in reversed(self.statements) if "ORDER BY" in statement
+        )
+        options = "ANALYZE, FORMAT JSON" if analyze else "FORMAT JSON"
+        explained = self.db.connection().exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters).scalar_one()
+        return list(plan_nodes(explained[0]["Plan"]))
+
+    def assert_index_path(self, nodes: list[dict[str, Any]], index_name: str) -> None:
+        summary = [(node["Node Type"], node.get("Relation Name"), node.get("Index Name")) for node in nodes]
+        self.assertIn(index_name, [node.get("Index Name") for node in nodes], summary)
+        self.assertNotIn(("Seq Scan", "jobs"), [(node["Node Type"], node.get("Relation Name")) for node in nodes], summary)
+        # an Incremental Sort inside an index-ordered stream is fine; a full Sort means no index order
+        self.assertNotIn("Sort", [node["Node Type"] for node in nodes], summary)
+
+    def test_each_sort_option_walks_its_index(self):
+        cases = [
+            ({"sort": "posted_at_desc"}, "idx_jobs_active_posted_at_key"),
+            ({"sort": "posted_at_desc", "role_type": None}, "idx_jobs_active_posted_at_key"),
+            ({"sort": "deadline_asc"}, "idx_jobs_active_deadline_at_key"),
+            ({"sort": "deadline_asc", "role_type": None}, "idx_jobs_active_deadline_at_key"),
+            ({"sort": "score_desc"}, "idx_job_classifications_role_score"),
+            ({"sort": "score_desc", "role_type": None, "employment_type": "new_grad"}, "idx_job_classifications_employment_score"),
+        ]
+        for overrides, index_name in cases:
+            with self.subTest(**overrides):
+                self.assert_index_path(self.plan(**overrides), index_name)
+
+    def test_unfiltered_score_sort_keeps_its_accepted_plan(self):
+        # score_desc without role_type/employment_type orders by COALESCE(jc.new_grad_score, -1) across
+        # the LEFT JOIN, which no index serves (the UI always sends role_type). The accepted plan reads
+        # each table once into a hash join and keeps only the page in a top-N sort; a nested loop or a
+        # full (or on-disk) sort is a regression.
+        nodes = self.plan(analyze=True, sort="score_desc", role_type=None)
+        summary = [(node["Node Type"], node.get("Relation Name"), node.get("Sort Method")) for node in nodes]
+        node_types = [node["Node Type"] for node in nodes]
+        self.assertIn("Hash Join", node_types, summary)
+        self.assertNotIn("Nested Loop", node_types, summary)
+        self.assertEqual([node.get("Relation Name") for node in nodes].count("jobs"), 1, summary)
+        self.assertEqual(
+            [node.get("Sort Method") for node in nodes if node["Node Type"] == "Sort"], ["top-N heapsort"], summary
+        )
+
+    def test_deep_cursor_pages_seek_into_the_index(self):
+        for sort, index_name in (
+            ("posted_at_desc", "idx_jobs_active_posted_at_key"),
+            ("deadline_asc", "idx_jobs_active_deadline_at_key"),
+            ("score_desc", "idx_job_classifications_role_score"),
+        ):
+            with self.subTest(sort=sort):
+                cursor = None
+                for _ in range(50):
+                    cursor = self.list(sort=sort, cursor=cursor)["next_cursor"]
+                nodes = self.plan(sort=sort, cursor=cursor)
+                self.assert_index_path(nodes, index_name)
+                index_node = next(node for node in nodes if node.get("Index Name") == index_name)
+                self.assertIn("Index Cond", index_node)
+
+    def test_date_filters_range_the_sort_index(self):
+        now = datetime.now(timezone.utc)
+        cases = [
+            {"posted_from": now - timedelta(hours=6)},
+            {"posted_to": now - timedelta(days=30)},
+            {"sort": "deadline_asc", "deadline_before": now + timedelta(days=3)},
+        ]
+        for overrides in cases:
+            with self.subTest(**{key: str(value) for key, value in overrides.items()}):
+                index_name = "idx_jobs_active_deadline_at_key" if "deadline_before" in overrides else "idx_jobs_active_posted_at_key"
+                nodes = self.plan(**overrides)
+                self.assert_index_path(nodes, index_name)
+                index_node = next(node for node in nodes if node.get("Index Name") == index_name)
+                self.assertIn("Index Cond", index_node)
+
+    def test_search_is_served_by_its_indexes(self):
+        # the substring arm of q needs the trigram indexes; without pg_trgm it is a sequential scan
+        if not self.has_trigram:
+            self.skipTest("pg_trgm is not installed in the test database")
+        nodes = self.plan(q="tag1234", sort="relevance")
+        self.assertIn("idx_jobs_search_vector", [node.get("Index Name") for node in nodes])
+        self.assertNotIn(("Seq Scan", "jobs"), [(node["Node Type"], node.get("Relation Name")) for node in nodes])
+
+
+if __name__ == "__main__":
+    unittest.main()
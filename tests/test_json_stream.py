@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+import unittest
+
+from app.services.crawler.json_stream import iter_json_array_items
+
+
+def split(raw: bytes, size: int) -> list[bytes]:
+    return [raw[start : start + size] for start in range(0, len(raw), size)]
+
+
+def generate_board(job_count: int, description_size: int):
+    description = json.dumps("백엔드 개발자 <p>Python</p> " * (description_size // 24))
+    yield b'{"job-count": %d, "jobs": [' % job_count
+    for index in range(job_count):
+        prefix = b"," if index else b""
+        yield prefix + b'{"id": %d, "description": %s}' % (index, description.encode("utf-8"))
+    yield b'], "legal": "ok"}'
+
+
+class JsonStreamTest(unittest.TestCase):
+    def test_items_survive_any_chunk_boundary(self):
+        document = {
+            "0-legal-notice": 'quoted "text" 한글',
+            "job-count": 12345,
+            "jobs": [{"id": index, "title": "서버 개발자 " * index, "score": 1.5e10, "remote": False} for index in range(50)],
+            "tail": [1, 2, 3],
+        }
+        raw = json.dumps(document, ensure_ascii=False).encode("utf-8")
+
+        for size in (1, 2, 3, 7, 64, len(raw)):
+            with self.subTest(chunk_size=size):
+                self.assertEqual(list(iter_json_array_items(split(raw, size), "jobs")), document["jobs"])
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual(list(iter_json_array_items([b'{"jobs": [1', b"23, 4", b"5]}"], "jobs")), [123, 45])
+
+    def test_missing_key_yields_nothing(self):
+        self.assertEqual(list(iter_json_array_items([b'{"count": 3}'], "jobs")), [])
+
+    def test_truncated_stream_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array_items([b'{"jobs": [{"id": 1},'], "jobs"))
+
+    def test_peak_memory_does_not_grow_with_payload(self):
+        tracemalloc.start()
+        try:
+            count = 0
+            for _ in iter_json_array_items(generate_board(job_count=3000, description_size=4000), "jobs"):
+                count += 1
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(count, 3000)
+        # the payload is ~30MB of decoded text; streaming should only ever hold a few items
+        self.assertLess(peak, 2 * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
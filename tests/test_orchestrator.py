@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from collections import Counter
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services.crawler import orchestrator
+from app.services.crawler.base import BaseCrawler
+
+HOSTS = {
+    "remotive": "remotive.com",
+    "moloco_gh": "boards-api.greenhouse.io",
+    "sendbird_gh": "boards-api.greenhouse.io",
+    "dunamu_gh": "boards-api.greenhouse.io",
+}
+
+
+class FakeCrawler(BaseCrawler):
+    def __init__(self, source_code: str):
+        self.source_code = source_code
+        self.endpoint = f"https://{HOSTS[source_code]}/{source_code}"
+
+
+def make_session_factory(active_codes: list[str]):
+    def factory():
+        session = MagicMock()
+        session.execute.return_value.scalars.return_value.all.return_value = active_codes
+        return session
+
+    return factory
+
+
+class RunAllCrawlsTest(unittest.TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.in_flight: Counter[str] = Counter()
+        self.peak_per_host: Counter[str] = Counter()
+
+    def fake_run_crawl(self, db, source_code, crawler, rule_version=None):
+        host = crawler.host
+        with self.lock:
+            self.in_flight[host] += 1
+            self.peak_per_host[host] = max(self.peak_per_host[host], self.in_flight[host])
+        time.sleep(0.2)
+        with self.lock:
+            self.in_flight[host] -= 1
+        if source_code == "dunamu_gh":
+            raise RuntimeError("board unavailable")
+        return {"status": "success", "source_code": source_code}
+
+    def run_all(self, active_codes: list[str], **kwargs):
+        with patch.object(orchestrator, "get_crawler", side_effect=FakeCrawler), patch.object(
+            orchestrator, "run_crawl", side_effect=self.fake_run_crawl
+        ):
+            return orchestrator.run_all_crawls(session_factory=make_session_factory(active_codes), **kwargs)
+
+    def test_sources_run_concurrently_with_per_host_cap(self):
+        result = self.run_all(
+            ["dunamu_gh", "moloco_gh", "remotive", "saramin", "sendbird_gh"],
+            max_workers=4,
+            per_host_limit=2,
+        )
+
+        # 3 greenhouse boards capped at 2 per host -> two 0.2s waves, not four sequential crawls
+        self.assertLess(result["elapsed_ms"], 700)
+        self.assertEqual(self.peak_per_host["boards-api.greenhouse.io"], 2)
+        self.assertEqual(result["skipped_sources"], ["saramin"])
+
+    def test_failed_source_is_isolated(self):
+        result = self.run_all(["dunamu_gh", "remotive"])
+
+        self.assertEqual(result["success_count"], 1)
+        self.assertEqual(result["failed_count"], 1)
+        failed = next(item for item in result["results"] if item["status"] == "failed")
+        self.assertEqual(failed["source_code"], "dunamu_gh")
+        self.assertIn("board unavailable", failed["error_message"])
+
+
+if __name__ == "__main__":
+    unittest.main()
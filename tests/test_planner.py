@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import unittest
+
+from app.workers.planner import JITTER_RATIO, MAX_BACKOFF_MIN, MAX_UNCHANGED_FACTOR, plan_source
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def make_run(run_id: int, minutes_ago: int, status: str = "success", changed: int = 0) -> dict:
+    return {
+        "id": run_id,
+        "status": status,
+        "started_at": NOW - timedelta(minutes=minutes_ago),
+        "inserted_count": changed,
+        "updated_count": 0,
+        "deactivated_count": 0,
+    }
+
+
+class PlanSourceTest(unittest.TestCase):
+    def test_changed_source_runs_on_its_base_interval(self):
+        plan = plan_source("moloco_gh", 180, [make_run(10, minutes_ago=30, changed=3)], NOW)
+
+        self.assertEqual(plan.interval_min, 180)
+        elapsed = (plan.next_run_at - plan.last_run_at).total_seconds() / 60
+        self.assertAlmostEqual(elapsed, 180, delta=180 * JITTER_RATIO)
+
+    def test_unchanged_streak_stretches_interval_up_to_cap(self):
+        runs = [make_run(run_id, minutes_ago=10 + run_id) for run_id in range(2)] + [make_run(9, 500, changed=1)]
+        self.assertEqual(plan_source("remotive", 360, runs, NOW).interval_min, 360 * 1.5**2)
+
+        long_streak = [make_run(run_id, minutes_ago=10 + run_id) for run_id in range(10)]
+        self.assertEqual(plan_source("remotive", 360, long_streak, NOW).interval_min, 360 * MAX_UNCHANGED_FACTOR)
+
+    def test_failures_back_off_exponentially(self):
+        runs = [make_run(3, 5, status="failed"), make_run(2, 200, status="failed"), make_run(1, 400, changed=1)]
+        plan = plan_source("dunamu_gh", 180, runs, NOW)
+
+        self.assertEqual(plan.failure_streak, 2)
+        self.assertEqual(plan.interval_min, 180 * 4)
+
+        many_failures = [make_run(run_id, run_id, status="failed") for run_id in range(10)]
+        self.assertEqual(plan_source("dunamu_gh", 180, many_failures, NOW).interval_min, MAX_BACKOFF_MIN)
+
+    def test_overdue_and_new_sources_start_soon_with_spread(self):
+        overdue = plan_source("remotive", 360, [make_run(1, minutes_ago=2000, changed=1)], NOW)
+        never_run = plan_source("sendbird_gh", 180, [], NOW)
+
+        for plan in (overdue, never_run):
+            self.assertGreaterEqual(plan.next_run_at, NOW)
+            self.assertLessEqual(plan.next_run_at, NOW + timedelta(minutes=5))
+
+    def test_jitter_is_stable_for_the_same_last_run(self):
+        runs = [make_run(42, minutes_ago=10, changed=1)]
+
+        self.assertEqual(
+            plan_source("moloco_gh", 180, runs, NOW).next_run_at,
+            plan_source("moloco_gh", 180, runs, NOW).next_run_at,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
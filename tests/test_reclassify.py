@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services.classifier import reclassify
+from app.services.classifier.reclassify import list_reclassification_runs, run_reclassification
+
+TEST_DATABASE_URL = os.getenv("JOBLOG_TEST_DATABASE_URL")
+TEST_RULE_VERSION = "test-reclassify"
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "JOBLOG_TEST_DATABASE_URL is not set")
+class ReclassificationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        cls.Session = sessionmaker(bind=cls.engine)
+        with cls.engine.begin() as conn:
+            conn.execute(text("DELETE FROM classification_rules WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO classification_rules (rule_version, category, target_value, keyword, match_type, priority, weight)
+                    VALUES (:version, 'role', 'backend', 'backend', 'contains', 10, 0)
+                    """
+                ),
+                {"version": TEST_RULE_VERSION},
+            )
+            cls.active_count = conn.execute(text("SELECT COUNT(*) FROM jobs WHERE is_active = true")).scalar_one()
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.engine.begin() as conn:
+            for table in ("job_classifications", "reclassification_runs", "classification_rules"):
+                conn.execute(text(f"DELETE FROM {table} WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+        cls.engine.dispose()
+
+    def setUp(self):
+        if self.active_count < 3:
+            self.skipTest("needs a few active jobs in the test database")
+        with self.engine.begin() as conn:
+            for table in ("job_classifications", "reclassification_runs"):
+                conn.execute(text(f"DELETE FROM {table} WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+
+    def classified_count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text("SELECT COUNT(*) FROM job_classifications WHERE rule_version = :version"),
+                {"version": TEST_RULE_VERSION},
+            ).scalar_one()
+
+    def test_every_active_job_is_classified(self):
+        result = run_reclassification(self.Session, TEST_RULE_VERSION, workers=1, chunk_size=100)
+
+        self.assertEqual(result["processed_count"], self.active_count)
+        self.assertEqual(self.classified_count(), self.active_count)
+        with self.Session() as db:
+            run = list_reclassification_runs(db, rule_version=TEST_RULE_VERSION)[0]
+        self.assertEqual((run["status"], run["processed_count"], run["progress"]), ("success", self.active_count, 1.0))
+
+    def test_interrupted_run_resumes_after_the_last_checkpoint(self):
+        checkpoint = reclassify._checkpoint
+        calls = []
+
+        def failing_checkpoint(db, run_id, processed, last_job_id):
+            calls.append(last_job_id)
+            if len(calls) == 2:
+                raise RuntimeError("worker lost")
+            checkpoint(db, run_id, processed, last_job_id)
+
+        chunk_size = max(1, self.active_count // 3)
+        with patch.object(reclassify, "_checkpoint", side_effect=failing_checkpoint):
+            with self.assertRaises(RuntimeError):
+                run_reclassification(self.Session, TEST_RULE_VERSION, workers=1, chunk_size=chunk_size)
+
+        with self.Session() as db:
+            failed = list_reclassification_runs(db, rule_version=TEST_RULE_VERSION)[0]
+        self.assertEqual((failed["status"], failed["processed_count"]), ("failed", chunk_size))
+        self.assertEqual(failed["last_job_id"], calls[0])
+
+        resumed = run_reclassification(self.Session, TEST_RULE_VERSION, workers=1, chunk_size=chunk_size)
+        self.assertEqual(resumed["run_id"], failed["id"])
+        self.assertEqual(resumed["resumed_from_job_id"], calls[0])
+        self.assertEqual(resumed["processed_count"], self.active_count - chunk_size)
+        self.assertEqual(resumed["total_processed_count"], self.active_count)
+        self.assertEqual(self.classified_count(), self.active_count)
+
+    def test_process_pool_matches_inline_results(self):
+        run_reclassification(self.Session, TEST_RULE_VERSION, workers=1, chunk_size=100)
+        with self.engine.connect() as conn:
+            inline = conn.execute(
+                text("SELECT job_id, role_type::text, reasoning FROM job_classifications WHERE rule_version = :version"),
+                {"version": TEST_RULE_VERSION},
+            ).all()
+
+        result = run_reclassification(self.Session, TEST_RULE_VERSION, workers=2, chunk_size=100)
+        self.assertEqual(result["processed_count"], self.active_count)
+        with self.engine.connect() as conn:
+            pooled = conn.execute(
+                text("SELECT job_id, role_type::text, reasoning FROM job_classifications WHERE rule_version = :version"),
+                {"version": TEST_RULE_VERSION},
+            ).all()
+        self.assertEqual(sorted(pooled), sorted(inline))
+
+    def test_second_runner_is_refused_while_the_lock_is_held(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT pg_advisory_lock(hashtext(:key))"), {"key": f"reclassify:{TEST_RULE_VERSION}"})
+            try:
+                with self.assertRaises(RuntimeError):
+                    run_reclassification(self.Session, TEST_RULE_VERSION, workers=1)
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), {"key": f"reclassify:{TEST_RULE_VERSION}"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+import unittest
+
+from app.scripts.replay_server import BOARD_TOKEN, SyntheticBoard, make_server
+from app.services.crawler.greenhouse import GreenhouseCrawler
+from app.services.crawler.remotive import RemotiveCrawler
+
+
+class ReplayServerTest(unittest.TestCase):
+    def setUp(self):
+        self.board = SyntheticBoard(size=200, churn=0.1, description_chars=300)
+        self.server = make_server(self.board)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def remotive_jobs(self):
+        crawler = RemotiveCrawler()
+        crawler.endpoint = f"{self.base_url}/remotive/api/remote-jobs"
+        return {job.source_job_id: job for job in crawler.iter_jobs()}
+
+    def test_advance_drops_adds_and_edits_postings(self):
+        before = self.remotive_jobs()
+        self.assertEqual(len(before), 200)
+
+        self.assertEqual(self.board.advance(), {"generation": 1, "removed": 10, "added": 10, "edited": 10})
+        after = self.remotive_jobs()
+
+        self.assertEqual(len(after), 200)
+        self.assertEqual(len(before.keys() - after.keys()), 10)
+        self.assertEqual(len(after.keys() - before.keys()), 10)
+        changed = [
+            job_id
+            for job_id in before.keys() & after.keys()
+            if before[job_id].content_hash() != after[job_id].content_hash()
+        ]
+        self.assertEqual(len(changed), 10)
+
+    def test_greenhouse_incremental_crawl_fetches_only_changed_details(self):
+        crawler = GreenhouseCrawler(
+            source_code="bench_greenhouse",
+            board_token=BOARD_TOKEN,
+            company_name="Bench",
+            api_base_url=f"{self.base_url}/greenhouse",
+        )
+        first = list(crawler.iter_jobs())
+        self.assertEqual(len(first), 200)
+        self.assertTrue(first[0].description_text)
+
+        self.board.advance()
+        crawler.known_versions = {job.source_job_id: job.posted_at for job in first}
+        changed = list(crawler.iter_jobs())
+
+        self.assertEqual(len(changed), 20)
+        self.assertEqual(len(crawler.unchanged_source_job_ids), 180)
+        # first run: one content listing; second: index + 20 details
+        self.assertEqual(crawler.fetch_stats.request_count, 1 + 1 + 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
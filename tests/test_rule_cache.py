@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import os
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services.classifier import rule_cache
+from app.services.classifier.rule_cache import RuleSetCache
+from app.services.classifier.rule_engine import compile_rules, load_rules
+
+TEST_DATABASE_URL = os.getenv("JOBLOG_TEST_DATABASE_URL")
+TEST_RULE_VERSION = "test-rule-cache"
+
+
+class RuleSetCacheEvictionTest(unittest.TestCase):
+    def test_oldest_version_is_evicted(self):
+        loads = []
+        cache = RuleSetCache(loader=lambda db, version: loads.append(version) or compile_rules(version, []), max_versions=2)
+        with patch.object(rule_cache, "fetch_rules_fingerprint", return_value=(1, "fp")):
+            for version in ("a", "b", "a", "c", "a", "b"):
+                cache.get(None, version)
+
+        self.assertEqual(loads, ["a", "b", "c", "b"])
+        self.assertEqual([entry["rule_version"] for entry in cache.stats()["entries"]], ["a", "b"])
+        self.assertEqual((cache.hit_count, cache.miss_count), (2, 4))
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "JOBLOG_TEST_DATABASE_URL is not set")
+class RuleSetCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        cls.Session = sessionmaker(bind=cls.engine)
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.engine.begin() as conn:
+            conn.execute(text("DELETE FROM classification_rules WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+        cls.engine.dispose()
+
+    def setUp(self):
+        self.db = self.Session()
+        self.db.execute(text("DELETE FROM classification_rules WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+        self.db.execute(
+            text(
+                """
+                INSERT INTO classification_rules (rule_version, category, target_value, keyword, match_type, priority, weight)
+                VALUES
+                  (:version, 'role', 'backend', 'backend', 'contains', 10, 0),
+                  (:version, 'score', 'junior_friendly', '신입', 'contains', 100, 20)
+                """
+            ),
+            {"version": TEST_RULE_VERSION},
+        )
+        self.db.commit()
+        self.cache = RuleSetCache(loader=load_rules)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_rules_are_compiled_once_until_they_change(self):
+        first, first_hit = self.cache.get(self.db, TEST_RULE_VERSION)
+        second, second_hit = self.cache.get(self.db, TEST_RULE_VERSION)
+        self.assertEqual((first_hit, second_hit), (False, True))
+        self.assertIs(first, second)
+
+        # an in-place edit keeps count and max id, so only the digest notices it
+        self.db.execute(
+            text("UPDATE classification_rules SET weight = 30 WHERE rule_version = :version AND category = 'score'"),
+            {"version": TEST_RULE_VERSION},
+        )
+        self.db.commit()
+        third, third_hit = self.cache.get(self.db, TEST_RULE_VERSION)
+        self.assertFalse(third_hit)
+        self.assertEqual(third.grouped["score"][0].weight, 30)
+
+        stats = self.cache.stats()
+        self.assertEqual((stats["hit_count"], stats["miss_count"]), (1, 2))
+        self.assertEqual(stats["entries"][0]["rule_count"], 2)
+
+    def test_invalid_regex_rules_are_reported_in_stats(self):
+        self.db.execute(
+            text(
+                """
+                INSERT INTO classification_rules (rule_version, category, target_value, keyword, match_type, priority, weight)
+                VALUES (:version, 'role', 'backend', '(unclosed', 'regex', 20, 0)
+                """
+            ),
+            {"version": TEST_RULE_VERSION},
+        )
+        self.db.commit()
+        self.cache.get(self.db, TEST_RULE_VERSION)
+
+        invalid = self.cache.stats()["entries"][0]["invalid_patterns"]
+        self.assertEqual([entry["pattern"] for entry in invalid], ["(unclosed"])
+        self.assertIn("missing )", invalid[0]["error"])
+
+    def test_deactivated_version_raises_and_is_dropped(self):
+        self.cache.get(self.db, TEST_RULE_VERSION)
+        self.db.execute(
+            text("UPDATE classification_rules SET is_active = false WHERE rule_version = :version"),
+            {"version": TEST_RULE_VERSION},
+        )
+        self.db.commit()
+
+        with self.assertRaises(ValueError):
+            self.cache.get(self.db, TEST_RULE_VERSION)
+        self.assertEqual(self.cache.stats()["entries"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
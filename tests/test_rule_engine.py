@@ -0,0 +1,435 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import random
+import re
+import unittest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services.classifier import rule_engine
+from app.services.classifier.matcher import SCAN_KEYWORD_LIMIT, KeywordAutomaton, KeywordMatcher, required_literal
+from app.services.classifier.rule_engine import (
+    Rule,
+    classify_job,
+    classify_pending_jobs,
+    compile_rules,
+    count_pending_jobs,
+)
+
+TEST_DATABASE_URL = os.getenv("JOBLOG_TEST_DATABASE_URL")
+TEST_RULE_VERSION = "test-pending"
+TEST_SOURCE_CODE = "test_classifier_src"
+
+SEEDS_DIR = Path(__file__).resolve().parents[1] / "app" / "seeds"
+SEED_RULES_PATH = SEEDS_DIR / "classification_rules_v1.sql"
+SEED_ROW = re.compile(r"\('([^']*)','([^']*)','([^']*)','([^']*)','([^']*)',(-?\d+),(-?\d+),(true|false),(true|false)\)")
+
+WORDS = [
+    "신입", "경력", "경력무관", "채용연계형", "체험형 인턴", "백엔드", "프론트엔드", "3년 이상", "정규직 전환",
+    "Backend", "SERVER", "api", "Spring", "java", "kotlin", "frontend", "React", "intern", "junior", "senior",
+    "python", "FastAPI", "데이터", "ios", "android", "졸업예정", "현장실습", "engineer", "end", "back",
+]
+
+
+def legacy_text_blob(job: dict) -> str:
+    # the raw fields as the engine joined them before jobs.search_text, lower-cased per match
+    fields = [
+        job.get("title"),
+        job.get("description_text"),
+        job.get("employment_text_raw"),
+        job.get("experience_text_raw"),
+        job.get("tech_stack_text"),
+    ]
+    return "\n".join([str(v) for v in fields if v])
+
+
+def legacy_classify(rules: list[Rule], job: dict) -> dict:
+    # the engine as it was before rules were compiled into one matcher: every rule rescans the blob
+    # (regex rules are searched one by one)
+    def matches(match_type: str, keyword: str, haystack: str) -> bool:
+        if not keyword:
+            return False
+        h = haystack.lower()
+        if match_type == "regex":
+            return re.search(keyword, h, re.IGNORECASE) is not None
+        k = keyword.lower()
+        if match_type == "exact":
+            return h == k
+        return k in h
+
+    grouped: dict[str, list[Rule]] = {"employment": [], "role": [], "exclude": [], "score": []}
+    for rule in rules:
+        grouped.setdefault(rule.category, []).append(rule)
+    blob = legacy_text_blob(job)
+
+    employment = sorted(
+        ((rule.priority, rule.target_value) for rule in grouped["employment"] if matches(rule.match_type, rule.keyword, blob)),
+        key=lambda match: match[0],
+    )
+    employment_matches = [
+        {"category": "employment", "target_value": rule.target_value, "keyword": rule.keyword, "priority": rule.priority}
+        for rule in grouped["employment"]
+        if matches(rule.match_type, rule.keyword, blob)
+    ]
+    exclude_matches = [
+        {"category": "exclude", "target_value": rule.target_value, "keyword": rule.keyword, "priority": rule.priority}
+        for rule in grouped["exclude"]
+        if matches(rule.match_type, rule.keyword, blob)
+    ]
+    role = sorted(
+        ((rule.priority, rule.target_value) for rule in grouped["role"] if matches(rule.match_type, rule.keyword, blob)),
+        key=lambda match: match[0],
+    )
+    role_matches = [
+        {"category": "role", "target_value": rule.target_value, "keyword": rule.keyword, "priority": rule.priority}
+        for rule in grouped["role"]
+        if matches(rule.match_type, rule.keyword, blob)
+    ]
+    score_matches = [
+        {"category": "score", "target_value": rule.target_value, "keyword": rule.keyword, "weight": rule.weight}
+        for rule in grouped["score"]
+        if matches(rule.match_type, rule.keyword, blob)
+    ]
+    employment_type = employment[0][1] if employment else "unknown"
+    role_type = role[0][1] if role and not exclude_matches else "unknown"
+    score = max(0, min(100, 50 + sum(match["weight"] for match in score_matches)))
+    matched_keywords = employment_matches + exclude_matches + role_matches + score_matches
+    return {
+        "employment_type": employment_type,
+        "role_type": role_type,
+        "new_grad_score": score,
+        "confidence": rule_engine._compute_confidence(employment_type, role_type, len(score_matches)),
+        "matched_keywords": matched_keywords,
+        "reasoning": (
+            f"employment={employment_type}, role={role_type}, score={score}, matches={len(matched_keywords)}"
+        ),
+    }
+
+
+def seed_rules(path: Path = SEED_RULES_PATH) -> list[Rule]:
+    rules = []
+    for row in SEED_ROW.findall(path.read_text(encoding="utf-8")):
+        _, category, target_value, keyword, match_type, priority, weight, is_negation, _ = row
+        rules.append(Rule(category, target_value, keyword, match_type, int(priority), int(weight), is_negation == "true"))
+    return rules
+
+
+def random_rules(rng: random.Random, count: int) -> list[Rule]:
+    categories = ["employment", "role", "exclude", "score"]
+    rules = []
+    for index in range(count):
+        word = rng.choice(WORDS + ["", f"{rng.choice(WORDS)} {rng.choice(WORDS)}"])
+        # random slices give many distinct, overlapping keywords that still occur in the corpus
+        start = rng.randint(0, max(0, len(word) - 1))
+        # stripped: the engine folds keyword whitespace, the legacy one did not (see the normalization test)
+        keyword = (word if rng.random() < 0.3 else word[start : rng.randint(start, len(word))]).strip()
+        if rng.random() < 0.3:
+            keyword = keyword.upper()
+        rules.append(
+            Rule(
+                category=rng.choice(categories),
+                target_value=f"target_{index % 7}",
+                keyword=keyword,
+                match_type=rng.choice(["contains", "contains", "regex", "exact"]),
+                priority=rng.randint(1, 50),
+                weight=rng.randint(-30, 30),
+                is_negation=False,
+            )
+        )
+    return rules
+
+
+def random_jobs(rng: random.Random, count: int) -> list[dict]:
+    jobs = []
+    for index in range(count):
+        if index % 25 == 0:
+            # a blob that is exactly one keyword, so exact rules can hit
+            jobs.append({"id": index, "title": rng.choice(WORDS).swapcase()})
+            continue
+        jobs.append(
+            {
+                "id": index,
+                "title": " ".join(rng.choices(WORDS, k=3)),
+                "description_text": " ".join(rng.choices(WORDS, k=rng.randint(0, 60))) or None,
+                "employment_text_raw": rng.choice([None, "full_time", "Internship"]),
+                "experience_text_raw": None,
+                "tech_stack_text": ", ".join(rng.choices(WORDS, k=4)),
+            }
+        )
+    return jobs
+
+
+class RuleEngineEquivalenceTest(unittest.TestCase):
+    def assert_equivalent(self, rules: list[Rule], jobs: list[dict]) -> None:
+        compiled = compile_rules("test", rules)
+        for job in jobs:
+            expected = json.dumps(legacy_classify(rules, job), ensure_ascii=False)
+            self.assertEqual(json.dumps(classify_job(compiled, job), ensure_ascii=False), expected, job)
+
+    def test_seed_rules_match_legacy_engine(self):
+        rng = random.Random(7)
+        rules = seed_rules()
+        self.assertGreater(len(rules), 20)
+        self.assert_equivalent(rules, random_jobs(rng, 400))
+
+    def test_scan_and_automaton_paths_match_legacy_engine(self):
+        rng = random.Random(11)
+        jobs = random_jobs(rng, 200)
+        for count, uses_automaton in ((10, False), (SCAN_KEYWORD_LIMIT * 6, True)):
+            with self.subTest(rule_count=count):
+                rules = random_rules(rng, count)
+                self.assertEqual(compile_rules("test", rules).matcher.uses_automaton, uses_automaton)
+                self.assert_equivalent(rules, jobs)
+
+    def test_search_text_normalization_changes_only_intended_matches(self):
+        def role_rule(keyword: str, match_type: str = "contains") -> Rule:
+            return Rule("role", "backend", keyword, match_type, 10, 0, False)
+
+        cases = [
+            # (rule, job, legacy role_type, engine role_type)
+            (role_rule("span"), {"id": 1, "title": "Engineer", "description_text": "<span>Java</span>"}, "backend", "unknown"),
+            (role_rule("lt;p"), {"id": 2, "title": "Engineer", "description_text": "&lt;p&gt;Java&lt;/p&gt;"}, "backend", "unknown"),
+            (role_rule("신입 개발자", "exact"), {"id": 3, "title": "  신입\t개발자 "}, "unknown", "backend"),
+            (role_rule(" api "), {"id": 4, "title": "API\nengineer"}, "unknown", "backend"),
+            (role_rule("strasse"), {"id": 5, "title": "Straße Backend"}, "unknown", "backend"),
+            (role_rule("backend"), {"id": 6, "title": "Engineer", "description_text": "x" * 30000 + " backend"}, "backend", "unknown"),
+        ]
+        for rule, job, legacy_role, role in cases:
+            with self.subTest(keyword=rule.keyword, job=job["id"]):
+                self.assertEqual(legacy_classify([rule], job)["role_type"], legacy_role)
+                self.assertEqual(classify_job(compile_rules("test", [rule]), job)["role_type"], role)
+
+
+class KeywordAutomatonTest(unittest.TestCase):
+    def test_reports_overlapping_and_nested_keywords(self):
+        automaton = KeywordAutomaton(["he", "she", "his", "hers", "backend", "end", "back", ""])
+        self.assertEqual(automaton.find("ushers"), {"he", "she", "hers"})
+        self.assertEqual(automaton.find("backend engineer"), {"back", "backend", "end"})
+        self.assertEqual(automaton.find("신입 백엔드"), set())
+
+    def test_matches_substring_search_on_random_text(self):
+        rng = random.Random(3)
+        keywords = ["".join(rng.choices("abc", k=rng.randint(1, 5))) for _ in range(60)]
+        automaton = KeywordAutomaton(keywords)
+        for _ in range(50):
+            text = "".join(rng.choices("abcd", k=rng.randint(0, 80)))
+            self.assertEqual(automaton.find(text), {keyword for keyword in keywords if keyword in text})
+
+
+class MatchTypeTest(unittest.TestCase):
+    def role_rule(self, keyword: str, match_type: str, priority: int = 10) -> Rule:
+        return Rule("role", "backend", keyword, match_type, priority, 0, False)
+
+    def role_of(self, rules: list[Rule], title: str) -> str:
+        return classify_job(compile_rules("test", rules), {"id": 1, "title": title})["role_type"]
+
+    def test_word_rules_need_word_boundaries(self):
+        rules = [self.role_rule("api", "word"), self.role_rule("java", "word"), self.role_rule("go", "word")]
+        self.assertEqual(self.role_of(rules, "Rapid prototyping with JavaScript at Google"), "unknown")
+        self.assertEqual(self.role_of(rules, "JavaScript / Java developer"), "backend")
+        self.assertEqual(self.role_of(rules, "REST API 개발"), "backend")
+        self.assertEqual(self.role_of(rules, "Go(golang) 서버"), "backend")
+        # the same keyword as a contains rule still hits inside words
+        self.assertEqual(self.role_of([self.role_rule("api", "contains")], "Rapid prototyping"), "backend")
+
+    def test_word_rules_on_the_automaton_path(self):
+        filler = [self.role_rule(f"filler{index}", "contains", 50) for index in range(SCAN_KEYWORD_LIMIT + 1)]
+        rules = filler + [self.role_rule("api", "word")]
+        self.assertTrue(compile_rules("test", rules).matcher.uses_automaton)
+        self.assertEqual(self.role_of(rules, "rapid"), "unknown")
+        self.assertEqual(self.role_of(rules, "rapid api"), "backend")
+
+    def test_regex_rules_match_case_insensitively(self):
+        rules = [Rule("employment", "experienced", r"([3-9]|[1-9][0-9])\s*년\s*이상", "regex", 30, 0, False)]
+        compiled = compile_rules("test", rules)
+        employment = lambda title: classify_job(compiled, {"id": 1, "title": title})["employment_type"]
+        self.assertEqual(employment("경력 5년 이상"), "experienced")
+        self.assertEqual(employment("경력 12 년이상"), "experienced")
+        self.assertEqual(employment("경력 1년 이상"), "unknown")
+
+        upper = compile_rules("test", [self.role_rule(r"\bNODE\.?JS\b", "regex")])
+        self.assertEqual(classify_job(upper, {"id": 1, "title": "Node.js backend"})["role_type"], "backend")
+
+    def test_invalid_regex_is_skipped(self):
+        rules = [self.role_rule("(unclosed", "regex"), self.role_rule("api", "word")]
+        compiled = compile_rules("test", rules)
+        self.assertEqual(compiled.matcher.pattern_set.patterns, [])
+        self.assertEqual(
+            [invalid["pattern"] for invalid in compiled.matcher.pattern_set.invalid_patterns], ["(unclosed"]
+        )
+        self.assertEqual(classify_job(compiled, {"id": 1, "title": "api"})["role_type"], "backend")
+
+    def test_required_literal(self):
+        cases = {
+            r"node\.?js": "node",
+            r"([3-9]|[1-9][0-9])\s*년\s*이상": "이상",
+            r"\bJava\b": "java",
+            "ab+c": "ab",
+            "x{2,3}yz": "yz",
+            "[]ab]cd": "cd",
+            r"c\+\+": "c++",
+            "(new grad|junior)": None,
+            "back|front": None,
+            r"a\x41bc": None,
+            "a.b": None,
+        }
+        for pattern, literal in cases.items():
+            with self.subTest(pattern=pattern):
+                self.assertEqual(required_literal(pattern), literal)
+
+    def test_gated_patterns_match_rule_by_rule_search(self):
+        rng = random.Random(5)
+        pieces = ["ab", "ba", "a", "b", "c", "a?", "b+", "(a|c)", "[bc]", ".", "\\b"]
+        patterns = ["".join(rng.choices(pieces, k=rng.randint(1, 4))) for _ in range(40)]
+        for count in (40, SCAN_KEYWORD_LIMIT + 1):
+            matcher = KeywordMatcher([f"filler{index}" for index in range(count)], patterns=patterns)
+            for _ in range(100):
+                text = " ".join("".join(rng.choices("abc", k=rng.randint(0, 6))) for _ in range(rng.randint(0, 8)))
+                expected = {pattern for pattern in patterns if re.search(pattern, text)}
+                self.assertEqual(matcher.pattern_hits(text, matcher.contains_hits(text)), expected, text)
+
+    def test_v1_1_seed_rules_compile(self):
+        rules = seed_rules(SEEDS_DIR / "classification_rules_v1_1.sql")
+        compiled = compile_rules("v1.1.0", rules)
+        self.assertEqual(len(compiled.matcher.pattern_set.patterns), 4)
+        result = classify_job(compiled, {"id": 1, "title": "Google 검색 프론트엔드", "description_text": "5년 이상"})
+        self.assertEqual((result["employment_type"], result["role_type"]), ("experienced", "unknown"))
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "JOBLOG_TEST_DATABASE_URL is not set")
+class ClassifyPendingJobsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        cls.Session = sessionmaker(bind=cls.engine)
+        with cls.engine.begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO sources (code, name, base_url, is_active, crawl_interval_min)
+                    VALUES (:code, 'Classifier Test', 'https://example.test', false, 60)
+                    ON CONFLICT (code) DO NOTHING
+                    """
+                ),
+                {"code": TEST_SOURCE_CODE},
+            )
+            conn.execute(text("DELETE FROM classification_rules WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO classification_rules (rule_version, category, target_value, keyword, match_type, priority, weight)
+                    VALUES (:version, 'role', 'backend', 'backend', 'contains', 10, 0)
+                    """
+                ),
+                {"version": TEST_RULE_VERSION},
+            )
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.engine.begin() as conn:
+            conn.execute(text("DELETE FROM job_classifications WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+            conn.execute(text("DELETE FROM classification_rules WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+            conn.execute(
+                text("DELETE FROM jobs WHERE source_id = (SELECT id FROM sources WHERE code = :code)"),
+                {"code": TEST_SOURCE_CODE},
+            )
+        cls.engine.dispose()
+
+    def setUp(self):
+        self.db = self.Session()
+        self.db.execute(text("DELETE FROM job_classifications WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+        self.db.execute(
+            text("DELETE FROM jobs WHERE source_id = (SELECT id FROM sources WHERE code = :code)"),
+            {"code": TEST_SOURCE_CODE},
+        )
+        self.job_ids = [
+            self.db.execute(
+                text(
+                    """
+                    INSERT INTO jobs (source_id, source_job_id, canonical_url, company_name, title, content_hash)
+                    SELECT id, :job_id, :url, 'Acme', 'Backend Engineer', :job_id
+                    FROM sources WHERE code = :code
+                    RETURNING id
+                    """
+                ),
+                {"code": TEST_SOURCE_CODE, "job_id": f"job-{index}", "url": f"https://example.test/pending/{index}"},
+            ).scalar_one()
+            for index in range(5)
+        ]
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def classified_hashes(self) -> dict[int, str]:
+        rows = self.db.execute(
+            text(
+                """
+                SELECT job_id, content_hash FROM job_classifications
+                WHERE rule_version = :version AND job_id = ANY(:job_ids)
+                """
+            ),
+            {"version": TEST_RULE_VERSION, "job_ids": self.job_ids},
+        ).all()
+        return dict(rows)
+
+    def test_backlog_is_worked_off_in_chunks(self):
+        result = classify_pending_jobs(self.db, TEST_RULE_VERSION, chunk_size=2)
+
+        self.assertGreaterEqual(result["backlog_before"], 5)
+        self.assertEqual(result["classified_count"], result["backlog_before"])
+        self.assertEqual(result["backlog_after"], 0)
+        self.assertEqual(len(self.classified_hashes()), 5)
+
+        again = classify_pending_jobs(self.db, TEST_RULE_VERSION)
+        self.assertEqual((again["backlog_before"], again["classified_count"]), (0, 0))
+
+    def test_changed_job_is_reclassified(self):
+        classify_pending_jobs(self.db, TEST_RULE_VERSION)
+        self.db.execute(
+            text("UPDATE jobs SET content_hash = 'changed', title = 'Frontend Engineer' WHERE id = :id"),
+            {"id": self.job_ids[0]},
+        )
+        self.db.commit()
+        self.assertEqual(count_pending_jobs(self.db, TEST_RULE_VERSION), 1)
+
+        result = classify_pending_jobs(self.db, TEST_RULE_VERSION)
+        self.assertEqual(result["classified_count"], 1)
+        self.assertEqual(self.classified_hashes()[self.job_ids[0]], "changed")
+        role_type = self.db.execute(
+            text("SELECT role_type::text FROM job_classifications WHERE job_id = :id AND rule_version = :version"),
+            {"id": self.job_ids[0], "version": TEST_RULE_VERSION},
+        ).scalar_one()
+        self.assertEqual(role_type, "unknown")
+
+    def test_results_are_written_in_multi_row_batches(self):
+        result = classify_pending_jobs(self.db, TEST_RULE_VERSION, batch_size=2)
+        self.assertEqual(result["write_batches"], -(-result["classified_count"] // 2))
+
+        row = self.db.execute(
+            text(
+                """
+                SELECT role_type::text AS role_type, new_grad_score, confidence, matched_keywords, reasoning
+                FROM job_classifications WHERE job_id = :id AND rule_version = :version
+                """
+            ),
+            {"id": self.job_ids[0], "version": TEST_RULE_VERSION},
+        ).mappings().one()
+        self.assertEqual(row["role_type"], "backend")
+        self.assertEqual(float(row["confidence"]), 0.7)
+        self.assertEqual(row["matched_keywords"][0]["keyword"], "backend")
+        self.assertEqual(row["reasoning"], "employment=unknown, role=backend, score=50, matches=1")
+
+    def test_max_jobs_leaves_the_rest_pending(self):
+        before = count_pending_jobs(self.db, TEST_RULE_VERSION)
+        result = classify_pending_jobs(self.db, TEST_RULE_VERSION, chunk_size=2, max_jobs=3)
+        self.assertEqual(result["classified_count"], 3)
+        self.assertEqual(result["backlog_after"], before - 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import os
+from typing import Iterator
+import unittest
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services.crawler import runner
+from app.services.crawler.base import BaseCrawler, CrawlJob
+from app.services.crawler.http_client import NotModified
+from app.services.job_counts import job_count_cache
+
+TEST_DATABASE_URL = os.getenv("JOBLOG_TEST_DATABASE_URL")
+TEST_SOURCE_CODE = "test_runner_src"
+TEST_RULE_VERSION = "test-ingest"
+
+
+class StaticCrawler(BaseCrawler):
+    source_code = TEST_SOURCE_CODE
+
+    def __init__(self, jobs: list[CrawlJob]):
+        super().__init__()
+        self.jobs = jobs
+
+    def iter_jobs(self) -> Iterator[CrawlJob]:
+        return iter(self.jobs)
+
+
+class IncrementalCrawler(StaticCrawler):
+    supports_incremental = True
+
+    def iter_jobs(self) -> Iterator[CrawlJob]:
+        known = self.known_versions or {}
+        self.unchanged_source_job_ids = [job.source_job_id for job in self.jobs if job.source_job_id in known]
+        return iter([job for job in self.jobs if job.source_job_id not in known])
+
+
+class DetailFailingCrawler(IncrementalCrawler):
+    # lists every job, but the content of failing_ids cannot be fetched
+    def __init__(self, jobs: list[CrawlJob], failing_ids: set[str]):
+        super().__init__(jobs)
+        self.failing_ids = failing_ids
+
+    def iter_jobs(self) -> Iterator[CrawlJob]:
+        self.detail_failed_source_job_ids = [job.source_job_id for job in self.jobs if job.source_job_id in self.failing_ids]
+        listed = super().iter_jobs()
+        self.unchanged_source_job_ids = [
+            source_job_id for source_job_id in self.unchanged_source_job_ids if source_job_id not in self.failing_ids
+        ]
+        return (job for job in listed if job.source_job_id not in self.failing_ids)
+
+
+class NotModifiedCrawler(BaseCrawler):
+    source_code = TEST_SOURCE_CODE
+    endpoint = "https://example.test/jobs"
+
+    def iter_jobs(self) -> Iterator[CrawlJob]:
+        self.fetch_stats.record(requests=1, not_modified=1)
+        raise NotModified(self.endpoint)
+
+
+def make_job(index: int, title: str = "Backend Engineer") -> CrawlJob:
+    return CrawlJob(
+        source_job_id=f"job-{index}",
+        canonical_url=f"https://example.test/{TEST_SOURCE_CODE}/{index}",
+        company_name="Acme",
+        title=title,
+        description_text="Python FastAPI",
+    )
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "JOBLOG_TEST_DATABASE_URL is not set")
+class RunCrawlTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        cls.Session = sessionmaker(bind=cls.engine)
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.engine.begin() as conn:
+            conn.execute(text("UPDATE sources SET is_active = false WHERE code = :code"), {"code": TEST_SOURCE_CODE})
+        cls.engine.dispose()
+
+    def setUp(self):
+        self.db = self.Session()
+        self.db.execute(
+            text(
+                """
+                INSERT INTO sources (code, name, base_url, is_active, crawl_interval_min)
+                VALUES (:code, 'Runner Test', 'https://example.test', true, 60)
+                ON CONFLICT (code) DO UPDATE SET is_active = true
+                """
+            ),
+            {"code": TEST_SOURCE_CODE},
+        )
+        self.source_id = self.db.execute(
+            text("SELECT id FROM sources WHERE code = :code"), {"code": TEST_SOURCE_CODE}
+        ).scalar_one()
+        self.db.execute(text("DELETE FROM jobs WHERE source_id = :source_id"), {"source_id": self.source_id})
+        self.db.execute(text("DELETE FROM crawl_runs WHERE source_id = :source_id"), {"source_id": self.source_id})
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def crawl(self, jobs: list[CrawlJob]) -> dict:
+        with patch.object(runner, "get_crawler", return_value=StaticCrawler(jobs)):
+            return runner.run_crawl(self.db, source_code=TEST_SOURCE_CODE)
+
+    def test_bulk_upsert_counts_inserts_and_updates_across_batches(self):
+        first_size = runner.UPSERT_BATCH_SIZE + 10
+        first = self.crawl([make_job(i) for i in range(first_size)])
+        self.assertEqual(first["inserted_count"], first_size)
+        self.assertEqual(first["updated_count"], 0)
+
+        second = self.crawl([make_job(i, title="Platform Engineer") for i in range(first_size + 5)])
+        self.assertEqual(second["inserted_count"], 5)
+        self.assertEqual(second["updated_count"], first_size)
+
+        run = self.db.execute(
+            text("SELECT inserted_count, updated_count FROM crawl_runs WHERE id = :run_id"),
+            {"run_id": second["run_id"]},
+        ).mappings().one()
+        self.assertEqual((run["inserted_count"], run["updated_count"]), (5, first_size))
+
+    def test_finished_crawl_invalidates_cached_job_totals(self):
+        generation = job_count_cache.generation
+        self.crawl([make_job(0)])
+        self.assertEqual(job_count_cache.generation, generation + 1)
+
+    def test_phase_metrics_are_stored_on_the_run(self):
+        result = self.crawl([make_job(i) for i in range(3)])
+        runner.record_run_metrics(self.db, result["run_id"], {"classify_ms": 1.5})
+
+        metrics = self.db.execute(
+            text("SELECT metrics FROM crawl_runs WHERE id = :run_id"), {"run_id": result["run_id"]}
+        ).scalar_one()
+        for key in ("fetch_ms", "parse_ms", "upsert_ms", "total_ms", "rows_per_sec", "request_count"):
+            self.assertIn(key, metrics)
+        self.assertEqual(metrics["total_ms"], result["metrics"]["total_ms"])
+        self.assertEqual(metrics["classify_ms"], 1.5)
+
+    def test_unchanged_jobs_only_bump_last_seen_at(self):
+        self.crawl([make_job(1), make_job(2)])
+        before = self.db.execute(
+            text("SELECT source_job_id, updated_at, last_seen_at FROM jobs WHERE source_id = :source_id"),
+            {"source_id": self.source_id},
+        ).mappings().all()
+
+        result = self.crawl([make_job(1), make_job(2, title="Renamed")])
+        self.assertEqual(
+            (result["inserted_count"], result["updated_count"], result["unchanged_count"]),
+            (0, 1, 1),
+        )
+
+        after = {
+            row["source_job_id"]: row
+            for row in self.db.execute(
+                text("SELECT source_job_id, updated_at, last_seen_at FROM jobs WHERE source_id = :source_id"),
+                {"source_id": self.source_id},
+            ).mappings()
+        }
+        unchanged_before = next(row for row in before if row["source_job_id"] == "job-1")
+        self.assertEqual(after["job-1"]["updated_at"], unchanged_before["updated_at"])
+        self.assertGreater(after["job-1"]["last_seen_at"], unchanged_before["last_seen_at"])
+
+    def test_incremental_crawler_skips_known_postings(self):
+        self.crawl([make_job(1), make_job(2)])
+
+        with patch.object(runner, "get_crawler", return_value=IncrementalCrawler([make_job(1), make_job(2), make_job(3)])):
+            result = runner.run_crawl(self.db, source_code=TEST_SOURCE_CODE)
+
+        self.assertEqual(result["fetched_count"], 3)
+        self.assertEqual((result["inserted_count"], result["unchanged_count"]), (1, 2))
+
+    def test_failed_details_are_counted_apart_from_fetched_and_unchanged(self):
+        self.crawl([make_job(1), make_job(2)])
+
+        crawler = DetailFailingCrawler([make_job(i) for i in range(1, 5)], failing_ids={"job-2", "job-4"})
+        with patch.object(runner, "get_crawler", return_value=crawler):
+            result = runner.run_crawl(self.db, source_code=TEST_SOURCE_CODE)
+
+        self.assertEqual(
+            (result["fetched_count"], result["inserted_count"], result["unchanged_count"]), (2, 1, 1)
+        )
+        self.assertEqual(result["metrics"]["detail_failed_count"], 2)
+        rows = self.db.execute(
+            text("SELECT source_job_id, is_active FROM jobs WHERE source_id = :source_id ORDER BY source_job_id"),
+            {"source_id": self.source_id},
+        ).all()
+        # the stored job-2 survives the unseen sweep; the new job-4 waits for a later run
+        self.assertEqual([tuple(row) for row in rows], [("job-1", True), ("job-2", True), ("job-3", True)])
+
+    def test_postings_missing_from_a_run_or_past_deadline_are_deactivated(self):
+        self.crawl([make_job(1), make_job(2), make_job(3)])
+        expired = make_job(3)
+        expired.deadline_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+        result = self.crawl([make_job(1), expired])
+        self.assertEqual(result["deactivated_count"], 2)
+
+        active = self.db.execute(
+            text("SELECT source_job_id FROM jobs WHERE source_id = :source_id AND is_active = true"),
+            {"source_id": self.source_id},
+        ).scalars().all()
+        self.assertEqual(active, ["job-1"])
+
+        reappeared = self.crawl([make_job(1), make_job(2)])
+        self.assertEqual(reappeared["deactivated_count"], 0)
+        self.assertEqual(reappeared["unchanged_count"], 2)
+
+    def test_not_modified_board_records_successful_empty_run(self):
+        with patch.object(runner, "get_crawler", return_value=NotModifiedCrawler()):
+            result = runner.run_crawl(self.db, source_code=TEST_SOURCE_CODE)
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["fetched_count"], 0)
+        not_modified_count = self.db.execute(
+            text("SELECT not_modified_count FROM crawl_runs WHERE id = :run_id"), {"run_id": result["run_id"]}
+        ).scalar_one()
+        self.assertEqual(not_modified_count, 1)
+
+    def test_not_modified_board_keeps_unseen_postings_active(self):
+        self.crawl([make_job(1)])
+        with patch.object(runner, "get_crawler", return_value=NotModifiedCrawler()):
+            result = runner.run_crawl(self.db, source_code=TEST_SOURCE_CODE)
+
+        self.assertEqual(result["deactivated_count"], 0)
+
+    def test_written_jobs_are_classified_during_the_crawl(self):
+        self.db.execute(text("DELETE FROM classification_rules WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+        self.db.execute(
+            text(
+                """
+                INSERT INTO classification_rules (rule_version, category, target_value, keyword, match_type, priority, weight)
+                VALUES (:version, 'role', 'backend', 'backend', 'contains', 10, 0)
+                """
+            ),
+            {"version": TEST_RULE_VERSION},
+        )
+        self.db.commit()
+        self.addCleanup(self.cleanup_rule_version)
+
+        def crawl(jobs):
+            with patch.object(runner, "get_crawler", return_value=StaticCrawler(jobs)):
+                return runner.run_crawl(self.db, source_code=TEST_SOURCE_CODE, rule_version=TEST_RULE_VERSION)
+
+        first = crawl([make_job(1), make_job(2, title="Designer")])
+        self.assertEqual(first["classified_count"], 2)
+        self.assertIn("classify_ms", first["metrics"])
+
+        second = crawl([make_job(1), make_job(2, title="Backend Designer"), make_job(3)])
+        self.assertEqual(second["classified_count"], 2)
+
+        rows = self.db.execute(
+            text(
+                """
+                SELECT j.source_job_id, jc.role_type::text AS role_type, jc.content_hash = j.content_hash AS current
+                FROM jobs j
+                JOIN job_classifications jc ON jc.job_id = j.id AND jc.rule_version = :version
+                WHERE j.source_id = :source_id
+                ORDER BY j.source_job_id
+                """
+            ),
+            {"version": TEST_RULE_VERSION, "source_id": self.source_id},
+        ).all()
+        self.assertEqual(
+            [tuple(row) for row in rows],
+            [("job-1", "backend", True), ("job-2", "backend", True), ("job-3", "backend", True)],
+        )
+
+    def test_unknown_rule_version_does_not_stop_the_crawl(self):
+        with patch.object(runner, "get_crawler", return_value=StaticCrawler([make_job(1)])):
+            result = runner.run_crawl(self.db, source_code=TEST_SOURCE_CODE, rule_version="test-ingest-missing")
+        self.assertEqual((result["status"], result["classified_count"]), ("success", 0))
+        self.assertIn("test-ingest-missing", result["classify_skipped"])
+
+        metrics = self.db.execute(
+            text("SELECT metrics FROM crawl_runs WHERE id = :run_id"), {"run_id": result["run_id"]}
+        ).scalar_one()
+        self.assertEqual(metrics["classify_skipped"], result["classify_skipped"])
+
+    def cleanup_rule_version(self):
+        self.db.rollback()
+        for table in ("job_classifications", "classification_rules"):
+            self.db.execute(text(f"DELETE FROM {table} WHERE rule_version = :version"), {"version": TEST_RULE_VERSION})
+        self.db.commit()
+
+    def test_duplicate_source_job_id_in_one_fetch_keeps_last(self):
+        result = self.crawl([make_job(1, title="First"), make_job(1, title="Second")])
+        self.assertEqual(result["inserted_count"], 1)
+
+        title = self.db.execute(
+            text("SELECT title FROM jobs WHERE source_id = :source_id"), {"source_id": self.source_id}
+        ).scalar_one()
+        self.assertEqual(title, "Second")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import os
+import unittest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services.search_text import SEARCH_TEXT_MAX_CHARS, backfill_search_text, build_search_text, normalize_text
+
+TEST_DATABASE_URL = os.getenv("JOBLOG_TEST_DATABASE_URL")
+TEST_SOURCE_CODE = "test_search_text_src"
+
+
+class NormalizeTextTest(unittest.TestCase):
+    def test_html_is_stripped_whether_escaped_or_not(self):
+        self.assertEqual(normalize_text("<p>Backend&nbsp;Engineer</p><ul><li>Java</li></ul>"), "backend engineer java")
+        self.assertEqual(normalize_text("&lt;p&gt;R&amp;amp;D &lt;b&gt;Team&lt;/b&gt;&lt;/p&gt;"), "r&d team")
+
+    def test_escaped_text_in_raw_html_is_kept(self):
+        # raw HTML is unescaped once, after its tags are gone
+        self.assertEqual(normalize_text("<p>Write &lt;b&gt; for bold</p>"), "write <b> for bold")
+        self.assertEqual(normalize_text("<p>R&amp;D</p>"), "r&d")
+
+    def test_case_is_folded_and_whitespace_collapsed(self):
+        self.assertEqual(normalize_text("  Straße\n\n 신입   가능\t"), "strasse 신입 가능")
+        self.assertEqual(normalize_text("3 < 5 and 5 > 3"), "3 3")
+        self.assertEqual(normalize_text(None), "")
+
+    def test_fields_stay_on_their_own_lines_and_are_capped(self):
+        job = {"title": "Backend <b>Engineer</b>", "description_text": None, "tech_stack_text": "Java, Spring"}
+        self.assertEqual(build_search_text(job), "backend engineer\njava, spring")
+        self.assertEqual(len(build_search_text({"title": "x", "description_text": "y " * SEARCH_TEXT_MAX_CHARS})), SEARCH_TEXT_MAX_CHARS)
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "JOBLOG_TEST_DATABASE_URL is not set")
+class BackfillSearchTextTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        cls.Session = sessionmaker(bind=cls.engine)
+
+    def setUp(self):
+        self.db = self.Session()
+        self.db.execute(
+            text(
+                """
+                INSERT INTO sources (code, name, base_url, is_active, crawl_interval_min)
+                VALUES (:code, 'Search Text Test', 'https://example.test', false, 60)
+                ON CONFLICT (code) DO NOTHING
+                """
+            ),
+            {"code": TEST_SOURCE_CODE},
+        )
+        self.source_id = self.db.execute(
+            text("SELECT id FROM sources WHERE code = :code"), {"code": TEST_SOURCE_CODE}
+        ).scalar_one()
+        self.db.execute(text("DELETE FROM jobs WHERE source_id = :source_id"), {"source_id": self.source_id})
+        for index in range(5):
+            self.db.execute(
+                text(
+                    """
+                    INSERT INTO jobs (source_id, source_job_id, canonical_url, company_name, title, description_text)
+                    VALUES (:source_id, :source_job_id, :url, 'Acme', :title, '<p>Java&nbsp;Spring</p>')
+                    """
+                ),
+                {
+                    "source_id": self.source_id,
+                    "source_job_id": f"job-{index}",
+                    "url": f"https://example.test/{TEST_SOURCE_CODE}/{index}",
+                    "title": f"Backend Engineer {index}",
+                },
+            )
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.execute(text("DELETE FROM jobs WHERE source_id = :source_id"), {"source_id": self.source_id})
+        self.db.commit()
+        self.db.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.dispose()
+
+    def test_missing_search_text_is_filled_in_batches(self):
+        self.assertGreaterEqual(backfill_search_text(self.db, batch_size=2), 5)
+        rows = self.db.execute(
+            text("SELECT search_text FROM jobs WHERE source_id = :source_id ORDER BY source_job_id"),
+            {"source_id": self.source_id},
+        ).scalars().all()
+        self.assertEqual(rows[0], "backend engineer 0\njava spring")
+        self.assertEqual(backfill_search_text(self.db), 0)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import unittest
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services.classifier.shadow import ShadowDiff, evaluate_candidate
+
+TEST_DATABASE_URL = os.getenv("JOBLOG_TEST_DATABASE_URL")
+BASELINE_VERSION = "test-shadow-base"
+CANDIDATE_VERSION = "test-shadow-candidate"
+
+
+def result(employment_type: str, role_type: str, score: int) -> dict:
+    return {"employment_type": employment_type, "role_type": role_type, "new_grad_score": score}
+
+
+class ShadowDiffTest(unittest.TestCase):
+    def test_transitions_histogram_and_samples(self):
+        diff = ShadowDiff(sample_size=2)
+        diff.add({"id": 1}, result("new_grad", "backend", 50), result("new_grad", "backend", 50))
+        diff.add({"id": 2}, result("new_grad", "backend", 50), result("experienced", "backend", 30))
+        diff.add({"id": 3}, result("unknown", "unknown", 50), result("unknown", "backend", 60))
+        diff.add({"id": 4}, result("unknown", "unknown", 50), result("unknown", "backend", 50))
+
+        report = diff.report()
+        self.assertEqual((report["total_count"], report["changed_count"]), (4, 3))
+        self.assertEqual(report["employment"]["transitions"]["new_grad"], {"experienced": 1, "new_grad": 1})
+        self.assertEqual(report["employment"]["changed_count"], 1)
+        self.assertEqual(report["role"]["transitions"]["unknown"], {"backend": 2})
+        self.assertEqual(report["role"]["changed_count"], 2)
+        self.assertEqual(
+            report["score"]["delta_histogram"],
+            [{"delta": -20, "count": 1}, {"delta": 0, "count": 2}, {"delta": 10, "count": 1}],
+        )
+        self.assertEqual(report["score"]["changed_count"], 2)
+        self.assertEqual(len(report["samples"]), 2)
+        self.assertTrue({sample["job_id"] for sample in report["samples"]} <= {2, 3, 4})
+
+    def test_sample_stays_bounded(self):
+        diff = ShadowDiff(sample_size=5)
+        for job_id in range(10_000):
+            diff.add({"id": job_id}, result("unknown", "unknown", 50), result("new_grad", "unknown", 50))
+        self.assertEqual(len(diff.samples), 5)
+        # reservoir sampling reaches past the first few changed jobs
+        self.assertGreater(max(sample["job_id"] for sample in diff.samples), 5)
+
+
+@unittest.skipUnless(TEST_DATABASE_URL, "JOBLOG_TEST_DATABASE_URL is not set")
+class EvaluateCandidateTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = create_engine(TEST_DATABASE_URL)
+        cls.Session = sessionmaker(bind=cls.engine)
+        with cls.engine.begin() as conn:
+            for version, keyword in ((BASELINE_VERSION, "backend"), (CANDIDATE_VERSION, "engineer")):
+                conn.execute(text("DELETE FROM classification_rules WHERE rule_version = :version"), {"version": version})
+                conn.execute(
+                    text(
+                        """
+                        INSERT INTO classification_rules (rule_version, category, target_value, keyword, match_type, priority, weight)
+                        VALUES (:version, 'role', 'backend', :keyword, 'contains', 10, 0)
+                        """
+                    ),
+                    {"version": version, "keyword": keyword},
+                )
+            cls.active_count = conn.execute(text("SELECT COUNT(*) FROM jobs WHERE is_active = true")).scalar_one()
+
+    @classmethod
+    def tearDownClass(cls):
+        with cls.engine.begin() as conn:
+            conn.execute(
+                text("DELETE FROM classification_rules WHERE rule_version IN (:baseline, :candidate)"),
+                {"baseline": BASELINE_VERSION, "candidate": CANDIDATE_VERSION},
+            )
+        cls.engine.dispose()
+
+    def classification_count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM job_classifications")).scalar_one()
+
+    def test_whole_corpus_is_compared_without_writes(self):
+        before = self.classification_count()
+        with self.Session() as db:
+            report = evaluate_candidate(db, CANDIDATE_VERSION, BASELINE_VERSION, chunk_size=100, sample_size=3)
+
+        self.assertEqual(report["total_count"], self.active_count)
+        role_rows = report["role"]["transitions"].values()
+        self.assertEqual(sum(sum(row.values()) for row in role_rows), self.active_count)
+        self.assertLessEqual(len(report["samples"]), 3)
+        self.assertEqual(self.classification_count(), before)
+
+    def test_max_jobs_stops_early(self):
+        if self.active_count < 2:
+            self.skipTest("needs a few active jobs in the test database")
+        with self.Session() as db:
+            report = evaluate_candidate(db, CANDIDATE_VERSION, BASELINE_VERSION, chunk_size=100, max_jobs=1)
+        self.assertEqual(report["total_count"], 1)
+
+    def test_unknown_version_raises(self):
+        with self.Session() as db:
+            with self.assertRaises(ValueError):
+                evaluate_candidate(db, "test-shadow-missing", BASELINE_VERSION)
+
+
+if __name__ == "__main__":
+    unittest.main()